@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Insert batches cut by estimated payload bytes, with an online-tuned target.
+
+A fixed ``--batch-size`` in rows is wrong both ways: 1000 rows of 50 KB JSON
+documents exceed the gRPC message limit (64 MB by default on the Milvus proxy),
+while 1000 rows of a 128-dim vector and an empty JSON field are ~0.5 MB and
+waste round trips. ``AdaptiveBatcher`` cuts a batch before the row that would
+take its estimated serialized size past ``target_bytes`` (or past ``max_rows``
+rows), so a batch never exceeds the target unless it is a single row, and —
+unless ``adapt=False`` — tunes that target from the observed insert throughput:
+
+* every ``window`` batches it compares the bytes/s reached at the current
+  target with the previous target, keeps moving the target in the same
+  direction (times or divided by ``step``) while throughput improves and turns
+  around when it drops, so it settles around the server's sweet spot,
+* a batch slower than ``max_latency`` seconds shrinks the target at once,
+* the target always stays within ``[min_bytes, max_bytes]``, and ``max_bytes``
+  defaults to 48 MB and may not exceed the 64 MB gRPC limit,
+* a single row above the target is sent as a batch of its own, and a row above
+  the gRPC limit is rejected with ``ValueError``.
+
+A batch is returned when the next row does not fit, so the last one is only
+returned by ``take()``.
+
+    batcher = AdaptiveBatcher(target_bytes=4 << 20)
+    for row in rows:
+        batch = batcher.add(row)
+        if batch:
+            start = time.perf_counter()
+            client.insert(collection_name=name, data=batch)
+            batcher.record(batch, time.perf_counter() - start)
+    ...
+    batcher.log_summary()
+"""
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+# Milvus proxy default grpc serverMaxRecvSize is 64 MB, keep headroom for the request envelope
+GRPC_MAX_BYTES = 64 << 20
+DEFAULT_MAX_BYTES = GRPC_MAX_BYTES * 3 // 4
+
+# rough protobuf cost of scalars, per value
+_SCALAR_BYTES = {bool: 1, int: 8, float: 8, type(None): 1}
+
+
+def estimate_bytes(value: Any) -> int:
+    """Rough serialized size of one field value (vectors, strings, JSON objects)."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    size = _SCALAR_BYTES.get(type(value))
+    if size is not None:
+        return size
+    if isinstance(value, dict):
+        # a JSON object: keys, values and a few bytes of punctuation each
+        return 2 + sum(len(k) + estimate_bytes(v) + 4 for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return 2 + sum(estimate_bytes(v) + 1 for v in value)
+    if isinstance(value, np.generic):
+        return value.itemsize
+    return len(str(value))
+
+
+def estimate_row_bytes(row: Dict[str, Any]) -> int:
+    return sum(estimate_bytes(v) for v in row.values())
+
+
+class Batch(list):
+    """A list of rows that also carries its estimated size."""
+
+    nbytes = 0
+
+
+class AdaptiveBatcher:
+    def __init__(
+        self,
+        target_bytes: int = 4 << 20,
+        min_bytes: int = 256 << 10,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_rows: Optional[int] = None,
+        adapt: bool = True,
+        step: float = 1.25,
+        window: int = 3,
+        max_latency: Optional[float] = None,
+    ):
+        if max_bytes > GRPC_MAX_BYTES:
+            raise ValueError(f"max_bytes must be <= GRPC_MAX_BYTES ({GRPC_MAX_BYTES}), got {max_bytes}")
+        if not 0 < target_bytes <= max_bytes:
+            raise ValueError(f"target_bytes must be in (0, {max_bytes}], got {target_bytes}")
+        min_bytes = min(min_bytes, target_bytes)
+        self.target_bytes = target_bytes
+        self.min_bytes = min_bytes
+        self.max_bytes = max_bytes
+        self.max_rows = max_rows
+        self.adapt = adapt
+        self.step = step
+        self.window = window
+        self.max_latency = max_latency
+        self._batch = Batch()
+        self._lock = threading.Lock()
+        # hill climbing state
+        self._direction = 1
+        self._window_bytes = 0
+        self._window_seconds = 0.0
+        self._window_batches = 0
+        self._last_rate: Optional[float] = None
+        # run summary
+        self.batch_rows: List[int] = []
+        self.batch_bytes: List[int] = []
+        self.latencies: List[float] = []
+        self.targets: List[int] = [target_bytes]
+
+    def cut_before(self, row_bytes: int, batch_bytes: int, batch_rows: int) -> bool:
+        """Whether a batch of batch_rows rows and batch_bytes must be sent before a row of row_bytes joins it.
+
+        For callers that keep their own buffer (column data); raises ValueError for a row above the gRPC limit.
+        """
+        if row_bytes > GRPC_MAX_BYTES:
+            raise ValueError(f"row of ~{row_bytes} bytes exceeds the gRPC message limit of {GRPC_MAX_BYTES} bytes")
+        if not batch_rows:
+            return False
+        return batch_bytes + row_bytes > self.target_bytes or bool(self.max_rows and batch_rows >= self.max_rows)
+
+    def cut(self, row_bytes: int) -> Optional[Batch]:
+        """The buffered batch if it must be sent before a row of row_bytes is added, else None."""
+        if self.cut_before(row_bytes, self._batch.nbytes, len(self._batch)):
+            return self.take()
+        return None
+
+    def add(self, row: Any, nbytes: Optional[int] = None) -> Optional[Batch]:
+        """Buffer row; returns the previous rows as a batch to send when row does not fit in it."""
+        row_bytes = estimate_row_bytes(row) if nbytes is None else nbytes
+        full = self.cut(row_bytes)
+        self._batch.append(row)
+        self._batch.nbytes += row_bytes
+        return full
+
+    def take(self) -> Batch:
+        """The buffered rows (possibly empty) as a batch, leaving the buffer empty."""
+        batch, self._batch = self._batch, Batch()
+        return batch
+
+    def next_count(self, row_bytes: int) -> int:
+        """Rows per batch for fixed-size rows of row_bytes each."""
+        count = max(1, self.target_bytes // max(row_bytes, 1))
+        return min(count, self.max_rows) if self.max_rows else count
+
+    def record(self, batch: Any, seconds: float, nbytes: Optional[int] = None) -> None:
+        """Report one acknowledged batch (a Batch, or a row count with nbytes) and adapt the target."""
+        rows = batch if isinstance(batch, int) else len(batch)
+        nbytes = getattr(batch, "nbytes", 0) if nbytes is None else nbytes
+        with self._lock:
+            self.batch_rows.append(rows)
+            self.batch_bytes.append(nbytes)
+            self.latencies.append(seconds)
+            if not self.adapt:
+                return
+            if self.max_latency is not None and seconds > self.max_latency:
+                self._direction = -1
+                self._move()
+                return
+            self._window_bytes += nbytes
+            self._window_seconds += seconds
+            self._window_batches += 1
+            if self._window_batches < self.window:
+                return
+            rate = self._window_bytes / self._window_seconds if self._window_seconds > 0 else float("inf")
+            if self._last_rate is not None and rate < self._last_rate:
+                self._direction = -self._direction
+            self._last_rate = rate
+            self._move()
+
+    def _move(self) -> None:
+        factor = self.step if self._direction > 0 else 1.0 / self.step
+        target = int(min(self.max_bytes, max(self.min_bytes, self.target_bytes * factor)))
+        if target in (self.min_bytes, self.max_bytes):
+            # bounce off the bounds instead of sticking to them
+            self._direction = -1 if target == self.max_bytes else 1
+        self.target_bytes = target
+        self.targets.append(target)
+        self._window_bytes = 0
+        self._window_seconds = 0.0
+        self._window_batches = 0
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = np.asarray(self.batch_rows, dtype=np.int64)
+            nbytes = np.asarray(self.batch_bytes, dtype=np.int64)
+            seconds = float(np.sum(self.latencies))
+            if not len(rows):
+                return {"batches": 0, "final_target_bytes": self.target_bytes}
+            return {
+                "batches": int(len(rows)),
+                "rows": int(rows.sum()),
+                "bytes": int(nbytes.sum()),
+                "batch_rows": {"min": int(rows.min()), "p50": int(np.median(rows)), "max": int(rows.max())},
+                "batch_bytes": {"min": int(nbytes.min()), "p50": int(np.median(nbytes)), "max": int(nbytes.max())},
+                "latency_s": {"p50": round(float(np.median(self.latencies)), 4),
+                              "max": round(float(np.max(self.latencies)), 4)},
+                "insert_mb_per_s": round(float(nbytes.sum()) / seconds / 1e6, 2) if seconds > 0 else 0.0,
+                "final_target_bytes": self.target_bytes,
+                "target_changes": len(self.targets) - 1,
+            }
+
+    def log_summary(self, log: Callable[[str], Any] = print) -> Dict[str, Any]:
+        s = self.summary()
+        if not s["batches"]:
+            log("Batcher: no batches sent")
+            return s
+        log(f"Batcher: {s['batches']} batches, {s['rows']} rows, {s['bytes'] / 1e6:.1f} MB, "
+            f"{s['insert_mb_per_s']} MB/s while inserting")
+        log(f"  rows per batch   min={s['batch_rows']['min']} p50={s['batch_rows']['p50']} max={s['batch_rows']['max']}")
+        log(f"  bytes per batch  min={s['batch_bytes']['min']} p50={s['batch_bytes']['p50']} max={s['batch_bytes']['max']}")
+        log(f"  final target {s['final_target_bytes']} bytes after {s['target_changes']} adjustments")
+        return s
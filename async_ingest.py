@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""asyncio ingest driver on ``AsyncMilvusClient`` with a bounded in-flight window.
+
+The importers send a batch with a blocking ``client.insert`` and only then read
+the next one, so one thread has one RPC in flight and more throughput needs
+more threads or processes. ``ingest_async`` keeps up to ``window`` insert
+requests in flight from a single event loop:
+
+* the next batch is produced on a worker thread (``asyncio.to_thread``) while
+  the requests already sent are in flight, so reading / parsing overlaps with
+  the network,
+* a new request is only started once one of the ``window`` slots is free, and
+  at most one produced batch waits for a slot: the reader is back-pressured by
+  the server instead of buffering the whole input,
+* every request's latency is recorded and returned with the run summary.
+
+    async def main():
+        client = AsyncMilvusClient(uri)
+        summary = await ingest_async(batches, client_inserter(client, "c"), window=16)
+        await client.close()
+
+or ``run_ingest(lambda: AsyncMilvusClient(uri), "c", batches, window=16)`` from
+synchronous code. A failed request stops reading, waits for the requests in
+flight and re-raises the first error.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from columnar_insert import insert_columns_async
+from ingest_metrics import latency_percentiles
+
+_END = object()
+
+
+def client_inserter(client: Any, collection_name: str, columnar: bool = False, partition_name: str = "",
+                    timeout: Optional[float] = None) -> Callable[[Any], Awaitable[int]]:
+    """insert(batch) coroutine for an AsyncMilvusClient: rows, or column dicts with columnar=True."""
+    async def insert(batch: Any) -> int:
+        if columnar:
+            return await insert_columns_async(client, collection_name, batch, partition_name, timeout)
+        res = await client.insert(collection_name=collection_name, data=batch, partition_name=partition_name,
+                                  timeout=timeout)
+        return res["insert_count"]
+    return insert
+
+
+def batch_len(batch: Any) -> int:
+    """Rows of a batch: a list of rows or a dict of equally long columns."""
+    if isinstance(batch, dict):
+        return len(next(iter(batch.values()))) if batch else 0
+    return len(batch)
+
+
+async def ingest_async(
+    batches: Iterable[Any],
+    insert: Callable[[Any], Awaitable[int]],
+    window: int = 8,
+    metrics: Any = None,
+    progress_every: int = 0,
+    log: Callable[[str], Any] = print,
+) -> Dict[str, Any]:
+    """Send every batch with insert(batch), keeping at most window requests in flight.
+
+    insert returns the number of rows inserted. batches is iterated on a worker
+    thread, one batch at a time. With metrics (an IngestMetrics) every request
+    is also recorded there. Returns inserted / batches / wall_s / rows_per_s,
+    the per-request latencies in seconds and their percentiles.
+    """
+    if window < 1:
+        raise ValueError(f"window must be >= 1, got {window}")
+    slots = asyncio.Semaphore(window)
+    tasks = set()
+    latencies: List[float] = []
+    errors: List[BaseException] = []
+    state = {"inserted": 0, "batches": 0, "in_flight": 0, "max_in_flight": 0}
+    it = iter(batches)
+
+    async def send(batch: Any) -> None:
+        try:
+            start = time.perf_counter()
+            n = await insert(batch)
+            elapsed = time.perf_counter() - start
+            latencies.append(elapsed)
+            if metrics is not None:
+                metrics.rpc(elapsed, n, getattr(batch, "nbytes", 0))
+            before = state["inserted"]
+            state["inserted"] += n
+            state["batches"] += 1
+            if progress_every and state["inserted"] // progress_every > before // progress_every:
+                log(f"Inserted {state['inserted']} rows...")
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            state["in_flight"] -= 1
+            slots.release()
+
+    start = time.perf_counter()
+    try:
+        while not errors:
+            # read ahead on a thread while the window is busy
+            batch = await asyncio.to_thread(next, it, _END)
+            if batch is _END:
+                break
+            await slots.acquire()
+            if errors:
+                slots.release()
+                break
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            task = asyncio.create_task(send(batch))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    finally:
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+    if errors:
+        raise errors[0]
+    wall = time.perf_counter() - start
+    return {
+        "inserted": state["inserted"],
+        "batches": state["batches"],
+        "window": window,
+        "max_in_flight": state["max_in_flight"],
+        "wall_s": round(wall, 3),
+        "rows_per_s": round(state["inserted"] / wall, 1) if wall > 0 else 0.0,
+        "latency": latency_percentiles(latencies),
+        "latencies": latencies,
+    }
+
+
+def run_ingest(
+    make_client: Callable[[], Any],
+    collection_name: str,
+    batches: Iterable[Any],
+    window: int = 8,
+    columnar: bool = False,
+    metrics: Any = None,
+    progress_every: int = 0,
+    log: Callable[[str], Any] = print,
+) -> Dict[str, Any]:
+    """ingest_async in a fresh event loop with a client created (and closed) inside it."""
+    async def main() -> Dict[str, Any]:
+        client = make_client()
+        try:
+            return await ingest_async(batches, client_inserter(client, collection_name, columnar), window,
+                                      metrics, progress_every, log)
+        finally:
+            await client.close()
+    return asyncio.run(main())
+
+
+def log_summary(summary: Dict[str, Any], log: Callable[[str], Any] = print) -> None:
+    lat = summary["latency"]
+    log(f"Async ingest: {summary['inserted']} rows in {summary['batches']} requests, {summary['wall_s']}s "
+        f"({summary['rows_per_s']:,.0f} rows/s), window={summary['window']} max in flight={summary['max_in_flight']}")
+    if lat["count"]:
+        log(f"  request latency p50={lat['p50_ms']}ms p90={lat['p90_ms']}ms p99={lat['p99_ms']}ms "
+            f"max={lat['max_ms']}ms")
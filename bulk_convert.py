@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""Offline JSONL -> bulk-import files converter, no Milvus server needed.
+
+Loading 100M rows through ``insert`` costs 100k client RPCs, each serialized
+by Python. Milvus' bulk import instead reads whole column files from object
+storage on the server side. This script turns JSONL (plus generated vectors, or
+vectors loaded from a ``.npy``) into such files:
+
+* ``--format numpy``: one directory per chunk with ``<field>.npy`` per field
+  (int64 PKs, an (n, dim) float32 block, the JSON documents as a str array),
+* ``--format parquet``: one ``.parquet`` file per chunk (needs pyarrow).
+
+Chunk sizes are planned from the JSON bytes plus the PK and vector, which is
+what a Parquet chunk holds; a NumPy str array is fixed-width UTF-32, so with
+documents of very different lengths NumPy chunks come out several times larger.
+
+The input is planned into chunks of about ``--chunk-mb`` of output from the
+newline positions alone (a numpy scan over an mmap), so every chunk is a byte
+range of one input file and ``--workers`` processes convert chunks
+independently, each seeking straight to its own range.
+
+Row ``k`` of the input (counting lines across all files in order) gets PK
+``pk_start + k`` and, with ``--vectors``, row ``k`` of that array. Blank or
+invalid lines are skipped and leave a gap in the PKs, so the PKs do not depend
+on chunking or on the number of workers. Generated vectors are seeded per chunk
+from ``--seed``, so a run is reproducible for a given ``--chunk-mb``.
+
+    python bulk_convert.py --files 'data/*.jsonl' --out bulk/ --format numpy --chunk-mb 512 --workers 8
+
+``<out>/manifest.json`` lists the files of each chunk: upload them to the
+Milvus bucket and pass each chunk's list to ``utility.do_bulk_insert``.
+"""
+import argparse
+import glob
+import json
+import mmap
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from compressed_input import compression_of
+from jsonl_io import is_valid_json_object, looks_like_json_object
+from vector_factory import DISTRIBUTIONS, make_vectors
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+FORMATS = ("numpy", "parquet")
+
+
+class FileChunk(NamedTuple):
+    """Lines [start, end) in bytes of one input file; first_row counts lines across all inputs."""
+
+    index: int
+    path: str
+    start: int
+    end: int
+    first_row: int
+    lines: int
+
+
+def plan_chunks(paths: Sequence[str], chunk_bytes: int, row_overhead: int,
+                max_rows: Optional[int] = None, block_size: int = 64 << 20) -> List[FileChunk]:
+    """Cut the inputs into chunks of about chunk_bytes of output each.
+
+    A row is estimated at its line length plus row_overhead (PK and vector), and
+    chunks never span files. With max_rows only the first max_rows lines are planned.
+    """
+    chunks: List[FileChunk] = []
+    row = 0
+    for path in paths:
+        if max_rows is not None and row >= max_rows:
+            break
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                continue
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                data = np.frombuffer(mm, dtype=np.uint8)
+                chunk_start, chunk_row, last_end = 0, row, 0
+                for lo in range(0, size, block_size):
+                    ends = np.flatnonzero(data[lo:lo + block_size] == 10) + lo + 1
+                    if lo + block_size >= size and data[-1] != 10:
+                        ends = np.append(ends, size)
+                    if max_rows is not None:
+                        ends = ends[:max_rows - row]
+                    # output bytes from the file start up to the end of each line, monotonic
+                    costs = ends + row_overhead * (np.arange(1, len(ends) + 1) + row)
+                    chunk_cost = chunk_start + row_overhead * chunk_row
+                    while True:
+                        j = int(np.searchsorted(costs, chunk_cost + chunk_bytes, side="left"))
+                        if j >= len(costs):
+                            break
+                        chunks.append(FileChunk(len(chunks), path, chunk_start, int(ends[j]), chunk_row,
+                                                row + j + 1 - chunk_row))
+                        chunk_start, chunk_row, chunk_cost = int(ends[j]), row + j + 1, int(costs[j])
+                    if len(ends):
+                        last_end = int(ends[-1])
+                    row += len(ends)
+                    if max_rows is not None and row >= max_rows:
+                        break
+                if row > chunk_row:
+                    chunks.append(FileChunk(len(chunks), path, chunk_start, last_end, chunk_row, row - chunk_row))
+                del data
+    return chunks
+
+
+def _iter_chunk_lines(chunk: FileChunk) -> Iterator[bytes]:
+    with open(chunk.path, "rb") as f:
+        f.seek(chunk.start)
+        remaining = chunk.end - chunk.start
+        for raw in f:
+            if remaining <= 0:
+                return
+            remaining -= len(raw)
+            yield raw
+
+
+def read_chunk(chunk: FileChunk, passthrough: bool = False) -> Dict[str, Any]:
+    """Row indexes (into the whole input) and JSON documents of the usable lines of a chunk."""
+    rows: List[int] = []
+    docs: List[str] = []
+    skipped = 0
+    check = looks_like_json_object if passthrough else is_valid_json_object
+    for i, raw in enumerate(_iter_chunk_lines(chunk)):
+        s = raw.decode("utf-8").strip()
+        if not s:
+            continue
+        if not check(s):
+            skipped += 1
+            if skipped <= 10:
+                print(f"[WARN] {chunk.path}: skip row {chunk.first_row + i}: not a JSON object")
+            continue
+        rows.append(chunk.first_row + i)
+        docs.append(s)
+    return {"rows": np.asarray(rows, dtype=np.int64), "docs": docs, "skipped": skipped}
+
+
+def write_numpy(out_dir: str, name: str, columns: Dict[str, np.ndarray]) -> List[str]:
+    """<out_dir>/<name>/<field>.npy per field, written under a temporary name and renamed into place."""
+    chunk_dir = os.path.join(out_dir, name)
+    tmp_dir = chunk_dir + ".tmp"
+    os.makedirs(tmp_dir, exist_ok=True)
+    for field, values in columns.items():
+        np.save(os.path.join(tmp_dir, f"{field}.npy"), values)
+    if os.path.isdir(chunk_dir):
+        for existing in os.listdir(chunk_dir):
+            os.remove(os.path.join(chunk_dir, existing))
+        os.rmdir(chunk_dir)
+    os.replace(tmp_dir, chunk_dir)
+    return [os.path.join(chunk_dir, f"{field}.npy") for field in columns]
+
+
+def write_parquet(out_dir: str, name: str, columns: Dict[str, np.ndarray]) -> List[str]:
+    """<out_dir>/<name>.parquet, vectors as list<float> columns."""
+    if pa is None:
+        raise RuntimeError("--format parquet needs pyarrow (pip install pyarrow)")
+    arrays = {}
+    for field, values in columns.items():
+        if values.ndim == 2:
+            offsets = np.arange(0, values.size + 1, values.shape[1], dtype=np.int32)
+            arrays[field] = pa.ListArray.from_arrays(pa.array(offsets), pa.array(values.reshape(-1)))
+        elif values.dtype.kind == "U":
+            arrays[field] = pa.array(values.tolist(), type=pa.string())
+        else:
+            arrays[field] = pa.array(values)
+    path = os.path.join(out_dir, f"{name}.parquet")
+    pq.write_table(pa.table(arrays), path + ".tmp")
+    os.replace(path + ".tmp", path)
+    return [path]
+
+
+WRITERS = {"numpy": write_numpy, "parquet": write_parquet}
+
+
+def convert_chunk(chunk: FileChunk, opts: Dict[str, Any]) -> Dict[str, Any]:
+    """Read, vectorize and write one chunk; returns its manifest entry."""
+    start = time.perf_counter()
+    parsed = read_chunk(chunk, opts["passthrough"])
+    rows = parsed["rows"]
+    if opts["vectors"] is not None:
+        vectors = np.load(opts["vectors"], mmap_mode="r")
+        block = np.ascontiguousarray(vectors[rows], dtype=np.float32)
+    else:
+        seed = np.random.default_rng([opts["seed"], chunk.index])
+        block = make_vectors(len(rows), opts["dim"], opts["dist"], seed, **opts["dist_kwargs"])
+    columns = {
+        opts["pk_field"]: rows + opts["pk_start"],
+        opts["vector_field"]: block,
+        opts["json_field"]: np.asarray(parsed["docs"], dtype=str) if parsed["docs"] else np.empty(0, dtype="<U1"),
+    }
+    files = WRITERS[opts["format"]](opts["out"], f"{chunk.index:05d}", columns)
+    return {
+        "chunk": chunk.index,
+        "source": chunk.path,
+        "rows": int(len(rows)),
+        "skipped": parsed["skipped"],
+        "bytes": sum(os.path.getsize(p) for p in files),
+        "files": files,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def _convert_job(args) -> Dict[str, Any]:
+    return convert_chunk(*args)
+
+
+def convert(
+    paths: Sequence[str],
+    out: str,
+    fmt: str = "numpy",
+    chunk_mb: float = 512,
+    workers: int = 0,
+    dim: int = 768,
+    dist: str = "uniform",
+    seed: int = 19530,
+    vectors: Optional[str] = None,
+    pk_start: int = 1,
+    max_rows: Optional[int] = None,
+    pk_field: str = "id",
+    json_field: str = "json",
+    vector_field: str = "vec",
+    passthrough: bool = False,
+) -> Dict[str, Any]:
+    """Convert paths into bulk-import chunks under out and write out/manifest.json; returns the manifest."""
+    if fmt not in WRITERS:
+        raise ValueError(f"Unsupported format: {fmt!r}, expected one of {FORMATS}")
+    if fmt == "parquet" and pa is None:
+        raise RuntimeError("--format parquet needs pyarrow (pip install pyarrow)")
+    compressed = [p for p in paths if compression_of(p) is not None]
+    if compressed:
+        # chunks are byte ranges of the input files, which a compressed stream cannot seek to
+        raise ValueError(f"Compressed inputs are not supported, decompress them first: {compressed}")
+    if vectors is not None:
+        loaded = np.load(vectors, mmap_mode="r")
+        if loaded.ndim != 2:
+            raise ValueError(f"{vectors}: expected an (n, dim) array, got shape {loaded.shape}")
+        dim = loaded.shape[1]
+    dist_kwargs: Dict[str, Any] = {}
+    if vectors is None and dist == "clustered":
+        # every chunk must draw around the same centers
+        dist_kwargs["centers"] = np.random.default_rng(seed).random((16, dim), dtype=np.float32)
+
+    start = time.perf_counter()
+    os.makedirs(out, exist_ok=True)
+    chunks = plan_chunks(paths, int(chunk_mb * (1 << 20)), 8 + 4 * dim, max_rows)
+    total_lines = sum(c.lines for c in chunks)
+    if vectors is not None and total_lines > len(loaded):
+        raise ValueError(f"{vectors} has {len(loaded)} vectors for {total_lines} input lines")
+    print(f"Planned {len(chunks)} chunks for {total_lines} lines in {len(paths)} files "
+          f"({time.perf_counter() - start:.2f}s)")
+
+    opts = {
+        "out": out, "format": fmt, "dim": dim, "dist": dist, "dist_kwargs": dist_kwargs, "seed": seed,
+        "vectors": vectors, "pk_start": pk_start, "pk_field": pk_field, "json_field": json_field,
+        "vector_field": vector_field, "passthrough": passthrough,
+    }
+    jobs = [(chunk, opts) for chunk in chunks]
+    workers = workers or os.cpu_count() or 1
+    results = []
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            for result in pool.map(_convert_job, jobs):
+                results.append(result)
+                print(f"Chunk {result['chunk']}: {result['rows']} rows, {result['bytes'] / 1e6:.1f} MB")
+    else:
+        for job in jobs:
+            result = _convert_job(job)
+            results.append(result)
+            print(f"Chunk {result['chunk']}: {result['rows']} rows, {result['bytes'] / 1e6:.1f} MB")
+
+    wall = time.perf_counter() - start
+    rows = sum(r["rows"] for r in results)
+    manifest = {
+        "format": fmt,
+        "fields": {"pk": pk_field, "vector": vector_field, "json": json_field, "dim": dim},
+        "inputs": [os.path.abspath(p) for p in paths],
+        "rows": rows,
+        "skipped": sum(r["skipped"] for r in results),
+        "bytes": sum(r["bytes"] for r in results),
+        "wall_s": round(wall, 3),
+        "rows_per_s": round(rows / wall, 1) if wall > 0 else 0.0,
+        "chunks": results,
+    }
+    with open(os.path.join(out, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convert JSONL into Milvus bulk-import files (no server needed)")
+    parser.add_argument("--file", help="Input JSONL file")
+    parser.add_argument("--files", help="Glob of input JSONL files, converted in sorted order")
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--format", choices=FORMATS, default="numpy")
+    parser.add_argument("--chunk-mb", type=float, default=512, help="Approximate output size per chunk")
+    parser.add_argument("--workers", type=int, default=0, help="Converter processes (default: CPU count)")
+    parser.add_argument("--pk-field", default="id")
+    parser.add_argument("--json-field", default="json")
+    parser.add_argument("--vector-field", default="vec")
+    parser.add_argument("--dim", type=int, default=768, help="Generated vector dimension")
+    parser.add_argument("--rand-dist", choices=DISTRIBUTIONS, default="uniform")
+    parser.add_argument("--seed", type=int, default=19530)
+    parser.add_argument("--vectors", help="(n, dim) .npy of vectors to use instead of generated ones, row k for line k")
+    parser.add_argument("--pk-start", type=int, default=1)
+    parser.add_argument("--max-rows", type=int, default=None, help="Only convert the first max-rows lines")
+    parser.add_argument("--passthrough-json", action="store_true",
+                        help="Only check that each line looks like a JSON object instead of validating it")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if bool(args.file) == bool(args.files):
+        raise SystemExit("Specify exactly one of --file or --files")
+    paths = [args.file] if args.file else sorted(f for f in glob.glob(args.files) if os.path.isfile(f))
+    if not paths:
+        raise SystemExit(f"No input files match {args.files!r}")
+    manifest = convert(
+        paths,
+        args.out,
+        fmt=args.format,
+        chunk_mb=args.chunk_mb,
+        workers=args.workers,
+        dim=args.dim,
+        dist=args.rand_dist,
+        seed=args.seed,
+        vectors=args.vectors,
+        pk_start=args.pk_start,
+        max_rows=args.max_rows,
+        pk_field=args.pk_field,
+        json_field=args.json_field,
+        vector_field=args.vector_field,
+        passthrough=args.passthrough_json,
+    )
+    print(f"Wrote {manifest['rows']} rows ({manifest['skipped']} skipped) in {len(manifest['chunks'])} chunks, "
+          f"{manifest['bytes'] / 1e6:.1f} MB in {manifest['wall_s']}s ({manifest['rows_per_s']:,.0f} rows/s)")
+    print(f"Manifest: {os.path.join(args.out, 'manifest.json')}")
+
+
+if __name__ == "__main__":
+    main()
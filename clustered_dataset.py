@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Deterministic Gaussian-mixture vector datasets for ANN benchmarking.
+
+i.i.d. uniform vectors have no neighbourhood structure, so HNSW / IVF / DISKANN
+recall and latency measured on them say little about real embeddings. A
+``ClusteredDataset`` draws vectors from a Gaussian mixture instead:
+
+* ``n_clusters`` cluster centers with sizes following a Zipf law of exponent
+  ``skew`` (0 gives equal-sized clusters),
+* isotropic intra-cluster noise of standard deviation ``cluster_std``,
+* an ``intrinsic_dim``-dimensional latent space embedded into ``dim`` through a
+  random orthonormal basis, plus optional ambient ``noise_std``.
+
+Rows are produced in fixed ``CHUNK_ROWS`` chunks, each seeded from
+``SeedSequence(seed, spawn_key=(chunk,))``, so any row range can be generated
+on its own and the data is identical whatever block size the caller streams
+with. Nothing larger than one chunk is held in memory.
+
+    python clustered_dataset.py --rows 10000000 --dim 128 --out base.npy
+"""
+import argparse
+import time
+from typing import Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+CHUNK_ROWS = 65536
+
+# spawn keys of the model and of the query stream, chunks use (chunk_index,)
+_MODEL_KEY = (1 << 32,)
+_QUERY_KEY = (1 << 32) + 1
+
+
+class ClusteredDataset:
+    def __init__(
+        self,
+        n_rows: int,
+        dim: int,
+        n_clusters: int = 1024,
+        cluster_std: float = 0.15,
+        intrinsic_dim: Optional[int] = None,
+        skew: float = 0.0,
+        noise_std: float = 0.0,
+        normalize: bool = False,
+        seed: int = 0,
+    ):
+        if intrinsic_dim is not None and not 0 < intrinsic_dim <= dim:
+            raise ValueError(f"intrinsic_dim must be in (0, {dim}], got {intrinsic_dim}")
+        self.n_rows = n_rows
+        self.dim = dim
+        self.n_clusters = n_clusters
+        self.cluster_std = cluster_std
+        self.intrinsic_dim = intrinsic_dim or dim
+        self.skew = skew
+        self.noise_std = noise_std
+        self.normalize = normalize
+        self.seed = seed
+
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=_MODEL_KEY))
+        k = self.intrinsic_dim
+        self.centers = rng.standard_normal((n_clusters, k), dtype=np.float32)
+        if k < dim:
+            q, _ = np.linalg.qr(rng.standard_normal((dim, k)))
+            self.basis = np.ascontiguousarray(q.T, dtype=np.float32)  # (k, dim), orthonormal rows
+        else:
+            self.basis = None
+        # cluster i gets weight (rank + 1) ** -skew, ranks shuffled so big clusters are not all adjacent
+        ranks = rng.permutation(n_clusters)
+        weights = (ranks + 1.0) ** -skew
+        self.weights = weights / weights.sum()
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def __repr__(self) -> str:
+        return (
+            f"ClusteredDataset(n_rows={self.n_rows}, dim={self.dim}, n_clusters={self.n_clusters}, "
+            f"cluster_std={self.cluster_std}, intrinsic_dim={self.intrinsic_dim}, skew={self.skew}, "
+            f"noise_std={self.noise_std}, normalize={self.normalize}, seed={self.seed})"
+        )
+
+    def _sample(self, rng: np.random.Generator, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        labels = rng.choice(self.n_clusters, size=n, p=self.weights)
+        latent = rng.standard_normal((n, self.intrinsic_dim), dtype=np.float32)
+        latent *= np.float32(self.cluster_std)
+        latent += self.centers[labels]
+        vectors = latent @ self.basis if self.basis is not None else latent
+        if self.noise_std > 0:
+            vectors += rng.standard_normal(vectors.shape, dtype=np.float32) * np.float32(self.noise_std)
+        if self.normalize:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return np.ascontiguousarray(vectors, dtype=np.float32), labels
+
+    def _chunk(self, chunk: int) -> Tuple[np.ndarray, np.ndarray]:
+        start = chunk * CHUNK_ROWS
+        n = min(CHUNK_ROWS, self.n_rows - start)
+        rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(chunk,)))
+        return self._sample(rng, n)
+
+    def iter_blocks(
+        self,
+        block_rows: int = 10000,
+        start: int = 0,
+        stop: Optional[int] = None,
+        with_labels: bool = False,
+    ) -> Iterator[Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]]:
+        """Yield rows [start, stop) in float32 blocks of block_rows (optionally with cluster labels)."""
+        stop = self.n_rows if stop is None else min(stop, self.n_rows)
+        pos = start
+        cached_chunk, cached = -1, None
+        while pos < stop:
+            end = min(pos + block_rows, stop)
+            parts, part_labels = [], []
+            while pos < end:
+                chunk = pos // CHUNK_ROWS
+                if chunk != cached_chunk:
+                    cached_chunk, cached = chunk, self._chunk(chunk)
+                lo = pos - chunk * CHUNK_ROWS
+                hi = min(end - chunk * CHUNK_ROWS, CHUNK_ROWS)
+                parts.append(cached[0][lo:hi])
+                part_labels.append(cached[1][lo:hi])
+                pos += hi - lo
+            block = parts[0] if len(parts) == 1 else np.concatenate(parts)
+            if with_labels:
+                yield block, (part_labels[0] if len(part_labels) == 1 else np.concatenate(part_labels))
+            else:
+                yield block
+
+    def block(self, start: int, stop: int) -> np.ndarray:
+        """Rows [start, stop) as one float32 array."""
+        return np.concatenate(list(self.iter_blocks(stop - start, start, stop)))
+
+    def queries(self, nq: int, seed_offset: int = 0) -> np.ndarray:
+        """nq query vectors from the same mixture, independent of the base rows."""
+        rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(_QUERY_KEY, seed_offset)))
+        return self._sample(rng, nq)[0]
+
+    def save_npy(self, path: str, block_rows: int = CHUNK_ROWS) -> None:
+        """Stream the whole dataset into an .npy file (openable later with mmap_mode='r')."""
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(self.n_rows, self.dim))
+        pos = 0
+        for block in self.iter_blocks(block_rows):
+            out[pos:pos + len(block)] = block
+            pos += len(block)
+        out.flush()
+        del out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a clustered (Gaussian mixture) vector dataset")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--clusters", type=int, default=1024)
+    parser.add_argument("--cluster-std", type=float, default=0.15)
+    parser.add_argument("--intrinsic-dim", type=int, default=None)
+    parser.add_argument("--skew", type=float, default=0.0, help="Zipf exponent of cluster sizes (0: equal sizes)")
+    parser.add_argument("--noise-std", type=float, default=0.0)
+    parser.add_argument("--normalize", action="store_true", help="L2-normalize rows (COSINE / IP)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="Write an .npy file (default: only time generation)")
+    args = parser.parse_args()
+
+    dataset = ClusteredDataset(
+        args.rows, args.dim, args.clusters, args.cluster_std, args.intrinsic_dim,
+        args.skew, args.noise_std, args.normalize, args.seed,
+    )
+    start = time.perf_counter()
+    if args.out:
+        dataset.save_npy(args.out)
+    else:
+        for _ in dataset.iter_blocks(CHUNK_ROWS):
+            pass
+    elapsed = time.perf_counter() - start
+    print(f"{dataset}: {args.rows / elapsed:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Streaming column-batch protocol shared by the data generators and insert loops.
+
+A generator yields ``ColumnBatch`` objects of bounded size (a pk array, vector
+blocks, scalar columns and JSON documents) and the insert loop consumes and
+drops each one before the next is produced, so client memory stays constant
+no matter how many rows are inserted in total. A column may also be a compact
+object with ``to_rows()`` / ``to_column()`` (e.g. ``sparse_vectors.SparseBatch``),
+which is only expanded at the insert boundary.
+
+    for batch in generator.iter_batches(10_000_000, 10000):
+        client.insert(collection_name=name, data=batch.to_rows())
+
+or, with the ORM ``Collection``, ``collection.insert(batch.to_columns(names))``.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+
+@dataclass
+class ColumnBatch:
+    pks: np.ndarray
+    # None for auto_id collections: pks then only counts the rows and is not sent
+    pk_field: Optional[str] = "id"
+    vectors: Dict[str, Any] = field(default_factory=dict)
+    scalars: Dict[str, Any] = field(default_factory=dict)
+    json: Dict[str, List[Any]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.pks)
+
+    def fields(self) -> Dict[str, Any]:
+        """All columns by field name: pk first, then vectors, scalars and JSON."""
+        columns = {self.pk_field: self.pks} if self.pk_field is not None else {}
+        columns.update(self.vectors)
+        columns.update(self.scalars)
+        columns.update(self.json)
+        return columns
+
+    def to_columns(self, field_names: Optional[List[str]] = None) -> List[Any]:
+        """Columns in field_names order (schema order for Collection.insert)."""
+        columns = self.fields()
+        names = field_names or list(columns)
+        out = []
+        for name in names:
+            col = columns[name]
+            # scalar numpy columns go over as Python lists, vector blocks stay 2-D arrays
+            if isinstance(col, np.ndarray) and col.ndim == 1:
+                col = col.tolist()
+            elif hasattr(col, "to_column"):
+                col = col.to_column()
+            out.append(col)
+        return out
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """One dict per row, for MilvusClient.insert / upsert."""
+        columns = self.fields()
+        names = list(columns)
+        values = []
+        for name in names:
+            col = columns[name]
+            if isinstance(col, np.ndarray) and col.ndim == 1:
+                col = col.tolist()
+            elif hasattr(col, "to_rows"):
+                col = col.to_rows()
+            values.append(col)
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def iter_column_batches(
+    total: int,
+    batch_size: int,
+    make_batch: Callable[[int, int], ColumnBatch],
+    start: int = 0,
+) -> Iterator[ColumnBatch]:
+    """Call make_batch(offset, count) for consecutive ranges covering [start, start + total)."""
+    for offset in range(start, start + total, batch_size):
+        yield make_batch(offset, min(batch_size, start + total - offset))
+
+
+def consume_batches(
+    batches: Iterable[ColumnBatch],
+    insert: Callable[[ColumnBatch], Any],
+    progress_every: Optional[int] = None,
+    log: Callable[[str], Any] = print,
+) -> int:
+    """Feed every batch to insert(batch) and return the number of rows inserted."""
+    total = 0
+    next_report = progress_every
+    for batch in batches:
+        insert(batch)
+        total += len(batch)
+        if next_report and total >= next_report:
+            log(f"Inserted {total} rows...")
+            next_report += progress_every
+    return total
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Streaming reads of gzip / zstd / bz2 compressed JSONL, decompressed off-thread.
+
+Exports arrive as ``.gz`` or ``.zst``; decompressing them to disk first doubles
+the I/O. Here a compressed file is read like a plain one, line by line, while a
+background thread decompresses it and cuts the output into blocks of whole
+lines that it hands over through a bounded queue. zlib, bz2 and zstandard drop
+the GIL while they work, so decompression overlaps with JSON parsing and the
+insert RPCs of the consuming thread, and the bounded queue keeps memory flat
+when the consumer is the slow side.
+
+The codec is detected from the file's magic bytes, so the extension does not
+matter and plain files pass through unchanged. zstd needs the ``zstandard``
+package; gzip and bz2 are in the standard library.
+
+    for raw in iter_lines("export.jsonl.zst"):      # bytes lines, newline included
+        ...
+    python compressed_input.py bench export.jsonl.gz   # decompress-only vs overlapped read
+"""
+import argparse
+import bz2
+import gzip
+import io
+import queue
+import threading
+import time
+from typing import BinaryIO, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# magic bytes -> codec
+_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+
+_DONE = object()
+_POLL = 0.1
+
+
+def compression_of(path: str) -> Optional[str]:
+    """'gzip', 'bz2', 'zstd' or None for an uncompressed file."""
+    with open(path, "rb") as f:
+        head = f.read(4)
+    for magic, codec in _MAGIC:
+        if head.startswith(magic):
+            return codec
+    return None
+
+
+def open_decompressed(path: str, codec: Optional[str] = None) -> BinaryIO:
+    """Binary stream of the decompressed content of path (the file itself if it is not compressed)."""
+    codec = codec or compression_of(path)
+    if codec == "gzip":
+        return gzip.open(path, "rb")
+    if codec == "bz2":
+        return bz2.open(path, "rb")
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError(f"{path} is zstd compressed, which needs zstandard (pip install zstandard)")
+        # read_across_frames: zstd CLI / pzstd outputs may hold several frames
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True,
+                                                         closefd=True)
+    return open(path, "rb")
+
+
+class _LineBlockReader:
+    """Background thread producing lists of whole lines of a decompressed file."""
+
+    def __init__(self, path: str, block_size: int, queue_size: int):
+        self.path = path
+        self.block_size = block_size
+        self.q: queue.Queue = queue.Queue(queue_size)
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="decompress", daemon=True)
+
+    def _put(self, item) -> bool:
+        while not self.stop.is_set():
+            try:
+                self.q.put(item, timeout=_POLL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self) -> None:
+        try:
+            with open_decompressed(self.path) as f:
+                carry = b""
+                while not self.stop.is_set():
+                    block = f.read(self.block_size)
+                    if not block:
+                        break
+                    data = carry + block if carry else block
+                    cut = data.rfind(b"\n") + 1
+                    carry = data[cut:]
+                    # BytesIO.readlines splits on b"\n" only, unlike bytes.splitlines
+                    if cut and not self._put(io.BytesIO(data[:cut]).readlines()):
+                        return
+                if carry:
+                    self._put([carry])
+            self._put(_DONE)
+        except BaseException as e:
+            self._put(e)
+
+    def __iter__(self) -> Iterator[List[bytes]]:
+        self.thread.start()
+        try:
+            while True:
+                item = self.q.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            self.stop.set()
+
+
+def iter_line_blocks(path: str, block_size: int = 1 << 20, queue_size: int = 16) -> Iterator[List[bytes]]:
+    """Lists of whole lines (bytes, newline included) of path, decompressed on a background thread.
+
+    At most queue_size blocks of about block_size decompressed bytes are buffered.
+    Closing the iterator early stops the thread.
+    """
+    yield from _LineBlockReader(path, block_size, queue_size)
+
+
+def iter_lines(path: str, block_size: int = 1 << 20, queue_size: int = 16) -> Iterator[bytes]:
+    """Lines of path, newline included; compressed files are decompressed off-thread."""
+    if compression_of(path) is None:
+        with open(path, "rb") as f:
+            yield from f
+        return
+    for lines in iter_line_blocks(path, block_size, queue_size):
+        yield from lines
+
+
+def count_lines_stream(path: str, block_size: int = 4 << 20) -> int:
+    """Number of lines of the decompressed content of path (a last line without newline counts)."""
+    lines = 0
+    last = b"\n"
+    with open_decompressed(path) as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            lines += block.count(b"\n")
+            last = block[-1:]
+    return lines + (last != b"\n")
+
+
+def benchmark(path: str) -> None:
+    """Seconds to decompress only, to split lines in the caller, and to read lines decompressed off-thread."""
+    codec = compression_of(path) or "none"
+    start = time.perf_counter()
+    with open_decompressed(path) as f:
+        size = 0
+        while True:
+            block = f.read(1 << 20)
+            if not block:
+                break
+            size += len(block)
+    decompress = time.perf_counter() - start
+
+    def consume(lines: Iterator[bytes]) -> float:
+        start = time.perf_counter()
+        for raw in lines:
+            # stand-in for per-line work that holds the GIL (strip + structural check)
+            raw.strip().startswith(b"{")
+        return time.perf_counter() - start
+
+    def inline_lines() -> Iterator[bytes]:
+        with open_decompressed(path) as f:
+            yield from f
+
+    inline = consume(inline_lines())
+    threaded = consume(iter_lines(path))
+    print(f"{path} ({codec}), {size / 1e6:.1f} MB decompressed")
+    print(f"  decompress only         {decompress:7.2f}s  {size / decompress / 1e6:7.1f} MB/s")
+    print(f"  lines, same thread      {inline:7.2f}s  {size / inline / 1e6:7.1f} MB/s")
+    print(f"  lines, off-thread       {threaded:7.2f}s  {size / threaded / 1e6:7.1f} MB/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compressed JSONL input tools")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    bench = sub.add_parser("bench", help="Time decompression with and without the background thread")
+    bench.add_argument("path")
+    args = parser.parse_args()
+    if args.cmd == "bench":
+        benchmark(args.path)
+
+
+if __name__ == "__main__":
+    main()
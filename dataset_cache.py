@@ -0,0 +1,243 @@
+"""Content-addressed on-disk dataset cache.
+
+A dataset is identified by the hash of its generator parameters (including the
+seed). The first run builds it into ``<cache_dir>/<key>/``; every later run with
+the same parameters reopens the files memory-mapped, so a benchmark can start
+inserting immediately instead of regenerating millions of rows in Python.
+
+Layout of one entry:
+
+* ``<name>.npy``                   vectors and scalar columns (fixed-width strings included)
+* ``<name>.values.npy`` + ``<name>.offsets.npy``   ragged list columns (ARRAY fields)
+* ``<name>.jsonl`` + ``<name>.offsets.npy``        pre-encoded JSON documents, one per line
+* ``meta.json``                    parameters and column kinds, written last
+
+Entries are built in a temporary directory and renamed into place, so an
+interrupted build never leaves a half-written entry behind.
+
+    ds = load_or_build({"script": "fix_mvcc", "rows": 10**6, "dim": 128, "seed": 1}, build)
+    ds.vectors("vector")[0:10000]
+"""
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from ragged_arrays import RaggedColumn
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CACHE_DIR = os.environ.get("DATASET_CACHE_DIR", ".dataset_cache")
+
+_META = "meta.json"
+
+
+def cache_key(params: Dict[str, Any]) -> str:
+    """Stable hash of the generator parameters."""
+    blob = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:20]
+
+
+def _encode_json(doc: Any) -> bytes:
+    if isinstance(doc, (bytes, bytearray)):
+        return bytes(doc)
+    if isinstance(doc, str):
+        return doc.encode("utf-8")
+    if orjson is not None:
+        return orjson.dumps(doc)
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class JsonLines:
+    """Memory-mapped pre-encoded JSON column; slicing returns the raw JSON strings."""
+
+    def __init__(self, path: str, offsets: np.ndarray):
+        self.path = path
+        self.offsets = offsets
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("JsonLines only supports contiguous slices")
+            bounds = self.offsets[start:stop + 1].tolist()
+            blob = self._mm[bounds[0]:bounds[-1]]
+            base = bounds[0]
+            # every line ends with "\n", drop it
+            return [
+                blob[lo - base:hi - base - 1].decode("utf-8")
+                for lo, hi in zip(bounds[:-1], bounds[1:])
+            ]
+        lo, hi = int(self.offsets[index]), int(self.offsets[index + 1])
+        return self._mm[lo:hi - 1].decode("utf-8")
+
+    def loads(self, start: int, stop: int) -> List[Any]:
+        """Rows [start, stop) decoded to Python objects."""
+        return [json.loads(s) for s in self[start:stop]]
+
+    def close(self) -> None:
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._file.close()
+
+
+class DatasetWriter:
+    """Handed to the build function; every add_* call writes one column."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.columns: Dict[str, str] = {}
+
+    def _file(self, name: str, suffix: str) -> str:
+        return os.path.join(self.path, f"{name}{suffix}")
+
+    def add_array(self, name: str, values: np.ndarray) -> None:
+        """A vector block or scalar column (strings become fixed-width unicode)."""
+        np.save(self._file(name, ".npy"), np.asarray(values), allow_pickle=False)
+        self.columns[name] = "array"
+
+    def add_vector_blocks(self, name: str, blocks: Iterable[np.ndarray], n_rows: int, dim: int, dtype=np.float32) -> None:
+        """Stream blocks into one (n_rows, dim) .npy without holding them all in memory."""
+        out = np.lib.format.open_memmap(self._file(name, ".npy"), mode="w+", dtype=dtype, shape=(n_rows, dim))
+        pos = 0
+        for block in blocks:
+            out[pos:pos + len(block)] = block
+            pos += len(block)
+        if pos != n_rows:
+            raise ValueError(f"column {name!r}: expected {n_rows} rows, got {pos}")
+        out.flush()
+        del out
+        self.columns[name] = "array"
+
+    def add_ragged(self, name: str, rows: Union[RaggedColumn, Iterable[Iterable[Any]]], dtype=None) -> None:
+        """A list-per-row column stored as a flat values buffer plus row offsets.
+
+        A RaggedColumn is written as is, without going through Python lists.
+        """
+        if isinstance(rows, RaggedColumn):
+            values = rows.values if dtype is None or dtype is str else rows.values.astype(dtype, copy=False)
+            np.save(self._file(name, ".values.npy"), values, allow_pickle=False)
+            np.save(self._file(name, ".offsets.npy"), rows.offsets - rows.offsets[0])
+            self.columns[name] = "ragged"
+            return
+        lengths = []
+        flat = []
+        for row in rows:
+            row = list(row)
+            lengths.append(len(row))
+            flat.extend(row)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        np.save(self._file(name, ".values.npy"), np.asarray(flat, dtype=dtype), allow_pickle=False)
+        np.save(self._file(name, ".offsets.npy"), offsets)
+        self.columns[name] = "ragged"
+
+    def add_json(self, name: str, docs: Iterable[Any]) -> None:
+        """JSON documents (dicts or already encoded strings), one line each."""
+        offsets = [0]
+        with open(self._file(name, ".jsonl"), "wb") as f:
+            for doc in docs:
+                line = _encode_json(doc) + b"\n"
+                f.write(line)
+                offsets.append(offsets[-1] + len(line))
+        np.save(self._file(name, ".offsets.npy"), np.asarray(offsets, dtype=np.int64))
+        self.columns[name] = "json"
+
+
+class CachedDataset:
+    """A cache entry opened for reading; arrays are memory-mapped."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, _META), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.columns: Dict[str, str] = self.meta["columns"]
+        self._opened: Dict[str, Any] = {}
+
+    def _file(self, name: str, suffix: str) -> str:
+        return os.path.join(self.path, f"{name}{suffix}")
+
+    def _kind(self, name: str, kind: str) -> None:
+        if self.columns.get(name) != kind:
+            raise KeyError(f"{name!r} is not a {kind} column of {self.path} (columns: {self.columns})")
+
+    def array(self, name: str) -> np.ndarray:
+        self._kind(name, "array")
+        if name not in self._opened:
+            self._opened[name] = np.load(self._file(name, ".npy"), mmap_mode="r")
+        return self._opened[name]
+
+    # vectors and scalar columns share the same storage
+    vectors = array
+    scalar = array
+
+    def ragged_column(self, name: str) -> RaggedColumn:
+        """A ragged column as a RaggedColumn over the memory-mapped buffers."""
+        self._kind(name, "ragged")
+        if name not in self._opened:
+            self._opened[name] = RaggedColumn(
+                np.load(self._file(name, ".values.npy"), mmap_mode="r"),
+                np.load(self._file(name, ".offsets.npy"), mmap_mode="r"),
+            )
+        return self._opened[name]
+
+    def ragged(self, name: str, start: int = 0, stop: Optional[int] = None) -> List[list]:
+        """Rows [start, stop) of a ragged column as Python lists."""
+        return self.ragged_column(name)[start:stop].to_rows()
+
+    def json(self, name: str) -> JsonLines:
+        self._kind(name, "json")
+        if name not in self._opened:
+            self._opened[name] = JsonLines(self._file(name, ".jsonl"), np.load(self._file(name, ".offsets.npy")))
+        return self._opened[name]
+
+
+def load_or_build(
+    params: Dict[str, Any],
+    build: Callable[[DatasetWriter], None],
+    cache_dir: str = CACHE_DIR,
+) -> CachedDataset:
+    """Open the cache entry for params, running build(writer) first if it does not exist yet."""
+    key = cache_key(params)
+    path = os.path.join(cache_dir, key)
+    if os.path.exists(os.path.join(path, _META)):
+        return CachedDataset(path)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # a directory without meta.json is a leftover, not a valid entry
+    shutil.rmtree(path, ignore_errors=True)
+    tmp = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    start = time.perf_counter()
+    try:
+        writer = DatasetWriter(tmp)
+        build(writer)
+        with open(os.path.join(tmp, _META), "w", encoding="utf-8") as f:
+            json.dump({"key": key, "params": params, "columns": writer.columns}, f, indent=2, default=str)
+        try:
+            os.replace(tmp, path)
+        except OSError:
+            # another process finished the same entry first
+            if not os.path.exists(os.path.join(path, _META)):
+                raise
+            shutil.rmtree(tmp, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    print(f"Built dataset cache {path} in {time.perf_counter() - start:.2f}s")
+    return CachedDataset(path)
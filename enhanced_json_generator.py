@@ -4,10 +4,39 @@ import json
 import numpy as np
 from datetime import datetime, timedelta
 import uuid
+import sys
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from column_batches import ColumnBatch, iter_column_batches
+from vector_factory import uniform_vectors
 
 class EnhancedJSONGenerator:
     """增强的JSON数据生成器"""
-    
+
+    DOMAINS = ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'example.com']
+    STREETS = ['Main St', 'Oak Ave', 'Pine Rd', 'Elm St', 'Maple Dr', 'Cedar Ln']
+    CITIES = ['New York', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix', 'Philadelphia']
+    STATES = ['NY', 'CA', 'IL', 'TX', 'AZ', 'PA']
+    FIRST_NAMES = ['John', 'Jane', 'Michael', 'Sarah', 'David', 'Emily', 'Robert', 'Lisa']
+    LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller']
+    CATEGORIES = ['electronics', 'clothing', 'books', 'home', 'sports', 'beauty', 'automotive']
+    BRANDS = ['Apple', 'Samsung', 'Nike', 'Adidas', 'Sony', 'LG', 'Canon', 'Dell']
+    FEATURES = [
+        "waterproof", "wireless", "bluetooth", "wifi", "touchscreen",
+        "rechargeable", "portable", "durable", "lightweight", "eco-friendly"
+    ]
+    LOG_LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+    SERVICES = ['web-server', 'database', 'auth-service', 'payment-service', 'notification-service']
+    IP_ADDRESSES = ['192.168.1.1', '10.0.0.1', '172.16.0.1', '127.0.0.1']
+    EVENT_TYPES = ['page_view', 'button_click', 'form_submit', 'purchase', 'download']
+    PAGE_NAMES = ['home', 'products', 'cart', 'checkout', 'profile', 'search']
+    DATA_TYPES = ["user_profile", "product", "order", "log", "analytics"]
+
     def __init__(self):
         self.counter = 0
         
@@ -19,9 +48,8 @@ class EnhancedJSONGenerator:
     
     def random_email(self):
         """生成随机邮箱"""
-        domains = ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'example.com']
         username = self.random_string(random.randint(5, 15))
-        domain = random.choice(domains)
+        domain = random.choice(self.DOMAINS)
         return f"{username}@{domain}"
     
     def random_phone(self):
@@ -43,14 +71,10 @@ class EnhancedJSONGenerator:
     
     def random_address(self):
         """生成随机地址"""
-        streets = ['Main St', 'Oak Ave', 'Pine Rd', 'Elm St', 'Maple Dr', 'Cedar Ln']
-        cities = ['New York', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix', 'Philadelphia']
-        states = ['NY', 'CA', 'IL', 'TX', 'AZ', 'PA']
-        
         street_num = random.randint(100, 9999)
-        street = random.choice(streets)
-        city = random.choice(cities)
-        state = random.choice(states)
+        street = random.choice(self.STREETS)
+        city = random.choice(self.CITIES)
+        state = random.choice(self.STATES)
         zip_code = random.randint(10000, 99999)
         
         return {
@@ -63,14 +87,11 @@ class EnhancedJSONGenerator:
     
     def random_user_profile(self, user_id):
         """生成随机用户档案"""
-        first_names = ['John', 'Jane', 'Michael', 'Sarah', 'David', 'Emily', 'Robert', 'Lisa']
-        last_names = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller']
-        
         profile = {
             "user_id": user_id,
             "personal_info": {
-                "first_name": random.choice(first_names),
-                "last_name": random.choice(last_names),
+                "first_name": random.choice(self.FIRST_NAMES),
+                "last_name": random.choice(self.LAST_NAMES),
                 "email": self.random_email(),
                 "phone": self.random_phone(),
                 "date_of_birth": self.random_date(datetime(1960, 1, 1), datetime(2000, 12, 31)),
@@ -99,16 +120,13 @@ class EnhancedJSONGenerator:
     
     def random_product_data(self, product_id):
         """生成随机产品数据"""
-        categories = ['electronics', 'clothing', 'books', 'home', 'sports', 'beauty', 'automotive']
-        brands = ['Apple', 'Samsung', 'Nike', 'Adidas', 'Sony', 'LG', 'Canon', 'Dell']
-        
         product = {
             "product_id": product_id,
             "basic_info": {
                 "name": f"Product {product_id}",
                 "sku": f"SKU-{product_id:06d}",
-                "category": random.choice(categories),
-                "brand": random.choice(brands),
+                "category": random.choice(self.CATEGORIES),
+                "brand": random.choice(self.BRANDS),
                 "model": f"Model-{self.random_string(4)}",
                 "description": f"This is a description for product {product_id}"
             },
@@ -144,10 +162,7 @@ class EnhancedJSONGenerator:
                     "height": round(random.uniform(1.0, 100.0), 2),
                     "weight": round(random.uniform(0.1, 50.0), 2)
                 },
-                "features": random.sample([
-                    "waterproof", "wireless", "bluetooth", "wifi", "touchscreen",
-                    "rechargeable", "portable", "durable", "lightweight", "eco-friendly"
-                ], random.randint(2, 6)),
+                "features": random.sample(self.FEATURES, random.randint(2, 6)),
                 "warranty_months": random.randint(0, 60)
             }
         }
@@ -195,21 +210,17 @@ class EnhancedJSONGenerator:
     
     def random_log_data(self, log_id):
         """生成随机日志数据"""
-        log_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
-        services = ['web-server', 'database', 'auth-service', 'payment-service', 'notification-service']
-        ip_addresses = ['192.168.1.1', '10.0.0.1', '172.16.0.1', '127.0.0.1']
-        
         log = {
             "log_id": log_id,
             "timestamp": self.random_date(datetime(2024, 1, 1), datetime(2024, 12, 31)),
-            "level": random.choice(log_levels),
-            "service": random.choice(services),
+            "level": random.choice(self.LOG_LEVELS),
+            "service": random.choice(self.SERVICES),
             "message": f"Log message {log_id} with some details",
             "context": {
                 "request_id": str(uuid.uuid4()),
                 "user_id": random.randint(1, 10000),
                 "session_id": str(uuid.uuid4()),
-                "ip_address": random.choice(ip_addresses),
+                "ip_address": random.choice(self.IP_ADDRESSES),
                 "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
                 "endpoint": random.choice(['/api/users', '/api/products', '/api/orders', '/api/auth'])
             },
@@ -224,18 +235,15 @@ class EnhancedJSONGenerator:
                 "error_type": random.choice(['ValidationError', 'DatabaseError', 'NetworkError', 'TimeoutError']),
                 "stack_trace": f"Error stack trace for log {log_id}",
                 "recovered": random.choice([True, False])
-            } if random.choice(log_levels) in ['ERROR', 'CRITICAL'] else None
+            } if random.choice(self.LOG_LEVELS) in ['ERROR', 'CRITICAL'] else None
         }
         return log
     
     def random_analytics_data(self, event_id):
         """生成随机分析数据"""
-        event_types = ['page_view', 'button_click', 'form_submit', 'purchase', 'download']
-        page_names = ['home', 'products', 'cart', 'checkout', 'profile', 'search']
-        
         analytics = {
             "event_id": event_id,
-            "event_type": random.choice(event_types),
+            "event_type": random.choice(self.EVENT_TYPES),
             "timestamp": self.random_date(datetime(2024, 1, 1), datetime(2024, 12, 31)),
             "user": {
                 "user_id": random.randint(1, 10000),
@@ -247,7 +255,7 @@ class EnhancedJSONGenerator:
                 "city": random.choice(['New York', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix'])
             },
             "page": {
-                "url": f"https://example.com/{random.choice(page_names)}",
+                "url": f"https://example.com/{random.choice(self.PAGE_NAMES)}",
                 "title": f"Page Title {event_id}",
                 "referrer": random.choice(['google.com', 'facebook.com', 'twitter.com', 'direct']),
                 "load_time_ms": random.randint(100, 5000)
@@ -284,19 +292,429 @@ class EnhancedJSONGenerator:
             return self.random_analytics_data(self.counter)
         else:
             # 混合类型
-            types = ["user_profile", "product", "order", "log", "analytics"]
-            return getattr(self, f"random_{random.choice(types)}_data")(self.counter)
+            return self.generate_complex_json(random.choice(self.DATA_TYPES), complexity)
     
-    def generate_batch(self, count, data_type="mixed", complexity="medium"):
-        """生成一批JSON数据"""
+    def generate_batch(self, count, data_type="mixed", complexity="medium", columnar=False, seed=None):
+        """生成一批JSON数据, columnar=True 时走按列向量化生成"""
+        if columnar:
+            return self.generate_batch_columnar(count, data_type, seed=seed)
         batch = []
         for i in range(count):
             self.counter = i
             batch.append(self.generate_complex_json(data_type, complexity))
         return batch
 
+    # ---------------- 按列(向量化)生成 ----------------
+    # 每个叶子字段对整批数据一次性用 numpy Generator 抽样, 最后单趟组装成 dict,
+    # 字段分布与上面的逐行版本保持一致.
+
+    def generate_batch_columnar(self, count, data_type="mixed", start_id=0, seed=None, encode=False):
+        """按列生成一批JSON数据, encode=True 时直接返回编码好的 JSON 行"""
+        rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+        ids = np.arange(start_id, start_id + count, dtype=np.int64)
+        if data_type == "mixed":
+            batch = [None] * count
+            kinds = rng.integers(0, len(self.DATA_TYPES), count)
+            for k, kind in enumerate(self.DATA_TYPES):
+                rows = np.flatnonzero(kinds == k)
+                if len(rows) == 0:
+                    continue
+                docs = self._columnar_builder(kind)(rng, ids[rows])
+                for row, doc in zip(rows.tolist(), docs):
+                    batch[row] = doc
+        else:
+            batch = self._columnar_builder(data_type)(rng, ids)
+        if encode:
+            if orjson is not None:
+                return [orjson.dumps(doc).decode() for doc in batch]
+            encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+            return [encoder.encode(doc) for doc in batch]
+        return batch
+
+    def iter_batches(self, total, batch_size, data_type="mixed", dim=128, seed=None, start_id=0,
+                     pk_field="my_id", vector_field="my_vector", json_field="my_json"):
+        """按批流式产出 ColumnBatch (pk, 向量块, JSON), 内存占用只和 batch_size 有关"""
+        rng = np.random.default_rng(seed)
+
+        def make_batch(offset, count):
+            return ColumnBatch(
+                pks=np.arange(offset, offset + count, dtype=np.int64),
+                pk_field=pk_field,
+                vectors={vector_field: uniform_vectors(count, dim, rng)},
+                json={json_field: self.generate_batch_columnar(count, data_type, start_id=offset, seed=rng)},
+            )
+
+        return iter_column_batches(total, batch_size, make_batch, start=start_id)
+
+    def _columnar_builder(self, data_type):
+        builders = {
+            "user_profile": self._columnar_user_profile,
+            "product": self._columnar_product_data,
+            "order": self._columnar_order_data,
+            "log": self._columnar_log_data,
+            "analytics": self._columnar_analytics_data,
+        }
+        if data_type not in builders:
+            raise ValueError(f"Unsupported data_type: {data_type}")
+        return builders[data_type]
+
+    @staticmethod
+    def _col_choice(rng, options, n):
+        """等概率从 options 中抽 n 个"""
+        return np.asarray(options, dtype=object)[rng.integers(0, len(options), n)].tolist()
+
+    @staticmethod
+    def _col_randint(rng, low, high, n):
+        """闭区间 [low, high] 整数"""
+        return rng.integers(low, high + 1, n).tolist()
+
+    @staticmethod
+    def _col_uniform(rng, low, high, n, decimals):
+        return np.round(rng.uniform(low, high, n), decimals).tolist()
+
+    @staticmethod
+    def _col_bool(rng, n):
+        return (rng.random(n) < 0.5).tolist()
+
+    @staticmethod
+    def _col_string(rng, lengths, charset=string.ascii_lowercase + string.digits):
+        """按行长度 lengths 生成随机字符串"""
+        lengths = np.asarray(lengths)
+        width = int(lengths.max()) if len(lengths) else 0
+        table = np.frombuffer(charset.encode(), dtype=np.uint8)
+        codes = table[rng.integers(0, len(table), (len(lengths), width))]
+        raw = codes.view(f"S{width}").ravel() if width else np.zeros(len(lengths), dtype="S1")
+        return [s[:l].decode() for s, l in zip(raw.tolist(), lengths.tolist())]
+
+    @staticmethod
+    def _col_date(rng, start_date, end_date, n):
+        """与 random_date 相同: 区间内随机某天 0 点的 isoformat"""
+        days = rng.integers(0, (end_date - start_date).days, n)
+        dates = np.datetime64(start_date, "s") + days.astype("timedelta64[D]")
+        return np.datetime_as_string(dates, unit="s").tolist()
+
+    @staticmethod
+    def _col_uuid4(rng, n):
+        raw = rng.integers(0, 256, (n, 16), dtype=np.uint8)
+        raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+        raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+        h = raw.tobytes().hex()
+        return [
+            f"{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-{h[i + 16:i + 20]}-{h[i + 20:i + 32]}"
+            for i in range(0, 32 * n, 32)
+        ]
+
+    def _col_email(self, rng, n):
+        names = self._col_string(rng, rng.integers(5, 16, n))
+        domains = self._col_choice(rng, self.DOMAINS, n)
+        return [f"{u}@{d}" for u, d in zip(names, domains)]
+
+    def _col_phone(self, rng, n):
+        a = self._col_randint(rng, 100, 999, n)
+        b = self._col_randint(rng, 100, 999, n)
+        c = self._col_randint(rng, 1000, 9999, n)
+        return [f"+1-{x}-{y}-{z}" for x, y, z in zip(a, b, c)]
+
+    def _col_address(self, rng, n):
+        nums = self._col_randint(rng, 100, 9999, n)
+        streets = self._col_choice(rng, self.STREETS, n)
+        cities = self._col_choice(rng, self.CITIES, n)
+        states = self._col_choice(rng, self.STATES, n)
+        zips = rng.integers(10000, 100000, n).astype(str).tolist()
+        return [
+            {"street": f"{num} {street}", "city": city, "state": state, "zip_code": zc, "country": "USA"}
+            for num, street, city, state, zc in zip(nums, streets, cities, states, zips)
+        ]
+
+    def _columnar_user_profile(self, rng, ids):
+        n = len(ids)
+        c = self._col_choice
+        cols = zip(
+            ids.tolist(),
+            c(rng, self.FIRST_NAMES, n),
+            c(rng, self.LAST_NAMES, n),
+            self._col_email(rng, n),
+            self._col_phone(rng, n),
+            self._col_date(rng, datetime(1960, 1, 1), datetime(2000, 12, 31), n),
+            c(rng, ["male", "female", "other"], n),
+            self._col_address(rng, n),
+            c(rng, ["en", "es", "fr", "de", "zh", "ja"], n),
+            c(rng, ["UTC-8", "UTC-5", "UTC+0", "UTC+1", "UTC+8"], n),
+            c(rng, ["light", "dark", "auto"], n),
+            self._col_bool(rng, n),
+            self._col_bool(rng, n),
+            self._col_bool(rng, n),
+            self._col_date(rng, datetime(2018, 1, 1), datetime(2023, 12, 31), n),
+            self._col_date(rng, datetime(2023, 1, 1), datetime(2024, 12, 31), n),
+            c(rng, ["active", "inactive", "suspended"], n),
+            self._col_randint(rng, 1, 5, n),
+            c(rng, ["free", "basic", "premium", "enterprise"], n),
+        )
+        return [
+            {
+                "user_id": uid,
+                "personal_info": {
+                    "first_name": first, "last_name": last, "email": email, "phone": phone,
+                    "date_of_birth": dob, "gender": gender, "address": address
+                },
+                "preferences": {
+                    "language": lang, "timezone": tz, "theme": theme,
+                    "notifications": {"email": n_email, "sms": n_sms, "push": n_push}
+                },
+                "account": {
+                    "created_at": created, "last_login": login, "status": status,
+                    "verification_level": level, "subscription_tier": tier
+                }
+            }
+            for (uid, first, last, email, phone, dob, gender, address, lang, tz, theme,
+                 n_email, n_sms, n_push, created, login, status, level, tier) in cols
+        ]
+
+    def _columnar_product_data(self, rng, ids):
+        n = len(ids)
+        u = self._col_uniform
+        r = self._col_randint
+        # random.sample(FEATURES, k): 对每行做随机排列后取前 k 个
+        order = np.argsort(rng.random((n, len(self.FEATURES))), axis=1)
+        k = rng.integers(2, 7, n)
+        feature_names = np.asarray(self.FEATURES, dtype=object)
+        features = [feature_names[o[:kk]].tolist() for o, kk in zip(order, k.tolist())]
+        cols = zip(
+            ids.tolist(),
+            self._col_choice(rng, self.CATEGORIES, n),
+            self._col_choice(rng, self.BRANDS, n),
+            self._col_string(rng, np.full(n, 4)),
+            u(rng, 10.0, 1000.0, n, 2), u(rng, 5.0, 800.0, n, 2), r(rng, 0, 50, n), u(rng, 0.0, 0.15, n, 3),
+            r(rng, 0, 1000, n), r(rng, 0, 100, n), r(rng, 10, 50, n), r(rng, 1, 20, n),
+            self._col_choice(rng, ["A1", "B2", "C3", "D4"], n),
+            u(rng, 1.0, 5.0, n, 1), r(rng, 0, 1000, n),
+            r(rng, 0, 500, n), r(rng, 0, 300, n), r(rng, 0, 150, n), r(rng, 0, 100, n), r(rng, 0, 50, n),
+            u(rng, 1.0, 100.0, n, 2), u(rng, 1.0, 100.0, n, 2), u(rng, 1.0, 100.0, n, 2), u(rng, 0.1, 50.0, n, 2),
+            features,
+            r(rng, 0, 60, n),
+        )
+        return [
+            {
+                "product_id": pid,
+                "basic_info": {
+                    "name": f"Product {pid}",
+                    "sku": f"SKU-{pid:06d}",
+                    "category": category,
+                    "brand": brand,
+                    "model": f"Model-{model}",
+                    "description": f"This is a description for product {pid}"
+                },
+                "pricing": {
+                    "base_price": base, "sale_price": sale, "currency": "USD",
+                    "discount_percentage": discount, "tax_rate": tax
+                },
+                "inventory": {
+                    "stock_quantity": stock, "reserved_quantity": reserved, "reorder_point": reorder,
+                    "supplier_id": supplier, "warehouse_location": location
+                },
+                "ratings": {
+                    "average_rating": avg, "total_reviews": reviews,
+                    "rating_distribution": {"5_star": s5, "4_star": s4, "3_star": s3, "2_star": s2, "1_star": s1}
+                },
+                "specifications": {
+                    "dimensions": {"length": length, "width": width, "height": height, "weight": weight},
+                    "features": feats,
+                    "warranty_months": warranty
+                }
+            }
+            for (pid, category, brand, model, base, sale, discount, tax, stock, reserved, reorder, supplier,
+                 location, avg, reviews, s5, s4, s3, s2, s1, length, width, height, weight, feats, warranty) in cols
+        ]
+
+    def _columnar_order_data(self, rng, ids):
+        n = len(ids)
+        u = self._col_uniform
+        c = self._col_choice
+        # items: 每行 1~5 个, 先按最大个数整块抽样再按行截断
+        n_items = rng.integers(1, 6, n).tolist()
+        item_cols = zip(
+            rng.integers(1, 101, (n, 5)).tolist(),
+            rng.integers(1, 11, (n, 5)).tolist(),
+            np.round(rng.uniform(10.0, 500.0, (n, 5)), 2).tolist(),
+            np.round(rng.uniform(10.0, 5000.0, (n, 5)), 2).tolist(),
+            np.round(rng.uniform(0.0, 50.0, (n, 5)), 2).tolist(),
+        )
+        items = [
+            [
+                {"product_id": p, "quantity": q, "unit_price": up, "total_price": tp, "discount": d}
+                for p, q, up, tp, d in zip(pr[:k], qt[:k], ups[:k], tps[:k], ds[:k])
+            ]
+            for k, (pr, qt, ups, tps, ds) in zip(n_items, item_cols)
+        ]
+        cols = zip(
+            ids.tolist(),
+            self._col_randint(rng, 1000, 9999, n),
+            self._col_email(rng, n),
+            self._col_phone(rng, n),
+            self._col_address(rng, n),
+            self._col_address(rng, n),
+            self._col_date(rng, datetime(2023, 1, 1), datetime(2024, 12, 31), n),
+            c(rng, ["pending", "confirmed", "shipped", "delivered", "cancelled"], n),
+            c(rng, ["credit_card", "paypal", "bank_transfer", "cash"], n),
+            c(rng, ["pending", "paid", "failed", "refunded"], n),
+            c(rng, ["standard", "express", "overnight"], n),
+            self._col_randint(rng, 100000000, 999999999, n),
+            items,
+            u(rng, 50.0, 2000.0, n, 2), u(rng, 5.0, 200.0, n, 2), u(rng, 5.0, 50.0, n, 2),
+            u(rng, 0.0, 100.0, n, 2), u(rng, 50.0, 2500.0, n, 2),
+        )
+        return [
+            {
+                "order_id": oid,
+                "customer_info": {
+                    "customer_id": cid, "name": f"Customer {oid}", "email": email, "phone": phone,
+                    "shipping_address": ship, "billing_address": bill
+                },
+                "order_details": {
+                    "order_date": date, "status": status, "payment_method": method,
+                    "payment_status": pay_status, "shipping_method": ship_method,
+                    "tracking_number": f"TRK{tracking}"
+                },
+                "items": order_items,
+                "totals": {"subtotal": sub, "tax": tax, "shipping": shipping, "discount": disc, "total": total}
+            }
+            for (oid, cid, email, phone, ship, bill, date, status, method, pay_status, ship_method, tracking,
+                 order_items, sub, tax, shipping, disc, total) in cols
+        ]
+
+    def _columnar_log_data(self, rng, ids):
+        n = len(ids)
+        c = self._col_choice
+        r = self._col_randint
+        # 逐行版本里 error_details 由一次独立的 level 抽样决定是否出现 (2/5 概率)
+        has_error = (rng.integers(0, len(self.LOG_LEVELS), n) >= 3).tolist()
+        cols = zip(
+            ids.tolist(),
+            self._col_date(rng, datetime(2024, 1, 1), datetime(2024, 12, 31), n),
+            c(rng, self.LOG_LEVELS, n),
+            c(rng, self.SERVICES, n),
+            self._col_uuid4(rng, n), r(rng, 1, 10000, n), self._col_uuid4(rng, n),
+            c(rng, self.IP_ADDRESSES, n),
+            c(rng, ['/api/users', '/api/products', '/api/orders', '/api/auth'], n),
+            r(rng, 10, 5000, n),
+            self._col_uniform(rng, 10.0, 1000.0, n, 2),
+            self._col_uniform(rng, 1.0, 100.0, n, 2),
+            r(rng, 1, 50, n),
+            r(rng, 100, 599, n),
+            c(rng, ['ValidationError', 'DatabaseError', 'NetworkError', 'TimeoutError'], n),
+            self._col_bool(rng, n),
+            has_error,
+        )
+        return [
+            {
+                "log_id": lid,
+                "timestamp": ts,
+                "level": level,
+                "service": service,
+                "message": f"Log message {lid} with some details",
+                "context": {
+                    "request_id": request_id, "user_id": user_id, "session_id": session_id,
+                    "ip_address": ip,
+                    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+                    "endpoint": endpoint
+                },
+                "performance": {
+                    "response_time_ms": resp, "memory_usage_mb": mem,
+                    "cpu_usage_percent": cpu, "database_queries": queries
+                },
+                "error_details": {
+                    "error_code": code, "error_type": etype,
+                    "stack_trace": f"Error stack trace for log {lid}", "recovered": recovered
+                } if err else None
+            }
+            for (lid, ts, level, service, request_id, user_id, session_id, ip, endpoint, resp, mem, cpu,
+                 queries, code, etype, recovered, err) in cols
+        ]
+
+    def _columnar_analytics_data(self, rng, ids):
+        n = len(ids)
+        c = self._col_choice
+        r = self._col_randint
+        revenue = np.round(rng.uniform(0.0, 1000.0, n), 2).astype(object)
+        revenue[rng.random(n) < 0.5] = None
+        cols = zip(
+            ids.tolist(),
+            c(rng, self.EVENT_TYPES, n),
+            self._col_date(rng, datetime(2024, 1, 1), datetime(2024, 12, 31), n),
+            r(rng, 1, 10000, n), self._col_uuid4(rng, n),
+            c(rng, ['desktop', 'mobile', 'tablet'], n),
+            c(rng, ['chrome', 'firefox', 'safari', 'edge'], n),
+            c(rng, ['windows', 'macos', 'linux', 'ios', 'android'], n),
+            c(rng, ['US', 'CN', 'JP', 'DE', 'UK', 'FR'], n),
+            c(rng, ['New York', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix'], n),
+            c(rng, self.PAGE_NAMES, n),
+            c(rng, ['google.com', 'facebook.com', 'twitter.com', 'direct'], n),
+            r(rng, 100, 5000, n),
+            r(rng, 1, 100, n),
+            c(rng, ['button', 'link', 'form', 'image'], n),
+            r(rng, 0, 1920, n), r(rng, 0, 1080, n), r(rng, 0, 100, n),
+            self._col_bool(rng, n),
+            c(rng, ['signup', 'purchase', 'download', 'contact'], n),
+            revenue.tolist(),
+            r(rng, 1, 5, n),
+        )
+        return [
+            {
+                "event_id": eid,
+                "event_type": etype,
+                "timestamp": ts,
+                "user": {
+                    "user_id": uid, "session_id": sid, "device_type": device, "browser": browser,
+                    "os": os_name, "country": country, "city": city
+                },
+                "page": {
+                    "url": f"https://example.com/{page}",
+                    "title": f"Page Title {eid}",
+                    "referrer": referrer,
+                    "load_time_ms": load_ms
+                },
+                "interaction": {
+                    "element_id": f"element_{element}",
+                    "element_type": element_type,
+                    "coordinates": {"x": x, "y": y},
+                    "scroll_depth": depth
+                },
+                "conversion": {
+                    "goal_completed": completed, "goal_name": goal,
+                    "revenue": rev, "funnel_step": step
+                }
+            }
+            for (eid, etype, ts, uid, sid, device, browser, os_name, country, city, page, referrer, load_ms,
+                 element, element_type, x, y, depth, completed, goal, rev, step) in cols
+        ]
+
+
+def benchmark_generate_batch(count=20000, data_type="mixed", seed=19530):
+    """对比逐行生成与按列生成的吞吐 (docs/s)"""
+    generator = EnhancedJSONGenerator()
+    results = {}
+    for name, fn in [
+        ("per-row", lambda: generator.generate_batch(count, data_type)),
+        ("columnar", lambda: generator.generate_batch_columnar(count, data_type, seed=seed)),
+        ("columnar+encode", lambda: generator.generate_batch_columnar(count, data_type, seed=seed, encode=True)),
+    ]:
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        results[name] = count / elapsed
+        print(f"{data_type:>12} {name:>16}: {count} docs in {elapsed:.3f}s, {results[name]:,.0f} docs/s")
+    print(f"{data_type:>12} {'speedup':>16}: {results['columnar'] / results['per-row']:.1f}x")
+    return results
+
 # 使用示例
 if __name__ == "__main__":
+    # python enhanced_json_generator.py bench [count]
+    if len(sys.argv) >= 2 and sys.argv[1] == "bench":
+        bench_count = int(sys.argv[2]) if len(sys.argv) >= 3 else 20000
+        for bench_type in EnhancedJSONGenerator.DATA_TYPES + ["mixed"]:
+            benchmark_generate_batch(bench_count, bench_type)
+        sys.exit(0)
+
     generator = EnhancedJSONGenerator()
     
     # 生成不同类型的测试数据
@@ -1,4 +1,4 @@
-from pymilvus import MilvusClient, DataType
+from pymilvus import MilvusClient, AsyncMilvusClient, DataType
 import numpy as np
 import random
 from loguru import logger
@@ -6,12 +6,41 @@ import time
 import threading
 from concurrent.futures import ThreadPoolExecutor
 
+from vector_factory import uniform_vectors, iter_vector_blocks
+from dataset_cache import load_or_build
+from column_batches import ColumnBatch, iter_column_batches
+from adaptive_batcher import AdaptiveBatcher
+from columnar_insert import insert_columns
+from async_ingest import run_ingest, log_summary
+from rate_pacer import Pacer
+from write_batcher import WriteBatcher
+
 class ConcurrentTest:
-    def __init__(self, collection_name="concurrent_test"):
+    def __init__(self, collection_name="concurrent_test", batch_bytes=4 << 20, async_window=None,
+                 upsert_rows_per_s=None, upsert_bytes_per_s=None, upsert_batch=1000,
+                 upsert_workers=1, coalesce_rows=None, coalesce_delay_s=0.05):
         self.client = MilvusClient()
         self.collection_name = collection_name
         self.dim = 128
         self.total_records = 1000000
+        # 初始数据按估算字节数切分 batch 并根据插入吞吐自动调整, None 时固定 10000 行一批
+        self.batch_bytes = batch_bytes
+        # 设置后初始数据用 AsyncMilvusClient 插入, 同时保持 async_window 个 insert 请求
+        self.async_window = async_window
+        # 设置目标速率后 upsert 按令牌桶匀速进行 (固定 upsert_batch 行一批), 否则随机批大小和随机 sleep
+        self.upsert_pacer = None
+        if upsert_rows_per_s or upsert_bytes_per_s:
+            self.upsert_pacer = Pacer(upsert_rows_per_s, upsert_bytes_per_s, log_every=10, log=logger.info,
+                                      name="upsert")
+        self.upsert_batch = upsert_batch
+        self.upsert_workers = upsert_workers
+        # 设置后各 upsert 线程的数据先进入共享缓冲, 重复主键只保留最后一次写入,
+        # 攒够 coalesce_rows 行或最早一行等待 coalesce_delay_s 秒后合并成一次 upsert
+        self.upsert_batcher = None
+        if coalesce_rows:
+            self.upsert_batcher = WriteBatcher(self._upsert_rows, "id", max_rows=coalesce_rows,
+                                               max_delay_s=coalesce_delay_s, log_every=10, log=logger.info,
+                                               name="upsert-batcher")
         self.running = True
         self.lock = threading.Lock()
         self.wrong_count = 0
@@ -40,34 +69,49 @@ class ConcurrentTest:
         )
         logger.info(f"Created collection: {self.collection_name}")
     
+    def _initial_batch_factory(self, batch_size):
+        """返回 make_batch(start_id, count), 产出初始数据的 ColumnBatch"""
+        # 向量按参数+seed 缓存到磁盘, 重复运行时直接 mmap 读取
+        dataset = load_or_build(
+            {"script": "fix_mvcc", "rows": self.total_records, "dim": self.dim, "seed": 19530},
+            lambda w: w.add_vector_blocks(
+                "vector",
+                iter_vector_blocks(self.total_records, self.dim, batch_size, seed=19530),
+                self.total_records,
+                self.dim,
+            ),
+        )
+        all_vectors = dataset.vectors("vector")
+
+        def make_batch(start_id, count):
+            return ColumnBatch(
+                pks=np.arange(start_id, start_id + count, dtype=np.int64),
+                pk_field="id",
+                vectors={"vector": all_vectors[start_id:start_id + count]},
+                json={"json_data": [""] * count},
+            )
+
+        return make_batch
+
+    def iter_initial_batches(self, batch_size):
+        """按批产出初始数据的 ColumnBatch, 内存占用只和 batch_size 有关"""
+        return iter_column_batches(self.total_records, batch_size, self._initial_batch_factory(batch_size))
+
     def insert_initial_data(self):
         """插入初始100万条数据"""
         logger.info(f"Inserting {self.total_records} records...")
-        
+        if self.async_window:
+            self.insert_initial_data_async()
+            return
+        if self.batch_bytes:
+            self.insert_initial_data_adaptive()
+            return
+
         batch_size = 10000
-        total_batches = self.total_records // batch_size
+        total_batches = (self.total_records + batch_size - 1) // batch_size
         
-        for batch_idx in range(total_batches):
-            start_id = batch_idx * batch_size
-            end_id = start_id + batch_size
-            
-            data = []
-            for i in range(start_id, end_id):
-                json_data = {
-                    "user_id": i,
-                    "score": random.uniform(0, 100),
-                    "category": random.choice(["A", "B", "C", "D"]),
-                    "active": random.choice([True, False])
-                }
-                
-                record = {
-                    "id": i,
-                    "vector": [random.random() for _ in range(self.dim)],
-                    "json_data": ""
-                }
-                data.append(record)
-            
-            self.client.insert(collection_name=self.collection_name, data=data)
+        for batch_idx, batch in enumerate(self.iter_initial_batches(batch_size)):
+            insert_columns(self.client, self.collection_name, batch.fields())
             
             if (batch_idx + 1) % 10 == 0:
                 logger.info(f"Inserted batch {batch_idx + 1}/{total_batches}")
@@ -75,18 +119,61 @@ class ConcurrentTest:
         self.client.flush(collection_name=self.collection_name)
         self.client.load_collection(collection_name=self.collection_name)
         logger.info("Initial data insertion completed")
+
+    def insert_initial_data_adaptive(self):
+        """按 batch_bytes 切分初始数据, 每批的行数根据插入吞吐在线调整"""
+        batcher = AdaptiveBatcher(self.batch_bytes)
+        # 每行: int64 主键 + float32 向量 + 空 JSON
+        row_bytes = 8 + 4 * self.dim + 2
+        make_batch = self._initial_batch_factory(10000)
+
+        start_id = 0
+        batch_idx = 0
+        while start_id < self.total_records:
+            count = min(batcher.next_count(row_bytes), self.total_records - start_id)
+            columns = make_batch(start_id, count).fields()
+            start = time.perf_counter()
+            insert_columns(self.client, self.collection_name, columns)
+            batcher.record(count, time.perf_counter() - start, nbytes=count * row_bytes)
+            start_id += count
+            batch_idx += 1
+            if batch_idx % 10 == 0:
+                logger.info(f"Inserted batch {batch_idx}, {start_id}/{self.total_records} rows")
+
+        batcher.log_summary(logger.info)
+        self.client.flush(collection_name=self.collection_name)
+        self.client.load_collection(collection_name=self.collection_name)
+        logger.info("Initial data insertion completed")
     
-    def upsert_worker(self):
+    def insert_initial_data_async(self):
+        """单个事件循环中保持 async_window 个 insert 请求同时进行, 读取下一批和插入重叠"""
+        batches = (batch.fields() for batch in self.iter_initial_batches(10000))
+        summary = run_ingest(AsyncMilvusClient, self.collection_name, batches, window=self.async_window,
+                             columnar=True, progress_every=100000, log=logger.info)
+        log_summary(summary, logger.info)
+        self.client.flush(collection_name=self.collection_name)
+        self.client.load_collection(collection_name=self.collection_name)
+        logger.info("Initial data insertion completed")
+
+    def _upsert_rows(self, rows):
+        with self.lock:
+            self.client.upsert(collection_name=self.collection_name, data=rows)
+
+    def upsert_worker(self, worker_id=0):
         """持续upsert数据的线程"""
-        logger.info("Upsert worker started")
+        logger.info(f"Upsert worker {worker_id} started")
         
         while self.running:
             try:
-                num_to_update = random.randint(1000, 10000)
+                if self.upsert_pacer is not None:
+                    num_to_update = self.upsert_batch
+                else:
+                    num_to_update = random.randint(1000, 10000)
                 ids_to_update = random.sample(range(self.total_records), num_to_update)
+                vectors = uniform_vectors(num_to_update, self.dim)
                 
                 data = []
-                for record_id in ids_to_update:
+                for record_id, vector in zip(ids_to_update, vectors):
                     json_data = {
                         "user_id": record_id,
                         "score": random.uniform(0, 100),
@@ -97,16 +184,23 @@ class ConcurrentTest:
                     
                     record = {
                         "id": record_id,
-                        "vector": [random.random() for _ in range(self.dim)],
+                        "vector": vector,
                         "json_data": ""
                     }
                     data.append(record)
                 
-                with self.lock:
-                    self.client.upsert(collection_name=self.collection_name, data=data)
+                if self.upsert_pacer is not None:
+                    # 每行: int64 主键 + float32 向量 + 空 JSON
+                    self.upsert_pacer.wait(num_to_update, num_to_update * (8 + 4 * self.dim + 2))
+                if self.upsert_batcher is not None:
+                    # 等待包含这批数据的合并 upsert 完成, 失败时在这里抛出
+                    self.upsert_batcher.submit(data).result()
+                else:
+                    self._upsert_rows(data)
                 
                 logger.info(f"Upserted {num_to_update} records")
-                time.sleep(random.uniform(0.1, 0.5))
+                if self.upsert_pacer is None:
+                    time.sleep(random.uniform(0.1, 0.5))
                 
             except Exception as e:
                 logger.error(f"Error in upsert worker: {e}")
@@ -146,8 +240,13 @@ class ConcurrentTest:
         logger.info(f"Test duration: {test_duration} seconds")
         
         # 启动upsert线程
-        upsert_thread = threading.Thread(target=self.upsert_worker, daemon=True)
-        upsert_thread.start()
+        if self.upsert_batcher is not None:
+            self.upsert_batcher.start()
+        upsert_threads = []
+        for i in range(self.upsert_workers):
+            thread = threading.Thread(target=self.upsert_worker, args=(i,), daemon=True)
+            thread.start()
+            upsert_threads.append(thread)
         
         # 启动count查询线程
         count_threads = []
@@ -171,9 +270,13 @@ class ConcurrentTest:
         logger.info("Stopping concurrent test...")
         
         # 等待线程结束
-        upsert_thread.join(timeout=5)
-        for thread in count_threads:
+        for thread in upsert_threads + count_threads:
             thread.join(timeout=5)
+        if self.upsert_batcher is not None:
+            self.upsert_batcher.close()
+            self.upsert_batcher.log_summary()
+        if self.upsert_pacer is not None:
+            self.upsert_pacer.log_summary()
         
         # 最终验证
         self.final_verification()
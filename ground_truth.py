@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""Memory-bounded exact top-k (ground truth) for recall measurement.
+
+The base vectors are streamed in row blocks, typically from a memory-mapped
+``.npy`` file, so a 3M x 256 dataset never has to fit in RAM. Each block is
+scored against all queries with one BLAS matrix multiply, and each block's
+per-query top-k is merged into a running top-k with ``argpartition``. Blocks
+are spread over a thread pool; numpy releases the GIL inside the multiply and
+partition, so this uses every core.
+
+Distances follow Milvus conventions: squared L2 distance (ascending), inner
+product and cosine similarity (descending). An optional boolean row mask
+restricts the search to rows passing a filter (e.g. ``0 < count < 10000``),
+which gives filtered-search ground truth. Rows outside the mask and unfilled
+slots come back with id -1.
+
+    python ground_truth.py --base base.npy --queries queries.npy --k 100 --metric L2 --out gt
+"""
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+METRICS = ("L2", "IP", "COSINE")
+
+ArrayLike = Union[np.ndarray, str]
+MaskLike = Union[None, np.ndarray, Callable[[int, int], np.ndarray]]
+
+
+def open_vectors(base: ArrayLike) -> np.ndarray:
+    """Return base as an array; a path to an .npy file is opened with mmap_mode='r'."""
+    if isinstance(base, (str, os.PathLike)):
+        return np.load(base, mmap_mode="r")
+    return base
+
+
+def _block_rows_for_budget(dim: int, nq: int, workers: int, memory_budget_mb: int) -> int:
+    # per in-flight block: a float32 copy of the block, the (nq, rows) score
+    # matrix and the argpartition index matrix (int64)
+    bytes_per_row = 4 * dim + 4 * nq + 8 * nq
+    rows = memory_budget_mb * (1 << 20) // (bytes_per_row * max(workers, 1))
+    return int(max(1024, min(rows, 1 << 20)))
+
+
+def _merge_topk(
+    best_scores: np.ndarray,
+    best_ids: np.ndarray,
+    scores: np.ndarray,
+    ids: np.ndarray,
+    k: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Keep the k smallest scores per row of the two candidate sets."""
+    all_scores = np.concatenate([best_scores, scores], axis=1)
+    all_ids = np.concatenate([best_ids, ids], axis=1)
+    if all_scores.shape[1] > k:
+        part = np.argpartition(all_scores, k - 1, axis=1)[:, :k]
+        all_scores = np.take_along_axis(all_scores, part, axis=1)
+        all_ids = np.take_along_axis(all_ids, part, axis=1)
+    return all_scores, all_ids
+
+
+def brute_force_knn(
+    base: ArrayLike,
+    queries: np.ndarray,
+    k: int,
+    metric: str = "L2",
+    mask: MaskLike = None,
+    memory_budget_mb: int = 1024,
+    block_rows: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Exact top-k of every query over base. Returns (ids int64 (nq, k), distances float32 (nq, k)).
+
+    mask is a boolean array over the base rows (may itself be a memmap) or a
+    callable mask(start, stop) returning the boolean slice for those rows.
+    """
+    metric = metric.upper()
+    if metric not in METRICS:
+        raise ValueError(f"Unsupported metric: {metric!r}, expected one of {METRICS}")
+    base = open_vectors(base)
+    n, dim = base.shape
+    queries = np.ascontiguousarray(queries, dtype=np.float32)
+    if queries.ndim != 2 or queries.shape[1] != dim:
+        raise ValueError(f"queries must have shape (nq, {dim}), got {queries.shape}")
+    nq = len(queries)
+    workers = workers or os.cpu_count() or 1
+    block_rows = block_rows or _block_rows_for_budget(dim, nq, workers, memory_budget_mb)
+
+    if metric == "COSINE":
+        q_norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(q_norms > 0, q_norms, 1)
+    q_sq = (queries * queries).sum(axis=1, keepdims=True) if metric == "L2" else None
+    queries_t = np.ascontiguousarray(queries.T)
+
+    # scores are "smaller is better": L2 distance, or negated similarity
+    best_scores = np.full((nq, k), np.inf, dtype=np.float32)
+    best_ids = np.full((nq, k), -1, dtype=np.int64)
+    lock = threading.Lock()
+
+    def run_block(start: int) -> None:
+        nonlocal best_scores, best_ids
+        stop = min(start + block_rows, n)
+        block = np.asarray(base[start:stop], dtype=np.float32)
+        row_ids = np.arange(start, stop, dtype=np.int64)
+        if mask is not None:
+            keep = np.asarray(mask(start, stop) if callable(mask) else mask[start:stop], dtype=bool)
+            if not keep.any():
+                return
+            if not keep.all():
+                block = block[keep]
+                row_ids = row_ids[keep]
+        if metric == "COSINE":
+            b_norms = np.linalg.norm(block, axis=1, keepdims=True)
+            block = block / np.where(b_norms > 0, b_norms, 1)
+        dots = block @ queries_t  # (rows, nq)
+        if metric == "L2":
+            scores = (block * block).sum(axis=1, keepdims=True) - 2 * dots
+            scores += q_sq.T
+            np.maximum(scores, 0, out=scores)
+        else:
+            scores = np.negative(dots, out=dots)
+        scores = scores.T  # (nq, rows)
+        if scores.shape[1] > k:
+            part = np.argpartition(scores, k - 1, axis=1)[:, :k]
+            scores = np.take_along_axis(scores, part, axis=1)
+            cand_ids = row_ids[part]
+        else:
+            cand_ids = np.broadcast_to(row_ids, scores.shape)
+        with lock:
+            best_scores, best_ids = _merge_topk(best_scores, best_ids, scores, cand_ids, k)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _ in pool.map(run_block, range(0, n, block_rows)):
+            pass
+
+    order = np.argsort(best_scores, axis=1, kind="stable")
+    best_scores = np.take_along_axis(best_scores, order, axis=1)
+    best_ids = np.take_along_axis(best_ids, order, axis=1)
+    best_ids[np.isinf(best_scores)] = -1
+    distances = best_scores if metric == "L2" else -best_scores
+    return best_ids, distances.astype(np.float32)
+
+
+def recall_at_k(
+    result_ids: Sequence[Sequence[int]],
+    gt_ids: np.ndarray,
+    k: Optional[int] = None,
+    result_distances: Optional[Sequence[Sequence[float]]] = None,
+    gt_distances: Optional[np.ndarray] = None,
+    metric: str = "L2",
+) -> float:
+    """Mean recall@k of search results against ground truth.
+
+    With distances given, a hit is any returned row at least as close as the
+    k-th true neighbour, which counts duplicated vectors (ties) correctly.
+    """
+    k = k or gt_ids.shape[1]
+    hits = 0
+    total = 0
+    for i, ids in enumerate(result_ids):
+        truth = gt_ids[i, :k]
+        truth = truth[truth >= 0]
+        total += len(truth)
+        if not len(truth):
+            continue
+        if result_distances is not None and gt_distances is not None:
+            kth = gt_distances[i, len(truth) - 1]
+            dists = np.asarray(result_distances[i][:k], dtype=np.float64)
+            tol = 1e-5 * max(1.0, abs(float(kth)))
+            close = dists <= kth + tol if metric.upper() == "L2" else dists >= kth - tol
+            hits += min(int(close.sum()), len(truth))
+        else:
+            hits += len(np.intersect1d(np.asarray(ids[:k], dtype=np.int64), truth))
+    return hits / total if total else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Exact top-k ground truth over memory-mapped vectors")
+    parser.add_argument("--base", required=True, help=".npy file of base vectors (n, dim)")
+    parser.add_argument("--queries", required=True, help=".npy file of query vectors (nq, dim)")
+    parser.add_argument("--k", type=int, default=100)
+    parser.add_argument("--metric", choices=METRICS, default="L2")
+    parser.add_argument("--mask", default=None, help="Optional .npy boolean row mask")
+    parser.add_argument("--budget-mb", type=int, default=1024, help="Working memory budget (default: 1024)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="ground_truth", help="Output prefix: <out>_ids.npy, <out>_dist.npy")
+    args = parser.parse_args()
+
+    queries = np.load(args.queries)
+    mask = np.load(args.mask, mmap_mode="r") if args.mask else None
+    start = time.perf_counter()
+    ids, dists = brute_force_knn(args.base, queries, args.k, args.metric, mask, args.budget_mb, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    np.save(f"{args.out}_ids.npy", ids)
+    np.save(f"{args.out}_dist.npy", dists)
+    print(f"Ground truth for {len(queries)} queries (k={args.k}, {args.metric}) in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
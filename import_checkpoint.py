@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Durable progress state of a JSONL import, for resuming after a crash.
+
+After every acknowledged batch the importer records, per input file, the byte
+offset just past the last inserted line, the line number there, the next PK,
+how many rows it has handed out so far (``rows``) and how many of those the
+server acknowledged (``inserted``, what the ``max_rows`` budget of a resumed
+multi-file import is charged with). The state file is rewritten atomically
+(temp file, fsync, rename), so a crash at any point leaves either the previous
+or the new state, never a torn one. A resumed import seeks each
+file to its recorded offset and continues with the recorded PK, so nothing is
+re-read and no PK is used twice:
+
+    ckpt = ImportCheckpoint.open("import.ckpt.json", params, resume=True)
+    state = ckpt.file_state(path)        # None: start from the beginning
+    ...
+    ckpt.update(path, offset=end_offset, line=line_num + 1, next_pk=next_pk, rows=rows, inserted=inserted)
+    ckpt.update(path, ..., done=True)
+
+``params`` (collection, pk_start, max_rows, input files, ...) are stored with
+the state, and resuming with different ones is refused, since the recorded
+offsets and PKs would no longer mean the same thing.
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+VERSION = 1
+
+
+def file_key(path: str) -> str:
+    return os.path.abspath(path)
+
+
+class ImportCheckpoint:
+    def __init__(self, path: str, params: Dict[str, Any], files: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.path = path
+        self.params = params
+        self.files: Dict[str, Dict[str, Any]] = files or {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: str, params: Dict[str, Any], resume: bool = False) -> "ImportCheckpoint":
+        """The state at path when resuming (new state if there is none), else a fresh one."""
+        if resume and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("version") != VERSION:
+                raise ValueError(f"{path}: unsupported checkpoint version {state.get('version')}")
+            stored = state.get("params", {})
+            diff = sorted(k for k in set(stored) | set(params) if stored.get(k) != params.get(k))
+            if diff:
+                raise ValueError(
+                    f"{path} was written by an import with different parameters: "
+                    + ", ".join(f"{k}={stored.get(k)!r} (now {params.get(k)!r})" for k in diff)
+                )
+            return cls(path, params, state.get("files", {}))
+        ckpt = cls(path, params)
+        ckpt.save()
+        return ckpt
+
+    def file_state(self, file_path: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            state = self.files.get(file_key(file_path))
+            return dict(state) if state is not None else None
+
+    def update(self, file_path: str, offset: int, line: int, next_pk: int, rows: int, done: bool = False,
+               **extra: Any) -> None:
+        """Record the progress of one file (extra keys are kept across updates) and persist the whole state."""
+        with self._lock:
+            self.files.setdefault(file_key(file_path), {}).update(
+                offset=offset, line=line, next_pk=next_pk, rows=rows, done=done, **extra,
+            )
+            self._write()
+
+    def save(self) -> None:
+        with self._lock:
+            self._write()
+
+    def _write(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": VERSION, "params": self.params, "files": self.files}, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Per-stage timers and counters for the importers.
+
+"Inserted N rows..." says nothing about what limits an import. ``IngestMetrics``
+accumulates, per stage (read, parse, vectors, batch, insert, ...), the seconds
+spent, calls, rows and bytes, plus the latency of every insert RPC. A
+background thread logs one line per ``interval`` seconds with the rows/s and
+MB/s of that interval, the RPC latency percentiles and where the time went,
+and ``summary()`` gives the same figures for the whole run as a dict that is
+also written as JSON:
+
+    metrics = IngestMetrics(interval=10, log=logger.info).start()
+    ...
+    t0 = time.perf_counter()
+    client.insert(collection_name=name, data=rows)
+    metrics.rpc(time.perf_counter() - t0, len(rows), nbytes)
+    ...
+    metrics.stop()
+    metrics.write_summary("import-stats.json")
+
+Hot loops accumulate into locals and call ``add`` once per batch or per few
+thousand lines, so the counters cost a couple of ``perf_counter`` calls per
+line. Stages run concurrently in the pipelined and multi-file modes, so a
+stage's busy seconds can exceed the wall time; the breakdown is each stage's
+share of the total busy time.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+# the RPC stage is fed by rpc(), the others by add()
+RPC_STAGE = "insert"
+
+
+class _StageCounter:
+    __slots__ = ("seconds", "calls", "rows", "nbytes")
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.calls = 0
+        self.rows = 0
+        self.nbytes = 0
+
+
+def latency_percentiles(latencies: List[float]) -> Dict[str, float]:
+    """count, mean, p50/p90/p99 and max in milliseconds of latencies given in seconds."""
+    if not latencies:
+        return {"count": 0}
+    ms = np.asarray(latencies) * 1000.0
+    p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+    return {
+        "count": len(latencies),
+        "mean_ms": round(float(ms.mean()), 2),
+        "p50_ms": round(float(p50), 2),
+        "p90_ms": round(float(p90), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(float(ms.max()), 2),
+    }
+
+
+class IngestMetrics:
+    def __init__(self, interval: float = 10.0, log: Callable[[str], Any] = print):
+        self.interval = interval
+        self.log = log
+        self.stages: Dict[str, _StageCounter] = {}
+        self.latencies: List[float] = []
+        self.inserted = 0
+        self.insert_bytes = 0
+        self.read_bytes = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = time.perf_counter()
+        self._stopped: Optional[float] = None
+        # totals at the previous periodic report
+        self._last = (self._started, 0, 0, 0, 0, {})
+
+    def start(self) -> "IngestMetrics":
+        self._started = time.perf_counter()
+        self._last = (self._started, 0, 0, 0, 0, {})
+        if self.interval and self.interval > 0:
+            self._thread = threading.Thread(target=self._report_loop, name="ingest-metrics", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._stopped = time.perf_counter()
+
+    def add(self, stage: str, seconds: float, rows: int = 0, nbytes: int = 0, calls: int = 1) -> None:
+        """Account seconds (and optionally rows / bytes) to stage; bytes of the 'read' stage are input bytes."""
+        with self._lock:
+            counter = self.stages.get(stage)
+            if counter is None:
+                counter = self.stages[stage] = _StageCounter()
+            counter.seconds += seconds
+            counter.calls += calls
+            counter.rows += rows
+            counter.nbytes += nbytes
+            if stage == "read":
+                self.read_bytes += nbytes
+
+    def rpc(self, seconds: float, rows: int, nbytes: int = 0) -> None:
+        """One acknowledged insert RPC of rows rows and about nbytes of payload."""
+        with self._lock:
+            self.latencies.append(seconds)
+            self.inserted += rows
+            self.insert_bytes += nbytes
+        self.add(RPC_STAGE, seconds, rows, nbytes)
+
+    @contextmanager
+    def stage(self, name: str, rows: int = 0, nbytes: int = 0) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, rows, nbytes)
+
+    def _breakdown(self, seconds: Dict[str, float]) -> Dict[str, float]:
+        busy = sum(seconds.values())
+        return {name: round(s / busy, 3) if busy > 0 else 0.0 for name, s in seconds.items()}
+
+    def _report_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.report_interval()
+
+    def report_interval(self) -> None:
+        """Log rows/s, MB/s, RPC latencies and the stage breakdown since the previous report."""
+        now = time.perf_counter()
+        with self._lock:
+            seconds = {name: c.seconds for name, c in self.stages.items()}
+            totals = (now, self.inserted, self.read_bytes, self.insert_bytes, len(self.latencies), seconds)
+            last_time, last_rows, last_read, last_sent, last_rpcs, last_seconds = self._last
+            window = self.latencies[last_rpcs:]
+            self._last = totals
+        elapsed = now - last_time
+        if elapsed <= 0:
+            return
+        delta = {name: s - last_seconds.get(name, 0.0) for name, s in seconds.items()}
+        lat = latency_percentiles(window)
+        rpc = (f"rpc p50={lat['p50_ms']}ms p90={lat['p90_ms']}ms p99={lat['p99_ms']}ms n={lat['count']}"
+               if lat["count"] else "rpc n=0")
+        stages = " ".join(f"{name}={share:.0%}" for name, share in self._breakdown(delta).items())
+        self.log(f"[stats] {(totals[1] - last_rows) / elapsed:,.0f} rows/s, "
+                 f"in {(totals[2] - last_read) / elapsed / 1e6:.1f} MB/s, "
+                 f"out {(totals[3] - last_sent) / elapsed / 1e6:.1f} MB/s, {rpc}, {stages}")
+
+    def summary(self) -> Dict[str, Any]:
+        end = self._stopped if self._stopped is not None else time.perf_counter()
+        wall = end - self._started
+        with self._lock:
+            seconds = {name: c.seconds for name, c in self.stages.items()}
+            stages = {
+                name: {
+                    "busy_s": round(c.seconds, 3),
+                    "calls": c.calls,
+                    "rows": c.rows,
+                    "bytes": c.nbytes,
+                    # busy seconds per wall second, above 1 for stages with several workers
+                    "per_wall": round(c.seconds / wall, 3) if wall > 0 else 0.0,
+                }
+                for name, c in self.stages.items()
+            }
+            latencies = list(self.latencies)
+            inserted, read_bytes, insert_bytes = self.inserted, self.read_bytes, self.insert_bytes
+        for name, share in self._breakdown(seconds).items():
+            stages[name]["share"] = share
+        return {
+            "wall_s": round(wall, 3),
+            "rows": inserted,
+            "rows_per_s": round(inserted / wall, 1) if wall > 0 else 0.0,
+            "read_bytes": read_bytes,
+            "read_mb_per_s": round(read_bytes / wall / 1e6, 2) if wall > 0 else 0.0,
+            "insert_bytes": insert_bytes,
+            "insert_mb_per_s": round(insert_bytes / wall / 1e6, 2) if wall > 0 else 0.0,
+            "rpc": latency_percentiles(latencies),
+            "stages": stages,
+        }
+
+    def log_summary(self) -> Dict[str, Any]:
+        s = self.summary()
+        self.log(f"[stats] total {s['rows']} rows in {s['wall_s']}s: {s['rows_per_s']:,.0f} rows/s, "
+                 f"in {s['read_mb_per_s']} MB/s, out {s['insert_mb_per_s']} MB/s")
+        if s["rpc"]["count"]:
+            r = s["rpc"]
+            self.log(f"[stats] rpc n={r['count']} mean={r['mean_ms']}ms p50={r['p50_ms']}ms "
+                     f"p90={r['p90_ms']}ms p99={r['p99_ms']}ms max={r['max_ms']}ms")
+        for name, st in sorted(s["stages"].items(), key=lambda kv: -kv[1]["busy_s"]):
+            self.log(f"[stats]   {name:<10} {st['share']:>6.1%}  busy={st['busy_s']:.2f}s  calls={st['calls']}")
+        return s
+
+    def write_summary(self, path: str) -> Dict[str, Any]:
+        s = self.summary()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(s, f, indent=2)
+        return s
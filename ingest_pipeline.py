@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""Pipelined ingest: reader -> parser pool -> ordered sequencer -> insert workers.
+
+The sequential importers read a line, parse it, build its vector and only then
+block on ``client.insert``, so the client is either parsing or waiting on the
+network, never both. ``run_pipeline`` runs the stages concurrently with bounded
+queues between them:
+
+1. one reader thread cuts the input into chunks of lines,
+2. ``parse_workers`` threads turn a chunk into rows (JSON decode, vectors),
+3. one sequencer thread puts the parsed chunks back into input order, stamps
+   the primary keys and cuts ``batch_size`` batches, so PKs are exactly the
+   ones the sequential import assigns, whatever the thread timing,
+4. ``insert_workers`` threads send the batches, keeping that many RPCs in flight.
+
+The bounded queues keep memory flat: a slow server backs up the sequencer,
+then the parsers, then the reader. Each stage records how long its workers
+were busy, so the summary shows which stage limits the run:
+
+    summary = run_pipeline(iter_line_chunks(path, 1000), parse, insert, pk_field="my_id")
+    # summary["stages"]["insert"]["utilization"] close to 1.0: the server is the bottleneck
+"""
+import itertools
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from adaptive_batcher import AdaptiveBatcher, estimate_row_bytes
+from compressed_input import compression_of, iter_lines
+
+Chunk = Tuple[int, List[str]]
+
+_DONE = object()
+_POLL = 0.1
+
+
+def iter_line_chunks(path: str, chunk_lines: int = 1000) -> Iterator[Chunk]:
+    """(first_line_num, lines) chunks of a text file, line numbers starting at 1.
+
+    A gzip / zstd / bz2 file is decompressed on its own thread, ahead of the reader stage.
+    """
+    if compression_of(path) is not None:
+        f = (raw.decode("utf-8") for raw in iter_lines(path))
+    else:
+        f = open(path, "r", encoding="utf-8")
+    try:
+        line_num = 1
+        while True:
+            lines = list(itertools.islice(f, chunk_lines))
+            if not lines:
+                return
+            yield line_num, lines
+            line_num += len(lines)
+    finally:
+        f.close()
+
+
+class StageStats:
+    """Busy time and item counts of one pipeline stage, shared by its workers."""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.busy = 0.0
+        self.items = 0
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float, rows: int = 0) -> None:
+        with self._lock:
+            self.busy += seconds
+            self.items += 1
+            self.rows += rows
+
+    def summary(self, wall: float) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "rows": self.rows,
+            "busy_s": round(self.busy, 3),
+            # share of the wall time the stage's workers spent working rather than waiting
+            "utilization": round(self.busy / (wall * self.workers), 3) if wall > 0 else 0.0,
+        }
+
+
+class _Pipeline:
+    def __init__(self, chunks, parse, insert, pk_field, pk_start, batch_size, max_rows,
+                 parse_workers, insert_workers, queue_size, progress_every, log, batcher=None, row_bytes=None):
+        self.chunks = chunks
+        self.parse = parse
+        self.insert = insert
+        self.pk_field = pk_field
+        self.pk_start = pk_start
+        self.batch_size = batch_size
+        self.max_rows = max_rows
+        self.progress_every = progress_every
+        self.log = log
+        self.batcher = batcher
+        self.row_bytes = row_bytes or estimate_row_bytes
+        self.parse_q: queue.Queue = queue.Queue(queue_size)
+        self.seq_q: queue.Queue = queue.Queue(queue_size)
+        self.insert_q: queue.Queue = queue.Queue(queue_size)
+        self.stats = {
+            "read": StageStats("read", 1),
+            "parse": StageStats("parse", parse_workers),
+            "sequence": StageStats("sequence", 1),
+            "insert": StageStats("insert", insert_workers),
+        }
+        self.stop = threading.Event()
+        # set by the sequencer once max_rows PKs are handed out, the reader stops early
+        self.exhausted = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.lock = threading.Lock()
+        self.inserted = 0
+        self.assigned = 0
+
+    def _put(self, q: queue.Queue, item: Any) -> bool:
+        """Blocking put that gives up once the pipeline is stopping."""
+        while not self.stop.is_set():
+            try:
+                q.put(item, timeout=_POLL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue) -> Any:
+        while not self.stop.is_set():
+            try:
+                return q.get(timeout=_POLL)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _guard(self, fn: Callable[[], None]) -> Callable[[], None]:
+        def run():
+            try:
+                fn()
+            except BaseException as e:
+                with self.lock:
+                    if self.error is None:
+                        self.error = e
+                self.stop.set()
+        return run
+
+    def reader(self) -> None:
+        seq = 0
+        it = iter(self.chunks)
+        while not self.exhausted.is_set():
+            start = time.perf_counter()
+            chunk = next(it, None)
+            if chunk is None:
+                break
+            self.stats["read"].add(time.perf_counter() - start, len(chunk[1]))
+            if not self._put(self.parse_q, (seq, chunk)):
+                return
+            seq += 1
+        for _ in range(self.stats["parse"].workers):
+            self._put(self.parse_q, _DONE)
+
+    def parser(self) -> None:
+        while True:
+            item = self._get(self.parse_q)
+            if item is _DONE:
+                self._put(self.seq_q, _DONE)
+                return
+            seq, chunk = item
+            start = time.perf_counter()
+            rows = self.parse(chunk)
+            # sizes are estimated here, in parallel, rather than in the single sequencer
+            sizes = [self.row_bytes(row) for row in rows] if self.batcher is not None else None
+            self.stats["parse"].add(time.perf_counter() - start, len(rows))
+            if not self._put(self.seq_q, (seq, rows, sizes)):
+                return
+
+    def sequencer(self) -> None:
+        pending: Dict[int, Tuple[List[dict], Optional[List[int]]]] = {}
+        next_seq = 0
+        next_pk = self.pk_start
+        batch: List[dict] = []
+        done_parsers = 0
+        limit_reached = False
+        while done_parsers < self.stats["parse"].workers:
+            item = self._get(self.seq_q)
+            if item is _DONE:
+                if self.stop.is_set():
+                    return
+                done_parsers += 1
+                continue
+            seq, rows, sizes = item
+            pending[seq] = (rows, sizes)
+            # release parsed chunks strictly in input order, so PKs follow the input
+            while next_seq in pending and not limit_reached:
+                start = time.perf_counter()
+                rows, sizes = pending.pop(next_seq)
+                next_seq += 1
+                for i, row in enumerate(rows):
+                    if self.max_rows is not None and self.assigned >= self.max_rows:
+                        limit_reached = True
+                        break
+                    row[self.pk_field] = next_pk
+                    next_pk += 1
+                    self.assigned += 1
+                    if self.batcher is not None:
+                        full = self.batcher.add(row, sizes[i])
+                    else:
+                        batch.append(row)
+                        full = batch if len(batch) >= self.batch_size else None
+                    if full:
+                        if not self._put(self.insert_q, full):
+                            return
+                        batch = []
+                self.stats["sequence"].add(time.perf_counter() - start, len(rows))
+            if limit_reached:
+                self.exhausted.set()
+                pending.clear()
+        if self.batcher is not None:
+            batch = self.batcher.take()
+        if batch:
+            self._put(self.insert_q, batch)
+        for _ in range(self.stats["insert"].workers):
+            self._put(self.insert_q, _DONE)
+
+    def inserter(self) -> None:
+        while True:
+            batch = self._get(self.insert_q)
+            if batch is _DONE:
+                return
+            start = time.perf_counter()
+            n = self.insert(batch)
+            elapsed = time.perf_counter() - start
+            self.stats["insert"].add(elapsed, n)
+            if self.batcher is not None:
+                self.batcher.record(batch, elapsed)
+            with self.lock:
+                before = self.inserted
+                self.inserted += n
+                if self.progress_every and self.inserted // self.progress_every > before // self.progress_every:
+                    self.log(f"Inserted {self.inserted} rows...")
+
+    def run(self) -> Dict[str, Any]:
+        threads = [threading.Thread(target=self._guard(self.reader), name="ingest-read", daemon=True)]
+        threads += [threading.Thread(target=self._guard(self.parser), name=f"ingest-parse-{i}", daemon=True)
+                    for i in range(self.stats["parse"].workers)]
+        threads.append(threading.Thread(target=self._guard(self.sequencer), name="ingest-sequence", daemon=True))
+        threads += [threading.Thread(target=self._guard(self.inserter), name=f"ingest-insert-{i}", daemon=True)
+                    for i in range(self.stats["insert"].workers)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        try:
+            for t in threads:
+                while t.is_alive():
+                    t.join(_POLL)
+        except BaseException:
+            self.stop.set()
+            raise
+        wall = time.perf_counter() - start
+        if self.error is not None:
+            raise self.error
+        return {
+            "inserted": self.inserted,
+            "assigned": self.assigned,
+            "next_pk": self.pk_start + self.assigned,
+            "wall_s": round(wall, 3),
+            "rows_per_s": round(self.inserted / wall, 1) if wall > 0 else 0.0,
+            "stages": {name: stats.summary(wall) for name, stats in self.stats.items()},
+            "batches": self.batcher.summary() if self.batcher is not None else None,
+        }
+
+
+def run_pipeline(
+    chunks: Iterable[Chunk],
+    parse: Callable[[Chunk], List[dict]],
+    insert: Callable[[List[dict]], int],
+    pk_field: str = "id",
+    pk_start: int = 0,
+    batch_size: int = 1000,
+    max_rows: Optional[int] = None,
+    parse_workers: int = 2,
+    insert_workers: int = 4,
+    queue_size: int = 8,
+    progress_every: int = 0,
+    log: Callable[[str], Any] = print,
+    batcher: Optional[AdaptiveBatcher] = None,
+    row_bytes: Optional[Callable[[dict], int]] = None,
+) -> Dict[str, Any]:
+    """Run the pipeline to completion and return its summary.
+
+    parse(chunk) returns the usable rows of a chunk as dicts without the PK;
+    insert(batch) sends one batch and returns how many rows were inserted.
+    With a batcher, batches are cut by the row_bytes estimate (default:
+    estimate_row_bytes) instead of batch_size rows.
+    An exception in any stage stops all stages and is re-raised here.
+    """
+    return _Pipeline(chunks, parse, insert, pk_field, pk_start, batch_size, max_rows,
+                     parse_workers, insert_workers, queue_size, progress_every, log, batcher, row_bytes).run()
+
+
+def log_summary(summary: Dict[str, Any], log: Callable[[str], Any] = print) -> None:
+    log(f"Pipeline: {summary['inserted']} rows in {summary['wall_s']}s ({summary['rows_per_s']:,.0f} rows/s)")
+    for name, stage in summary["stages"].items():
+        log(f"  {name:<9} workers={stage['workers']:<3} busy={stage['busy_s']:>8.2f}s "
+            f"utilization={stage['utilization']:.0%}")
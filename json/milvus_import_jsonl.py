@@ -1,15 +1,28 @@
 
-from pymilvus import MilvusClient, DataType, connections, utility, Collection
+from pymilvus import MilvusClient, AsyncMilvusClient, DataType, connections, utility, Collection
 import numpy as np
-import random
 from loguru import logger
 import time
 import random_json
 import pprint
 import json
 import argparse
+import asyncio
 import glob
 import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from vector_factory import uniform_vectors
+from jsonl_io import iter_jsonl_offsets, parse_jsonl_line, insert_with_passthrough_retry, insert_columns_with_passthrough_retry, insert_with_passthrough_retry_async, count_lines_parallel, assign_pk_ranges
+from ingest_pipeline import iter_line_chunks, run_pipeline, log_summary
+from adaptive_batcher import AdaptiveBatcher, estimate_bytes
+from import_checkpoint import ImportCheckpoint
+from columnar_insert import ColumnBuffer, insert_columns, check_client_support
+from ingest_metrics import IngestMetrics
+from async_ingest import batch_len, client_inserter, ingest_async, log_summary as log_async_summary
 
 client = MilvusClient()
 logger.info("connected")
@@ -36,9 +49,10 @@ def create_collection_base(collection_name):
 
 
 def insert_collection_base(collection_name, nb_single, jsons):
+    vectors = uniform_vectors(nb_single, dim)
     data = [{
             "my_id": j ,
-            "my_vector": [random.random() for _ in range(dim)],
+            "my_vector": vectors[j],
             "json": jsons[j],
     } for j in range(nb_single)]
         
@@ -49,91 +63,408 @@ def insert_collection_base(collection_name, nb_single, jsons):
     client.load_collection(collection_name=collection_name)
 
 
-def insert_collection_streaming(collection_name, file_path, batch_size, pk_start, max_rows=None, progress_every=10000):
-    """Insert rows from a JSONL file. Returns (inserted_total, json_len_total, json_count)."""
+def sent_bytes(batch):
+    """一次 insert 实际发送的估算字节数: batch 是行列表或按列的 dict, 每行为 JSON + int64 主键 + float32 向量"""
+    docs = batch["json"] if isinstance(batch, dict) else [row["json"] for row in batch]
+    return sum(estimate_bytes(doc) for doc in docs) + len(docs) * (8 + 4 * dim)
+
+
+def insert_collection_streaming(collection_name, file_path, batch_size, pk_start, max_rows=None, progress_every=10000,
+                                passthrough=False, batch_bytes=None, checkpoint=None, columnar=False, metrics=None):
+    """Insert rows from a JSONL file. Returns (inserted_total, json_len_total, json_count).
+
+    passthrough=True 时不解析每行 JSON, 只做结构检查后把原始字符串直接作为 JSON 字段发送
+    batch_bytes: 按估算的字节数切分 batch (并根据插入吞吐自动调整), 代替固定的 batch_size 行
+    checkpoint: ImportCheckpoint, 每个 batch 插入成功后记录字节偏移、下一个 PK、已分配行数和实际插入行数, 有记录时从记录处继续
+    columnar=True 时不构造每行的 dict, 按列累积后直接编码成 InsertRequest 发送
+    metrics: IngestMetrics, 记录 read/parse/vectors/insert/checkpoint 各阶段耗时和每次 insert 的延迟
+    """
     inserted_total = 0
     json_len_total = 0
     json_count = 0
     next_id = pk_start
+    offset, line_start, rows_before, inserted_before = 0, 1, 0, 0
+    if checkpoint is not None:
+        state = checkpoint.file_state(file_path)
+        if state is not None and state["done"]:
+            logger.info(f"Skipping {file_path}: already imported according to {checkpoint.path}")
+            return 0, 0, 0
+        if state is not None and state["rows"] > 0:
+            offset, line_start, next_id, rows_before = state["offset"], state["line"], state["next_pk"], state["rows"]
+            inserted_before = state.get("inserted", rows_before)
+            logger.info(f"Resuming {file_path} at byte {offset} (line {line_start}), next pk {next_id}")
+            if max_rows is not None:
+                max_rows = max(0, max_rows - rows_before)
+    last_offset, last_line = offset, line_start - 1
     batch = []
-    with open(file_path, 'r', encoding='utf-8') as f:
-        for line_num, line in enumerate(f, start=1):
-            if max_rows is not None and inserted_total >= max_rows:
-                break
-            s = line.strip()
-            if not s:
-                continue
-            try:
-                obj = json.loads(s)
-                if not isinstance(obj, dict):
-                    logger.warning(f"Skip line {line_num}: JSON is not an object")
-                    continue
-            except Exception as e:
-                logger.warning(f"Skip line {line_num}: {e}")
-                continue
-
-            row = {
-                "my_id": next_id,
-                "my_vector": [random.random() for _ in range(dim)],
-                "json": obj,
-            }
-            batch.append(row)
+    batcher = AdaptiveBatcher(batch_bytes) if batch_bytes else None
+    # 每行除 JSON 外的固定开销: int64 主键 + float32 向量
+    row_overhead = 8 + 4 * dim
+
+    buf = ColumnBuffer(batch_size, arrays={"my_id": (np.int64, ())}, lists=["json"]) if columnar else None
+    # 当前 batch 的估算字节数 (JSON + 主键 + 向量)
+    pending_bytes = 0
+
+    def timed_insert(do_insert, batch):
+        start = time.perf_counter()
+        do_insert()
+        if metrics is not None:
+            # 按这次实际发送的行计算, passthrough 重试时不包含被丢弃的行
+            metrics.rpc(time.perf_counter() - start, batch_len(batch), sent_bytes(batch))
+
+    def insert(rows):
+        timed_insert(lambda: client.insert(collection_name=collection_name, data=rows), rows)
+
+    def insert_cols(columns):
+        timed_insert(lambda: insert_columns(client, collection_name, columns), columns)
+
+    def vectors(n):
+        start = time.perf_counter()
+        block = uniform_vectors(n, dim)
+        if metrics is not None:
+            metrics.add("vectors", time.perf_counter() - start, n, block.nbytes)
+        return block
+
+    def send(rows):
+        nonlocal pending_bytes
+        start = time.perf_counter()
+        if rows is buf:
+            columns = {**buf.columns(), "my_vector": vectors(len(buf))}
+            n = insert_columns_with_passthrough_retry(insert_cols, columns, "json", passthrough, logger.warning)
+            if batcher is not None:
+                batcher.record(len(buf), time.perf_counter() - start, nbytes=pending_bytes)
+            buf.clear()
+        else:
+            # one float32 block per batch instead of a Python list per row
+            for row, vector in zip(rows, vectors(len(rows))):
+                row["my_vector"] = vector
+            n = insert_with_passthrough_retry(insert, rows, "json", passthrough, logger.warning)
+            if batcher is not None:
+                batcher.record(rows, time.perf_counter() - start)
+        pending_bytes = 0
+        return n
+
+    def save_checkpoint(done=False):
+        if checkpoint is not None:
+            start = time.perf_counter()
+            checkpoint.update(file_path, offset=last_offset, line=last_line + 1, next_pk=next_id,
+                              rows=rows_before + json_count, inserted=inserted_before + inserted_total, done=done)
+            if metrics is not None:
+                metrics.add("checkpoint", time.perf_counter() - start)
+
+    def flush_full(full):
+        nonlocal inserted_total, batch
+        before = inserted_total
+        inserted_total += send(full)
+        batch = []
+        # 该 batch 已被确认, 它的最后一行之前的内容都不需要重新导入
+        save_checkpoint()
+        if inserted_total // progress_every > before // progress_every:
+            logger.info(f"Inserted {inserted_total} rows...")
+
+    for line_num, payload, json_len, end_offset in iter_jsonl_offsets(
+            file_path, offset, line_start, passthrough, warn=logger.warning, metrics=metrics):
+        # 按已分配的行数判断, 否则最多会多插入一个 batch
+        if max_rows is not None and json_count >= max_rows:
+            break
+        row_bytes = json_len + row_overhead
+        if batcher is not None:
+            # 按字节切分时在加入这一行之前判断, batch 不会超过目标字节数 (单行超过时单独成一个 batch);
+            # 此时 last_offset / next_id 还停在上一行, checkpoint 只记录已发送的行
+            if buf is not None:
+                full = buf if batcher.cut_before(row_bytes, pending_bytes, len(buf)) else None
+            else:
+                full = batcher.cut(row_bytes)
+            if full:
+                flush_full(full)
+        json_len_total += json_len
+        json_count += 1
+        last_offset, last_line = end_offset, line_num
+        pending_bytes += row_bytes
+        if buf is not None:
+            buf.append(my_id=next_id, json=payload)
             next_id += 1
-            json_len_total += len(s)
-            json_count += 1
-
-            if len(batch) >= batch_size:
-                client.insert(collection_name=collection_name, data=batch)
-                inserted_total += len(batch)
-                batch = []
-                if inserted_total % progress_every == 0:
-                    logger.info(f"Inserted {inserted_total} rows...")
-
-        # tail
-        if batch:
-            client.insert(collection_name=collection_name, data=batch)
-            inserted_total += len(batch)
+            full = buf if batcher is None and len(buf) >= batch_size else None
+        elif batcher is not None:
+            batcher.add({"my_id": next_id, "json": payload}, row_bytes)
+            next_id += 1
+            full = None
+        else:
+            batch.append({"my_id": next_id, "json": payload})
+            next_id += 1
+            full = batch if len(batch) >= batch_size else None
+
+        if full:
+            flush_full(full)
+
+    # tail
+    if buf is not None:
+        batch = buf if len(buf) else []
+    elif batcher is not None:
+        batch = batcher.take()
+    if batch:
+        inserted_total += send(batch)
+    save_checkpoint(done=True)
+    if batcher is not None:
+        batcher.log_summary(logger.info)
 
     return inserted_total, json_len_total, json_count
 
 
-def insert_multiple_files(collection_name, file_pattern, batch_size, pk_start, max_rows=None, progress_every=10000):
-    files = glob.glob(file_pattern)
+def insert_collection_pipelined(collection_name, file_path, batch_size, pk_start, max_rows=None, progress_every=10000,
+                                passthrough=False, batch_bytes=None, parse_workers=2, insert_workers=4, queue_size=8,
+                                metrics=None):
+    """与 insert_collection_streaming 相同的导入, 但读取/解析/插入并行流水线执行.
+
+    PK 由有序的 sequencer 按行顺序分配, 与顺序导入完全一致. Returns (inserted_total, json_len_total, json_count).
+    """
+    json_stats = {"len": 0, "count": 0}
+    stats_lock = threading.Lock()
+    batcher = AdaptiveBatcher(batch_bytes) if batch_bytes else None
+
+    def parse(chunk):
+        first_line, lines = chunk
+        rows = []
+        json_len_total = 0
+        start = time.perf_counter()
+        for i, line in enumerate(lines):
+            parsed = parse_jsonl_line(first_line + i, line, passthrough, logger.warning)
+            if parsed is None:
+                continue
+            rows.append({"json": parsed[0]})
+            json_len_total += parsed[1]
+        parsed_at = time.perf_counter()
+        vectors = uniform_vectors(len(rows), dim)
+        for row, vector in zip(rows, vectors):
+            row["my_vector"] = vector
+        if metrics is not None:
+            metrics.add("parse", parsed_at - start, len(rows), calls=len(lines))
+            metrics.add("vectors", time.perf_counter() - parsed_at, len(rows), vectors.nbytes)
+        with stats_lock:
+            json_stats["len"] += json_len_total
+            json_stats["count"] += len(rows)
+        return rows
+
+    def send(data):
+        start = time.perf_counter()
+        client.insert(collection_name=collection_name, data=data)
+        if metrics is not None:
+            metrics.rpc(time.perf_counter() - start, len(data), sent_bytes(data))
+
+    def insert(rows):
+        return insert_with_passthrough_retry(send, rows, "json", passthrough, logger.warning)
+
+    def timed_chunks(chunks):
+        # 读取阶段的耗时: 从文件 (或解压线程) 取出下一个 chunk 的时间
+        it = iter(chunks)
+        while True:
+            start = time.perf_counter()
+            chunk = next(it, None)
+            if chunk is None:
+                return
+            metrics.add("read", time.perf_counter() - start, len(chunk[1]), sum(len(line) for line in chunk[1]))
+            yield chunk
+
+    chunks = iter_line_chunks(file_path, batch_size)
+    summary = run_pipeline(
+        timed_chunks(chunks) if metrics is not None else chunks,
+        parse,
+        insert,
+        pk_field="my_id",
+        pk_start=pk_start,
+        batch_size=batch_size,
+        max_rows=max_rows,
+        parse_workers=parse_workers,
+        insert_workers=insert_workers,
+        queue_size=queue_size,
+        progress_every=progress_every,
+        log=logger.info,
+        batcher=batcher,
+    )
+    log_summary(summary, logger.info)
+    if batcher is not None:
+        batcher.log_summary(logger.info)
+    # 达到 max_rows 时 parse 可能多解析了几个 chunk, 平均 JSON 长度按所有解析过的行统计
+    return summary["inserted"], json_stats["len"], json_stats["count"]
+
+
+def insert_collection_async(collection_name, file_path, batch_size, pk_start, max_rows=None, progress_every=10000,
+                            passthrough=False, batch_bytes=None, window=8, columnar=False, metrics=None):
+    """与 insert_collection_streaming 相同的导入, 但用 AsyncMilvusClient 在一个事件循环里保持最多 window 个 insert 请求同时进行.
+
+    读取/解析在工作线程中进行, 请求窗口满时读取暂停 (反压). Returns (inserted_total, json_len_total, json_count).
+    """
+    json_stats = {"len": 0, "count": 0}
+    batcher = AdaptiveBatcher(batch_bytes) if batch_bytes else None
+    row_overhead = 8 + 4 * dim
+
+    def make_batch(first_pk, docs):
+        vectors = uniform_vectors(len(docs), dim)
+        if columnar:
+            # 每个 batch 用独立的数组, 多个请求同时在途, 不能复用 ColumnBuffer
+            return {"my_id": np.arange(first_pk, first_pk + len(docs), dtype=np.int64), "json": docs,
+                    "my_vector": vectors}
+        return [{"my_id": first_pk + i, "json": doc, "my_vector": vector}
+                for i, (doc, vector) in enumerate(zip(docs, vectors))]
+
+    def batches():
+        next_id = pk_start
+        docs, nbytes = [], 0
+        for _, payload, json_len, _ in iter_jsonl_offsets(file_path, passthrough=passthrough, warn=logger.warning,
+                                                          metrics=metrics):
+            if max_rows is not None and json_stats["count"] >= max_rows:
+                break
+            json_stats["len"] += json_len
+            json_stats["count"] += 1
+            if batcher is not None and batcher.cut_before(json_len + row_overhead, nbytes, len(docs)):
+                yield make_batch(next_id, docs), nbytes
+                next_id += len(docs)
+                docs, nbytes = [], 0
+            docs.append(payload)
+            nbytes += json_len + row_overhead
+            if batcher is None and len(docs) >= batch_size:
+                yield make_batch(next_id, docs), nbytes
+                next_id += len(docs)
+                docs, nbytes = [], 0
+        if docs:
+            yield make_batch(next_id, docs), nbytes
+
+    async def run():
+        async_client = AsyncMilvusClient()
+        do_send = client_inserter(async_client, collection_name, columnar)
+
+        async def send(batch):
+            start = time.perf_counter()
+            n = await do_send(batch)
+            if metrics is not None:
+                # 每次请求单独记录, passthrough 重试时只计入重试实际发送的行
+                metrics.rpc(time.perf_counter() - start, batch_len(batch), sent_bytes(batch))
+            return n
+
+        async def insert(item):
+            batch, nbytes = item
+            start = time.perf_counter()
+            n = await insert_with_passthrough_retry_async(send, batch, "json", passthrough, logger.warning)
+            elapsed = time.perf_counter() - start
+            if batcher is not None:
+                batcher.record(n, elapsed, nbytes=nbytes)
+            return n
+
+        try:
+            return await ingest_async(batches(), insert, window, progress_every=progress_every, log=logger.info)
+        finally:
+            await async_client.close()
+
+    summary = asyncio.run(run())
+    log_async_summary(summary, logger.info)
+    if batcher is not None:
+        batcher.log_summary(logger.info)
+    return summary["inserted"], json_stats["len"], json_stats["count"]
+
+
+def insert_multiple_files(collection_name, file_pattern, batch_size, pk_start, max_rows=None, progress_every=10000,
+                          passthrough=False, pipeline=None, file_workers=1, batch_bytes=None, checkpoint=None,
+                          columnar=False, metrics=None, async_window=0):
+    """导入匹配 file_pattern 的所有文件.
+
+    先并行统计每个文件的行数, 每个文件预先分配一段不重叠的 PK 区间 (按行数), 所以
+    file_workers > 1 时多个文件可以并发导入, PK 与顺序导入完全相同.
+    pipeline: insert_collection_pipelined 的参数 (parse_workers 等), 为 None 时逐行顺序导入
+    checkpoint: ImportCheckpoint, 每个文件单独记录进度, 行数也记录在其中, 恢复时不需要重新统计
+    max_rows: 顺序导入 (file_workers == 1) 时每个文件拿到前面文件实际插入后剩余的额度, 共插入 max_rows 行;
+        并发导入时每个文件的额度按行数预先分配, 空行和无效行也会占用额度, 插入的行数可能少于 max_rows
+    async_window: 大于 0 时每个文件用 insert_collection_async 导入, 保持这么多个请求同时进行
+    """
+    files = sorted(f for f in glob.glob(file_pattern) if os.path.isfile(f))  # 确保文件顺序一致
     if not files:
         logger.error(f"No files found matching pattern: {file_pattern}")
-        return 0
-    
-    files.sort()  # 确保文件顺序一致
+        return 0, 0, 0
+
     logger.info(f"Found {len(files)} files: {files}")
-    
-    inserted_total = 0
-    json_len_total = 0
-    json_count = 0
-    next_id = pk_start
-    
-    for file_path in files:
-        if not os.path.isfile(file_path):
-            logger.warning(f"Skipping non-file: {file_path}")
-            continue
-            
-        logger.info(f"Processing file: {file_path}")
-        file_inserted, file_len_total, file_count = insert_collection_streaming(
+
+    states = [checkpoint.file_state(f) for f in files] if checkpoint is not None else []
+    if states and all(st is not None and st.get("size") == os.path.getsize(f) for f, st in zip(files, states)):
+        line_counts = [st["lines"] for st in states]
+        logger.info(f"Using the line counts recorded in {checkpoint.path}")
+    else:
+        start = time.perf_counter()
+        line_counts = count_lines_parallel(files)
+        logger.info(f"Counted {sum(line_counts)} lines in {time.perf_counter() - start:.2f}s")
+    plan = assign_pk_ranges(line_counts, pk_start, max_rows)
+    if checkpoint is not None:
+        for f, lines, (base, _) in zip(files, line_counts, plan):
+            if checkpoint.file_state(f) is None:
+                checkpoint.update(f, offset=0, line=1, next_pk=base, rows=0, lines=lines, size=os.path.getsize(f))
+
+    def import_file(file_path, file_pk_start, file_max_rows):
+        logger.info(f"Processing file: {file_path}, pk_start: {file_pk_start}, max_rows: {file_max_rows}")
+        if async_window:
+            return insert_collection_async(
+                collection_name=collection_name,
+                file_path=file_path,
+                batch_size=batch_size,
+                pk_start=file_pk_start,
+                max_rows=file_max_rows,
+                progress_every=progress_every,
+                passthrough=passthrough,
+                batch_bytes=batch_bytes,
+                window=async_window,
+                columnar=columnar,
+                metrics=metrics,
+            )
+        if pipeline is not None:
+            return insert_collection_pipelined(
+                collection_name=collection_name,
+                file_path=file_path,
+                batch_size=batch_size,
+                pk_start=file_pk_start,
+                max_rows=file_max_rows,
+                progress_every=progress_every,
+                passthrough=passthrough,
+                batch_bytes=batch_bytes,
+                metrics=metrics,
+                **pipeline,
+            )
+        return insert_collection_streaming(
             collection_name=collection_name,
             file_path=file_path,
             batch_size=batch_size,
-            pk_start=next_id,
-            max_rows=max_rows,
+            pk_start=file_pk_start,
+            max_rows=file_max_rows,
             progress_every=progress_every,
+            passthrough=passthrough,
+            batch_bytes=batch_bytes,
+            checkpoint=checkpoint,
+            columnar=columnar,
+            metrics=metrics,
         )
-        inserted_total += file_inserted
-        json_len_total += file_len_total
-        json_count += file_count
-        next_id += file_inserted
-        
-        if max_rows is not None and inserted_total >= max_rows:
-            logger.info(f"Reached max rows limit: {max_rows}")
-            break
-    
+
+    if file_workers > 1:
+        # 超出 max_rows 的文件不需要导入
+        jobs = [(f, base, quota) for f, (base, quota) in zip(files, plan) if quota != 0]
+        if len(jobs) < len(files):
+            logger.info(f"Reached max rows limit: {max_rows}, importing {len(jobs)} of {len(files)} files")
+        with ThreadPoolExecutor(max_workers=file_workers) as pool:
+            results = list(pool.map(lambda job: import_file(*job), jobs))
+    else:
+        # 顺序导入: 额度按实际插入的行数扣减, 跳过的空行/无效行不占用额度
+        results = []
+        remaining = max_rows
+        for f, (base, _) in zip(files, plan):
+            if remaining is not None and remaining <= 0:
+                logger.info(f"Reached max rows limit: {max_rows}, imported {len(results)} of {len(files)} files")
+                break
+            # 之前的运行中已经导入的行 (--resume) 也计入额度
+            state = checkpoint.file_state(f) if checkpoint is not None else None
+            prior = state.get("inserted", state["rows"]) if state is not None else 0
+            result = import_file(f, base, remaining)
+            results.append(result)
+            if remaining is not None:
+                remaining -= prior + result[0]
+
+    inserted_total = sum(r[0] for r in results)
+    json_len_total = sum(r[1] for r in results)
+    json_count = sum(r[2] for r in results)
     return inserted_total, json_len_total, json_count
 
 
@@ -248,10 +579,40 @@ def main():
     parser.add_argument('--files', help='Glob pattern for multiple files (e.g., "data/*.jsonl" or "file_*.jsonl")')
     parser.add_argument('--collection', default="jsonl_collection", help='Collection name')
     parser.add_argument('--batch-size', type=int, default=1000, help='Batch insert size (default: 1000)')
+    parser.add_argument('--batch-bytes', type=int, default=None,
+                        help='Cut batches by estimated payload bytes instead of --batch-size rows, '
+                             'tuned online from insert throughput (e.g. 4194304)')
     parser.add_argument('--pk-start', type=int, default=0, help='Starting PK value (default: 0)')
-    parser.add_argument('--max-rows', type=int, default=None, help='Max rows to import (default: all)')
+    parser.add_argument('--max-rows', type=int, default=None,
+                        help='Max rows to import (default: all). With --files and --file-workers > 1 every file '
+                             'gets a budget of its share of the lines, so blank or invalid lines use it up and '
+                             'fewer rows may be inserted')
     parser.add_argument('--progress-every', type=int, default=10000, help='Print progress every N rows')
     parser.add_argument('--create', action='store_true', help='Drop and recreate collection before insert')
+    parser.add_argument('--passthrough-json', action='store_true',
+                        help='Forward each line as the JSON payload without parsing it (structural check only)')
+    parser.add_argument('--file-workers', type=int, default=1,
+                        help='Files imported concurrently with --files, each in its own pre-assigned PK range (default: 1)')
+    parser.add_argument('--checkpoint', default=None,
+                        help='State file updated after every acknowledged batch (default with --resume: '
+                             '<collection>.import-state.json)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted import from its --checkpoint state (byte offset and next PK)')
+    parser.add_argument('--columnar', action='store_true',
+                        help='Accumulate batches as columns and send them as column data instead of row dicts')
+    parser.add_argument('--async-window', type=int, default=0,
+                        help='Insert with AsyncMilvusClient, keeping up to N insert requests in flight (default: off)')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Run read / parse / insert as concurrent stages with bounded queues')
+    parser.add_argument('--parse-workers', type=int, default=2, help='Parser threads in --pipeline mode (default: 2)')
+    parser.add_argument('--insert-workers', type=int, default=4,
+                        help='Concurrent insert RPCs in --pipeline mode (default: 4)')
+    parser.add_argument('--queue-size', type=int, default=8,
+                        help='Capacity of each queue between stages in --pipeline mode (default: 8)')
+    parser.add_argument('--stats-interval', type=float, default=0,
+                        help='Log rows/s, MB/s, insert latency percentiles and the stage breakdown every N seconds')
+    parser.add_argument('--stats-json', default=None,
+                        help='Write the per-stage summary of the import as JSON to this path')
     
     # 查询相关参数
     parser.add_argument('--query-expr', help='Query expression (e.g., "my_id > 100")')
@@ -278,15 +639,69 @@ def main():
             logger.error("Must specify either --file or --files")
             return
 
+        if args.async_window and (args.pipeline or args.checkpoint or args.resume):
+            logger.error("--async-window cannot be combined with --pipeline or --checkpoint/--resume")
+            return
+
+        if args.columnar and args.pipeline:
+            logger.error("--columnar is not supported with --pipeline")
+            return
+
+        if args.columnar:
+            try:
+                check_client_support()
+            except ImportError as e:
+                logger.error(f"--columnar needs pymilvus client internals this release does not have: {e}")
+                return
+
+        checkpoint = None
+        if args.checkpoint or args.resume:
+            if args.pipeline:
+                logger.error("--checkpoint/--resume are not supported with --pipeline")
+                return
+            if args.resume and args.create:
+                logger.error("Cannot use --resume with --create, it would drop the imported rows")
+                return
+            inputs = [args.file] if args.file else sorted(f for f in glob.glob(args.files) if os.path.isfile(f))
+            checkpoint = ImportCheckpoint.open(
+                args.checkpoint or f"{args.collection}.import-state.json",
+                {"collection": args.collection, "pk_start": args.pk_start, "max_rows": args.max_rows,
+                 "files": [os.path.abspath(f) for f in inputs], "passthrough": args.passthrough_json},
+                resume=args.resume,
+            )
+            logger.info(f"Checkpointing to {checkpoint.path}")
+
+        pipeline = None
+        if args.pipeline:
+            pipeline = {"parse_workers": args.parse_workers, "insert_workers": args.insert_workers,
+                        "queue_size": args.queue_size}
+
+        metrics = None
+        if args.stats_interval or args.stats_json:
+            metrics = IngestMetrics(interval=args.stats_interval, log=logger.info).start()
+
         if args.file:
             # 单文件模式
-            inserted, json_len_total, json_count = insert_collection_streaming(
+            if args.async_window:
+                insert_file = insert_collection_async
+                mode_kwargs = {"window": args.async_window, "columnar": args.columnar}
+            elif pipeline is not None:
+                insert_file = insert_collection_pipelined
+                mode_kwargs = pipeline
+            else:
+                insert_file = insert_collection_streaming
+                mode_kwargs = {"checkpoint": checkpoint, "columnar": args.columnar}
+            inserted, json_len_total, json_count = insert_file(
                 collection_name=args.collection,
                 file_path=args.file,
                 batch_size=args.batch_size,
                 pk_start=args.pk_start,
                 max_rows=args.max_rows,
                 progress_every=args.progress_every,
+                passthrough=args.passthrough_json,
+                batch_bytes=args.batch_bytes,
+                metrics=metrics,
+                **mode_kwargs,
             )
         else:
             # 多文件模式
@@ -297,9 +712,23 @@ def main():
                 pk_start=args.pk_start,
                 max_rows=args.max_rows,
                 progress_every=args.progress_every,
+                passthrough=args.passthrough_json,
+                pipeline=pipeline,
+                file_workers=args.file_workers,
+                batch_bytes=args.batch_bytes,
+                checkpoint=checkpoint,
+                columnar=args.columnar,
+                metrics=metrics,
+                async_window=args.async_window,
             )
 
         logger.info(f"Inserted total rows: {inserted}")
+        if metrics is not None:
+            metrics.stop()
+            metrics.log_summary()
+            if args.stats_json:
+                metrics.write_summary(args.stats_json)
+                logger.info(f"Wrote import stats to {args.stats_json}")
         if json_count > 0:
             avg_json_len = json_len_total / float(json_count)
             logger.info(f"Average JSON length (chars) of inserted rows: {avg_json_len:.2f}")
@@ -2,6 +2,7 @@
 import random
 import string
 import json
+import numpy as np
 
 def random_string(length=6):
     return ''.join(random.choices(string.ascii_lowercase, k=length))
@@ -83,6 +84,24 @@ def generate_random_json(num_keys=10):
     return json_obj
 
 
+def random_key_value():
+    """随机生成不同类型的值"""
+    value_types = [
+        lambda: random.randint(1, 1000),  # 随机整数
+        lambda: round(random.uniform(1.0, 1000.0), 2),  # 随机浮点数
+        lambda: ''.join(random.choices(string.ascii_letters, k=10)),  # 随机字符串
+        lambda: [random.randint(1, 100) for _ in range(random.randint(2, 5))],  # 整数数组
+    ]
+    return random.choice(value_types)()
+
+
+def get_json(keys_num):
+    dict1 = {f"key_{i}x": random_key_value() for i in range(1, keys_num)}
+    dict1["key_0x"] = random.randint(1, 1000)
+    dict1["keyxx"] = random.randint(1, 1000)
+    return dict1
+
+
 # 生成一个随机 JSON 并打印
 #test_json = random_json()
 #print(json.dumps(test_json, indent=2))
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""JSON documents with a controlled shape, for JSON key-stats benchmarking.
+
+``get_json(keys_num)`` and ``random_json(depth, max_keys)`` produce documents
+whose shape is left to chance, so it is hard to say why ``expr_use_json_stats``
+helps on one collection and not another. ``JsonWorkload`` makes every property
+of the shape a knob:
+
+* ``n_keys``          distinct keys across the corpus (``key0`` .. ``key{n-1}``)
+* ``keys_per_doc``    expected number of keys per document
+* ``key_skew``        Zipf exponent of key popularity (0: every key equally likely)
+* ``type_mix``        weights of the value types (int, float, string, bool, null, array, object)
+* ``mixed_keys``      share of keys whose values draw a type per document, so the
+                      same key holds ``1`` in one row and ``"1"`` in the next
+                      (``json/test-json.py`` test2); the other keys have one fixed type
+* ``depth``           maximum nesting: key ``k`` lives at ``key_k/l1/../l{d}`` with d in [0, depth]
+* ``cardinality``     distinct values per key (``None``: practically unique)
+* ``value_skew``      Zipf exponent of the values of a key (0: uniform)
+
+Value ``j`` of a key encodes as ``j`` (int), ``j + 0.5`` (float), ``"j"`` with
+the optional prefix (string), ``j % 2 == 0`` (bool), ``[j, j + 1]`` (array) or
+``{"a": j}`` (object), so predicates over the generated data are easy to
+write. ``describe()`` lists each key's path, types and presence probability.
+
+Documents come out as encoded JSON strings. With a small cardinality every
+``"key": value`` fragment is encoded once up front; a document is then one
+``str.join`` over its slice of fancy-indexed fragments, which is fast enough
+for tens of millions of documents.
+
+    python json_workload.py --rows 10000000 --n-keys 200 --keys-per-doc 20 --out docs.jsonl
+    python json/milvus_import_jsonl.py --file docs.jsonl --collection json_stats --create
+    python json_workload.py --n-keys 200 --keys-per-doc 20 --describe   # paths to query
+"""
+import argparse
+import json
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from column_batches import ColumnBatch, iter_column_batches
+from vector_factory import uniform_vectors
+
+VALUE_TYPES = ("int", "float", "string", "bool", "null", "array", "object")
+
+DEFAULT_TYPE_MIX = {"int": 0.5, "float": 0.2, "string": 0.2, "bool": 0.1}
+
+# value index range used when cardinality is None
+UNBOUNDED = 1 << 31
+# largest types x cardinality table encoded up front per key, above that values are encoded per row
+TABLE_LIMIT = 1 << 16
+
+# spawn key of the corpus model, batches use their start row
+_MODEL_KEY = 1 << 63
+
+
+def _encode_values(value_type: str, values: np.ndarray, string_prefix: str) -> List[str]:
+    """JSON text of value index j for every j in values."""
+    if value_type == "int":
+        return [str(v) for v in values.tolist()]
+    if value_type == "float":
+        return [repr(v + 0.5) for v in values.tolist()]
+    if value_type == "string":
+        return [f'"{string_prefix}{v}"' for v in values.tolist()]
+    if value_type == "bool":
+        return ["true" if v % 2 == 0 else "false" for v in values.tolist()]
+    if value_type == "null":
+        return ["null"] * len(values)
+    if value_type == "array":
+        return [f"[{v},{v + 1}]" for v in values.tolist()]
+    if value_type == "object":
+        return [f'{{"a":{v}}}' for v in values.tolist()]
+    raise ValueError(f"Unsupported value type: {value_type!r}, expected one of {VALUE_TYPES}")
+
+
+class JsonWorkload:
+    def __init__(
+        self,
+        n_keys: int = 100,
+        keys_per_doc: float = 10.0,
+        key_skew: float = 0.0,
+        type_mix: Optional[Dict[str, float]] = None,
+        mixed_keys: float = 0.0,
+        depth: int = 0,
+        cardinality: Optional[int] = 1000,
+        value_skew: float = 0.0,
+        string_prefix: str = "",
+        seed: int = 0,
+    ):
+        if not 0 < keys_per_doc <= n_keys:
+            raise ValueError(f"keys_per_doc must be in (0, {n_keys}], got {keys_per_doc}")
+        self.n_keys = n_keys
+        self.keys_per_doc = keys_per_doc
+        self.key_skew = key_skew
+        self.type_mix = dict(type_mix or DEFAULT_TYPE_MIX)
+        self.mixed_keys = mixed_keys
+        self.depth = depth
+        self.cardinality = cardinality
+        self.value_skew = value_skew
+        self.string_prefix = string_prefix
+        self.seed = seed
+
+        unknown = set(self.type_mix) - set(VALUE_TYPES)
+        if unknown:
+            raise ValueError(f"Unsupported value types: {sorted(unknown)}, expected some of {VALUE_TYPES}")
+        self.types = [t for t in VALUE_TYPES if self.type_mix.get(t, 0) > 0]
+        weights = np.asarray([self.type_mix[t] for t in self.types], dtype=np.float64)
+        self.type_p = weights / weights.sum()
+
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(_MODEL_KEY,)))
+        # key popularity: Zipf weights scaled so that the expected key count is keys_per_doc
+        popularity = 1.0 / np.arange(1, n_keys + 1, dtype=np.float64) ** key_skew
+        self.presence = self._scale_presence(popularity[rng.permutation(n_keys)], keys_per_doc)
+        self.key_depth = rng.integers(0, depth, n_keys, endpoint=True)
+        self.mixed = rng.random(n_keys) < mixed_keys
+        self.key_type = rng.choice(len(self.types), n_keys, p=self.type_p)
+        self.names = [f"key{k}" for k in range(n_keys)]
+
+        self._prefix = []
+        self._suffix = []
+        for k, name in enumerate(self.names):
+            d = int(self.key_depth[k])
+            self._prefix.append(f',"{name}":' + "".join(f'{{"l{i}":' for i in range(1, d + 1)))
+            self._suffix.append("}" * d)
+
+        self._value_cdf = None
+        if cardinality is not None and value_skew > 0:
+            weights = 1.0 / np.arange(1, cardinality + 1, dtype=np.float64) ** value_skew
+            self._value_cdf = np.cumsum(weights / weights.sum())
+            self._value_cdf[-1] = 1.0
+
+        # (type, value) -> fragment tables, encoded once per key when cardinality is small enough
+        self._use_tables = cardinality is not None and cardinality * len(self.types) <= TABLE_LIMIT
+        self._tables: Dict[int, np.ndarray] = {}
+
+    @staticmethod
+    def _scale_presence(weights: np.ndarray, target: float) -> np.ndarray:
+        """Presence probabilities proportional to weights, capped at 1, summing to target."""
+        p = np.zeros_like(weights)
+        free = np.ones(len(weights), dtype=bool)
+        remaining = target
+        # water-filling: keys that would exceed 1 are pinned at 1 and the rest rescaled
+        while free.any():
+            scaled = weights[free] * (remaining / weights[free].sum())
+            over = scaled >= 1.0
+            if not over.any():
+                p[free] = scaled
+                break
+            idx = np.flatnonzero(free)[over]
+            p[idx] = 1.0
+            free[idx] = False
+            remaining -= len(idx)
+        return p
+
+    def describe(self) -> List[Dict[str, Any]]:
+        """Path, value types and presence probability of every key."""
+        out = []
+        for k, name in enumerate(self.names):
+            path = [name] + [f"l{i}" for i in range(1, int(self.key_depth[k]) + 1)]
+            types = self.types if self.mixed[k] else [self.types[self.key_type[k]]]
+            out.append({
+                "key": name,
+                "path": path,
+                "expr": "json" + "".join(f"['{p}']" for p in path),
+                "types": list(types),
+                "presence": float(self.presence[k]),
+            })
+        return out
+
+    def _table(self, k: int) -> np.ndarray:
+        """(n_types, cardinality) object array of ',"key": value' fragments of key k."""
+        if k not in self._tables:
+            values = np.arange(self.cardinality)
+            self._tables[k] = np.asarray(
+                [
+                    [self._prefix[k] + v + self._suffix[k] for v in _encode_values(t, values, self.string_prefix)]
+                    for t in self.types
+                ],
+                dtype=object,
+            )
+        return self._tables[k]
+
+    def _value_indices(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        if self.cardinality is None:
+            return rng.integers(0, UNBOUNDED, n)
+        if self._value_cdf is None:
+            return rng.integers(0, self.cardinality, n)
+        return np.searchsorted(self._value_cdf, rng.random(n), side="right")
+
+    def _fragments(self, rng: np.random.Generator, k: int, n: int) -> np.ndarray:
+        values = self._value_indices(rng, n)
+        if self.mixed[k]:
+            types = rng.choice(len(self.types), n, p=self.type_p)
+        else:
+            types = np.full(n, self.key_type[k])
+        if self._use_tables:
+            return self._table(k)[types, values]
+        out = np.empty(n, dtype=object)
+        for t in np.unique(types).tolist():
+            rows = np.flatnonzero(types == t)
+            encoded = _encode_values(self.types[t], values[rows], self.string_prefix)
+            out[rows] = [self._prefix[k] + v + self._suffix[k] for v in encoded]
+        return out
+
+    def documents(self, start: int, count: int) -> List[str]:
+        """Rows [start, start + count) as encoded JSON strings."""
+        rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(start,)))
+        present = rng.random((count, self.n_keys)) < self.presence
+        # (row, key) pairs in row-major order, so each document's fragments are contiguous
+        rows, keys = np.nonzero(present)
+        flat = np.empty(len(rows), dtype=object)
+        order = np.argsort(keys, kind="stable")
+        bounds = np.searchsorted(keys[order], np.arange(self.n_keys + 1))
+        for k in range(self.n_keys):
+            lo, hi = bounds[k], bounds[k + 1]
+            if lo < hi:
+                flat[order[lo:hi]] = self._fragments(rng, k, hi - lo)
+        offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(present.sum(axis=1), out=offsets[1:])
+        flat = flat.tolist()
+        offsets = offsets.tolist()
+        # every fragment starts with ",", drop the first one
+        return ["{" + "".join(flat[lo:hi])[1:] + "}" for lo, hi in zip(offsets[:-1], offsets[1:])]
+
+    def iter_documents(self, total: int, batch_size: int = 10000, start: int = 0) -> Iterator[List[str]]:
+        for offset in range(start, start + total, batch_size):
+            yield self.documents(offset, min(batch_size, start + total - offset))
+
+    def iter_batches(self, total: int, batch_size: int, dim: int = 128, start: int = 0,
+                     pk_field: str = "my_id", vector_field: str = "my_vector",
+                     json_field: str = "my_json") -> Iterator[ColumnBatch]:
+        """ColumnBatch objects for the usual my_id / my_vector / my_json test schema."""
+        def make_batch(offset, count):
+            rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(_MODEL_KEY, offset)))
+            return ColumnBatch(
+                pks=np.arange(offset, offset + count, dtype=np.int64),
+                pk_field=pk_field,
+                vectors={vector_field: uniform_vectors(count, dim, rng)},
+                json={json_field: self.documents(offset, count)},
+            )
+
+        return iter_column_batches(total, batch_size, make_batch, start=start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate JSON documents with a controlled shape")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--n-keys", type=int, default=100)
+    parser.add_argument("--keys-per-doc", type=float, default=10.0)
+    parser.add_argument("--key-skew", type=float, default=0.0)
+    parser.add_argument("--type-mix", default=json.dumps(DEFAULT_TYPE_MIX),
+                        help=f"JSON object of type weights over {', '.join(VALUE_TYPES)}")
+    parser.add_argument("--mixed-keys", type=float, default=0.0)
+    parser.add_argument("--depth", type=int, default=0)
+    parser.add_argument("--cardinality", type=int, default=1000, help="Distinct values per key (0: unbounded)")
+    parser.add_argument("--value-skew", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="Write a JSONL file (default: only time generation)")
+    parser.add_argument("--describe", action="store_true", help="Print the key table as JSON and exit")
+    args = parser.parse_args()
+
+    workload = JsonWorkload(
+        args.n_keys, args.keys_per_doc, args.key_skew, json.loads(args.type_mix), args.mixed_keys,
+        args.depth, args.cardinality or None, args.value_skew, seed=args.seed,
+    )
+    if args.describe:
+        print(json.dumps(workload.describe(), indent=2))
+        return
+
+    start = time.perf_counter()
+    size = 0
+    out = open(args.out, "w", encoding="utf-8") if args.out else None
+    try:
+        for docs in workload.iter_documents(args.rows, args.batch):
+            size += sum(map(len, docs))
+            if out:
+                out.write("\n".join(docs))
+                out.write("\n")
+    finally:
+        if out:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"{args.rows} docs, avg {size / max(args.rows, 1):.0f} bytes, in {elapsed:.2f}s "
+          f"({args.rows / elapsed:,.0f} docs/s)")
+
+
+if __name__ == "__main__":
+    main()
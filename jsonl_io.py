@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""JSONL reading shared by the importers, with a parse-free passthrough mode.
+
+The importers used to ``json.loads`` every line only for pymilvus to walk the
+dict again and re-encode it. pymilvus also accepts a JSON field value as an
+already encoded ``str``: it validates it with orjson and sends the original
+bytes. In passthrough mode a line is only checked structurally (an object,
+``{...}``) and forwarded as is, which skips the Python-side decode, the
+numpy-type walk and the re-encode.
+
+A line that passes the cheap check but is not valid JSON makes pymilvus reject
+its whole batch; ``drop_invalid_json`` is used to find and skip such lines
+before retrying the batch once.
+
+Every reader here also takes gzip / zstd / bz2 compressed files, decompressed
+on a background thread (``compressed_input``).
+
+    python jsonl_io.py bench data.jsonl      # client CPU of both paths, no server needed
+"""
+import argparse
+import json
+import mmap
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from compressed_input import compression_of, count_lines_stream, iter_lines
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# iter_jsonl_offsets hands its stage timings to the metrics every this many lines
+_METRICS_FLUSH_LINES = 4096
+
+
+def looks_like_json_object(s: str) -> bool:
+    """Cheap structural check of a stripped line: starts with '{' and ends with '}'."""
+    return len(s) >= 2 and s[0] == "{" and s[-1] == "}"
+
+
+def is_valid_json_object(s: str) -> bool:
+    try:
+        obj = orjson.loads(s) if orjson is not None else json.loads(s)
+    except ValueError:
+        return False
+    return isinstance(obj, dict)
+
+
+def parse_jsonl_line(line_num: int, line: str, passthrough: bool = False,
+                     warn: Callable[[str], Any] = print) -> Optional[Tuple[Any, int]]:
+    """(payload, json_len) of one JSONL line, or None for a blank or unusable line."""
+    s = line.strip()
+    if not s:
+        return None
+    if passthrough:
+        if not looks_like_json_object(s):
+            warn(f"Skip line {line_num}: JSON is not an object")
+            return None
+        return s, len(s)
+    try:
+        obj = json.loads(s)
+    except Exception as e:
+        warn(f"Skip line {line_num}: {e}")
+        return None
+    if not isinstance(obj, dict):
+        warn(f"Skip line {line_num}: JSON is not an object")
+        return None
+    return obj, len(s)
+
+
+def iter_jsonl(path: str, passthrough: bool = False, warn: Callable[[str], Any] = print) -> Iterator[Tuple[int, Any, int]]:
+    """Yield (line_num, payload, json_len) for every usable line of a JSONL file.
+
+    payload is the decoded dict, or with passthrough the stripped line itself.
+    json_len is the length of the stripped line in both modes.
+    """
+    if compression_of(path) is not None:
+        for line_num, raw in enumerate(iter_lines(path), start=1):
+            parsed = parse_jsonl_line(line_num, raw.decode("utf-8"), passthrough, warn)
+            if parsed is not None:
+                yield line_num, parsed[0], parsed[1]
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line_num, line in enumerate(f, start=1):
+            parsed = parse_jsonl_line(line_num, line, passthrough, warn)
+            if parsed is not None:
+                yield line_num, parsed[0], parsed[1]
+
+
+def iter_jsonl_offsets(path: str, offset: int = 0, line_num: int = 1, passthrough: bool = False,
+                       warn: Callable[[str], Any] = print, metrics: Any = None) -> Iterator[Tuple[int, Any, int, int]]:
+    """Like iter_jsonl, starting at byte offset (the start of line line_num), also yielding the
+    byte offset just past each line: (line_num, payload, json_len, end_offset).
+
+    A resumed import seeks straight to a recorded end_offset instead of re-reading the prefix.
+    For a compressed file offsets count decompressed bytes, and resuming decompresses
+    and drops the prefix (but does not parse or insert it).
+    With metrics (an IngestMetrics), the time spent reading and parsing lines is
+    accounted to its "read" and "parse" stages, every few thousand lines.
+    """
+    if compression_of(path) is not None:
+        lines = iter_lines(path)
+        skip = offset
+    else:
+        lines = open(path, "rb")
+        lines.seek(offset)
+        skip = 0
+    read_s = parse_s = 0.0
+    read_lines = read_bytes = parsed_rows = 0
+    try:
+        while skip > 0:
+            raw = next(lines, b"")
+            if not raw:
+                break
+            skip -= len(raw)
+        if skip != 0:
+            raise ValueError(f"{path}: offset {offset} is not at a line start")
+        t0 = time.perf_counter()
+        for raw in lines:
+            t1 = time.perf_counter()
+            offset += len(raw)
+            parsed = parse_jsonl_line(line_num, raw.decode("utf-8"), passthrough, warn)
+            t2 = time.perf_counter()
+            if metrics is not None:
+                read_s += t1 - t0
+                parse_s += t2 - t1
+                read_lines += 1
+                read_bytes += len(raw)
+                parsed_rows += parsed is not None
+                if read_lines >= _METRICS_FLUSH_LINES:
+                    metrics.add("read", read_s, read_lines, read_bytes, calls=read_lines)
+                    metrics.add("parse", parse_s, parsed_rows, calls=read_lines)
+                    read_s = parse_s = 0.0
+                    read_lines = read_bytes = parsed_rows = 0
+            if parsed is not None:
+                yield line_num, parsed[0], parsed[1], offset
+            line_num += 1
+            # the consumer's time between two lines is not reading
+            t0 = time.perf_counter()
+    finally:
+        lines.close()
+        if metrics is not None and read_lines:
+            metrics.add("read", read_s, read_lines, read_bytes, calls=read_lines)
+            metrics.add("parse", parse_s, parsed_rows, calls=read_lines)
+
+
+def count_lines(path: str, block_size: int = 64 << 20) -> int:
+    """Number of lines of a file (a last line without newline counts), by newline counting over an mmap.
+
+    A compressed file is counted by streaming through its decompressed content.
+    """
+    if compression_of(path) is not None:
+        return count_lines_stream(path)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = np.frombuffer(mm, dtype=np.uint8)
+            lines = 0
+            for lo in range(0, size, block_size):
+                lines += int(np.count_nonzero(data[lo:lo + block_size] == 10))
+            if data[-1] != 10:
+                lines += 1
+            del data
+            return lines
+
+
+def count_lines_parallel(paths: Sequence[str], workers: Optional[int] = None) -> List[int]:
+    """count_lines of every path, files counted concurrently (numpy and the decompressors drop the GIL)."""
+    with ThreadPoolExecutor(max_workers=workers or min(len(paths), os.cpu_count() or 1) or 1) as pool:
+        return list(pool.map(count_lines, paths))
+
+
+def assign_pk_ranges(line_counts: Sequence[int], pk_start: int,
+                     max_rows: Optional[int] = None) -> List[Tuple[int, Optional[int]]]:
+    """(pk_start, max_rows) of every file, given their line counts.
+
+    File i owns the PKs [pk_start + lines before it, + its own lines), so files
+    can be imported in any order or concurrently without PK overlap. With
+    max_rows, every file gets the share of the budget its lines cover in file
+    order (0 for files past the budget); skipped lines (blank or invalid) still
+    use up their PK and their share. The quotas are meant for concurrent
+    imports; a sequential import can pass each file what the previous files
+    left of the budget instead.
+    """
+    plan = []
+    base = pk_start
+    consumed = 0
+    for lines in line_counts:
+        if max_rows is None:
+            quota = None
+        else:
+            quota = max(0, min(lines, max_rows - consumed))
+        plan.append((base, quota))
+        base += lines
+        consumed += lines
+    return plan
+
+
+def drop_invalid_json(rows: List[Dict[str, Any]], json_field: str, warn: Callable[[str], Any] = print) -> List[Dict[str, Any]]:
+    """Rows whose passthrough JSON string really parses; the others are reported and dropped."""
+    kept = []
+    for row in rows:
+        value = row[json_field]
+        if isinstance(value, str) and not is_valid_json_object(value):
+            warn(f"Skip row with invalid JSON: {value[:100]!r}")
+            continue
+        kept.append(row)
+    return kept
+
+
+def insert_with_passthrough_retry(insert: Callable[[List[Dict[str, Any]]], Any], rows: List[Dict[str, Any]],
+                                  json_field: str, passthrough: bool, warn: Callable[[str], Any] = print) -> int:
+    """insert(rows); in passthrough mode a rejected batch is retried once without its invalid lines.
+
+    Returns the number of rows inserted.
+    """
+    try:
+        insert(rows)
+        return len(rows)
+    except Exception:
+        if not passthrough:
+            raise
+        kept = drop_invalid_json(rows, json_field, warn)
+        if len(kept) == len(rows):
+            raise
+        if kept:
+            insert(kept)
+        return len(kept)
+
+
+def drop_invalid_json_columns(columns: Dict[str, Any], json_field: str,
+                              warn: Callable[[str], Any] = print) -> Dict[str, Any]:
+    """Column-data version of drop_invalid_json: columns maps field -> list or array."""
+    keep = []
+    for value in columns[json_field]:
+        ok = not isinstance(value, str) or is_valid_json_object(value)
+        if not ok:
+            warn(f"Skip row with invalid JSON: {value[:100]!r}")
+        keep.append(ok)
+    mask = np.asarray(keep, dtype=bool)
+    return {name: col[mask] if isinstance(col, np.ndarray) else [v for v, k in zip(col, keep) if k]
+            for name, col in columns.items()}
+
+
+def insert_columns_with_passthrough_retry(insert: Callable[[Dict[str, Any]], Any], columns: Dict[str, Any],
+                                          json_field: str, passthrough: bool,
+                                          warn: Callable[[str], Any] = print) -> int:
+    """Column-data version of insert_with_passthrough_retry: columns maps field -> list or array."""
+    n = len(columns[json_field])
+    try:
+        insert(columns)
+        return n
+    except Exception:
+        if not passthrough:
+            raise
+        kept = drop_invalid_json_columns(columns, json_field, warn)
+        if len(kept[json_field]) == n:
+            raise
+        if len(kept[json_field]):
+            insert(kept)
+        return len(kept[json_field])
+
+
+async def insert_with_passthrough_retry_async(insert: Callable[[Any], Awaitable[Any]], batch: Any, json_field: str,
+                                              passthrough: bool, warn: Callable[[str], Any] = print) -> int:
+    """Coroutine version of both retries: batch is a list of rows or a dict of columns."""
+    columnar = isinstance(batch, dict)
+    n = len(batch[json_field]) if columnar else len(batch)
+    try:
+        await insert(batch)
+        return n
+    except Exception:
+        if not passthrough:
+            raise
+        if columnar:
+            kept = drop_invalid_json_columns(batch, json_field, warn)
+            kept_n = len(kept[json_field])
+        else:
+            kept = drop_invalid_json(batch, json_field, warn)
+            kept_n = len(kept)
+        if kept_n == n:
+            raise
+        if kept_n:
+            await insert(kept)
+        return kept_n
+
+
+def benchmark(path: str, max_rows: int = 200000) -> Dict[str, float]:
+    """Client-side seconds per path: read + decode + pymilvus JSON encoding, vs read + check + encoding."""
+    from pymilvus.client.entity_helper import convert_to_json
+
+    results = {}
+    for name, passthrough in (("parse", False), ("passthrough", True)):
+        start = time.perf_counter()
+        rows = 0
+        size = 0
+        for _, payload, json_len in iter_jsonl(path, passthrough, warn=lambda msg: None):
+            try:
+                convert_to_json(payload)
+            except Exception:
+                # pymilvus rejects it, the importer would drop it on retry
+                continue
+            rows += 1
+            size += json_len
+            if rows >= max_rows:
+                break
+        elapsed = time.perf_counter() - start
+        results[name] = elapsed
+        print(f"{name:<12} {rows} rows, avg JSON length {size / max(rows, 1):.2f}, "
+              f"{elapsed:.2f}s ({rows / elapsed:,.0f} rows/s)")
+    print(f"passthrough speedup: {results['parse'] / results['passthrough']:.2f}x")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSONL passthrough tools")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    bench = sub.add_parser("bench", help="Compare client CPU of the parse and passthrough paths")
+    bench.add_argument("file")
+    bench.add_argument("--max-rows", type=int, default=200000)
+    args = parser.parse_args()
+    if args.cmd == "bench":
+        benchmark(args.file, args.max_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,12 @@
 import argparse
 import json
 import os
-import random
 import sys
+import time
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
+
 from pymilvus import (
     FieldSchema,
     CollectionSchema,
@@ -15,6 +17,13 @@ from pymilvus import (
     utility,
 )
 
+from vector_factory import make_vectors
+from jsonl_io import iter_jsonl, insert_with_passthrough_retry, insert_columns_with_passthrough_retry
+from adaptive_batcher import AdaptiveBatcher
+from columnar_insert import ColumnBuffer, insert_columns_orm
+
+VECTOR_BLOCK_ROWS = 4096
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -52,6 +61,12 @@ def parse_args() -> argparse.Namespace:
         help="Path to JSONL file (default: data.jsonl)",
     )
     parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--batch-bytes",
+        type=int,
+        default=None,
+        help="Cut batches by estimated payload bytes instead of --batch-size rows, tuned online (e.g. 4194304)",
+    )
     parser.add_argument("--max-rows", type=int, default=None)
     parser.add_argument("--pk-start", type=int, default=1, help="Starting PK value (default: 1)")
     parser.add_argument(
@@ -61,6 +76,16 @@ def parse_args() -> argparse.Namespace:
         help="Random distribution for vectors (default: uniform)",
     )
     parser.add_argument("--progress-every", type=int, default=10000)
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Accumulate batches as columns and send them as column data instead of row dicts",
+    )
+    parser.add_argument(
+        "--passthrough-json",
+        action="store_true",
+        help="Forward each line as the JSON payload without parsing it (structural check only)",
+    )
 
     # Index
     parser.add_argument("--create-index", action="store_true")
@@ -132,10 +157,10 @@ def create_index_if_needed(col: Collection, vector_field: str, index_type: str,
     )
 
 
-def random_vector(dim: int, dist: str) -> List[float]:
-    if dist == "normal":
-        return [random.gauss(0.0, 1.0) for _ in range(dim)]
-    return [random.random() for _ in range(dim)]
+def iter_random_vectors(dim: int, dist: str) -> Iterable[np.ndarray]:
+    """Endless float32 vectors, generated VECTOR_BLOCK_ROWS at a time."""
+    while True:
+        yield from make_vectors(VECTOR_BLOCK_ROWS, dim, dist)
 
 
 def iter_jsonl_rows(
@@ -146,28 +171,19 @@ def iter_jsonl_rows(
     dim: int,
     pk_start: int,
     rand_dist: str,
+    passthrough: bool = False,
 ) -> Iterable[Dict[str, Any]]:
+    """Rows of a JSONL file; with passthrough the JSON field is the original line, not a dict."""
     pk = pk_start
-    with open(path, "r", encoding="utf-8") as f:
-        for line_num, line in enumerate(f, start=1):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-                if not isinstance(obj, dict):
-                    raise ValueError("JSON line is not an object")
-            except Exception as e:
-                print(f"[WARN] Skip line {line_num}: {e}")
-                continue
-
-            row: Dict[str, Any] = {
-                pk_field: pk,
-                json_field: obj,
-                vector_field: random_vector(dim, rand_dist),
-            }
-            pk += 1
-            yield row
+    vectors = iter_random_vectors(dim, rand_dist)
+    for _, payload, _ in iter_jsonl(path, passthrough, warn=lambda msg: print(f"[WARN] {msg}")):
+        row: Dict[str, Any] = {
+            pk_field: pk,
+            json_field: payload,
+            vector_field: next(vectors),
+        }
+        pk += 1
+        yield row
 
 
 def insert_in_batches(
@@ -176,22 +192,101 @@ def insert_in_batches(
     batch_size: int,
     max_rows: Optional[int],
     progress_every: int,
+    json_field: str = "json",
+    passthrough: bool = False,
+    batch_bytes: Optional[int] = None,
 ) -> int:
+    """Insert rows in batch_size batches, or in batches of ~batch_bytes tuned from insert throughput."""
     batch: List[Dict[str, Any]] = []
+    batcher = AdaptiveBatcher(batch_bytes) if batch_bytes else None
     total = 0
+    taken = 0
+    warn = lambda msg: print(f"[WARN] {msg}")
+
+    def send(rows: List[Dict[str, Any]]) -> int:
+        start = time.perf_counter()
+        n = insert_with_passthrough_retry(col.insert, rows, json_field, passthrough, warn)
+        if batcher is not None:
+            batcher.record(rows, time.perf_counter() - start)
+        return n
+
     for row in rows:
-        batch.append(row)
-        if len(batch) >= batch_size:
-            col.insert(batch)
-            total += len(batch)
+        if max_rows is not None and taken >= max_rows:
+            break
+        taken += 1
+        if batcher is not None:
+            full = batcher.add(row)
+        else:
+            batch.append(row)
+            full = batch if len(batch) >= batch_size else None
+        if full:
+            before = total
+            total += send(full)
             batch = []
-            if total % progress_every == 0:
+            if total // progress_every > before // progress_every:
                 print(f"Inserted {total} rows...")
-            if max_rows is not None and total >= max_rows:
-                return total
+    if batcher is not None:
+        batch = batcher.take()
     if batch:
-        col.insert(batch)
-        total += len(batch)
+        total += send(batch)
+    if batcher is not None:
+        batcher.log_summary()
+    return total
+
+
+def insert_columnar(
+    col: Collection,
+    path: str,
+    pk_field: str,
+    json_field: str,
+    vector_field: str,
+    dim: int,
+    pk_start: int,
+    rand_dist: str,
+    batch_size: int,
+    max_rows: Optional[int],
+    progress_every: int,
+    passthrough: bool = False,
+    batch_bytes: Optional[int] = None,
+) -> int:
+    """insert_in_batches over a JSONL file without per-row dicts: PKs and JSON go into
+    column buffers and each batch gets one vector block, sent as column data."""
+    buf = ColumnBuffer(batch_size, arrays={pk_field: (np.int64, ())}, lists=[json_field])
+    buf_bytes = 0
+    row_overhead = 8 + 4 * dim
+    batcher = AdaptiveBatcher(batch_bytes) if batch_bytes else None
+    total = 0
+    taken = 0
+    warn = lambda msg: print(f"[WARN] {msg}")
+
+    def send() -> int:
+        start = time.perf_counter()
+        columns = {**buf.columns(), vector_field: make_vectors(len(buf), dim, rand_dist)}
+        n = insert_columns_with_passthrough_retry(lambda c: insert_columns_orm(col, c), columns, json_field,
+                                                  passthrough, warn)
+        if batcher is not None:
+            batcher.record(len(buf), time.perf_counter() - start, nbytes=buf_bytes)
+        return n
+
+    for _, payload, json_len in iter_jsonl(path, passthrough, warn=warn):
+        if max_rows is not None and taken >= max_rows:
+            break
+        # by bytes the batch is cut before the row that would not fit, by rows after the row that fills it
+        if (batcher.cut_before(json_len + row_overhead, buf_bytes, len(buf)) if batcher is not None
+                else len(buf) >= batch_size):
+            before = total
+            total += send()
+            buf.clear()
+            buf_bytes = 0
+            if total // progress_every > before // progress_every:
+                print(f"Inserted {total} rows...")
+        buf.append(**{pk_field: pk_start + taken, json_field: payload})
+        taken += 1
+        buf_bytes += json_len + row_overhead
+    if len(buf):
+        total += send()
+    if batcher is not None:
+        batcher.log_summary()
     return total
 
 
@@ -237,9 +332,9 @@ def main() -> None:
     print(
         f"Starting import from {args.file!r} into collection {args.collection!r} (batch_size={args.batch_size})..."
     )
-    inserted = insert_in_batches(
-        col,
-        rows=iter_jsonl_rows(
+    if args.columnar:
+        inserted = insert_columnar(
+            col,
             path=args.file,
             pk_field=args.pk_field,
             json_field=args.json_field,
@@ -247,11 +342,32 @@ def main() -> None:
             dim=args.dim,
             pk_start=args.pk_start,
             rand_dist=args.rand_dist,
-        ),
-        batch_size=args.batch_size,
-        max_rows=args.max_rows,
-        progress_every=args.progress_every,
-    )
+            batch_size=args.batch_size,
+            max_rows=args.max_rows,
+            progress_every=args.progress_every,
+            passthrough=args.passthrough_json,
+            batch_bytes=args.batch_bytes,
+        )
+    else:
+        inserted = insert_in_batches(
+            col,
+            rows=iter_jsonl_rows(
+                path=args.file,
+                pk_field=args.pk_field,
+                json_field=args.json_field,
+                vector_field=args.vector_field,
+                dim=args.dim,
+                pk_start=args.pk_start,
+                rand_dist=args.rand_dist,
+                passthrough=args.passthrough_json,
+            ),
+            batch_size=args.batch_size,
+            max_rows=args.max_rows,
+            progress_every=args.progress_every,
+            json_field=args.json_field,
+            passthrough=args.passthrough_json,
+            batch_bytes=args.batch_bytes,
+        )
     print(f"Inserted total rows: {inserted}")
 
     print("Flushing...")
@@ -1,4 +1,3 @@
-import random
 import time
 import string
 
@@ -7,6 +6,11 @@ from sklearn import preprocessing
 import datetime
 import threading
 
+import numpy as np
+
+from vector_factory import uniform_vectors
+from ground_truth import brute_force_knn, recall_at_k
+
 from pymilvus import (
     connections, list_collections,
     FieldSchema, CollectionSchema, DataType,
@@ -35,7 +39,7 @@ def test_multi_vec(dim, nb):
 
     collection = Collection(name="hello_milvus111", schema=default_schema, shards_num=1)
 
-    vec_data = [[random.random() for _ in range(dim)] for _ in range(nb)]
+    vec_data = uniform_vectors(nb, dim)
 
     index = 0
     while index < 10:
@@ -80,6 +84,17 @@ def test_multi_vec(dim, nb):
     print("collection load done")
 
     i = 0
+    # req1 的 recall 只在进入循环前检查一次, 不影响下面 hybrid search 的耗时
+    # ground truth: pk == 行号, vec_data 被插入了 10 次
+    base = np.tile(vec_data, (10, 1))
+    pks = np.arange(len(base))
+    gt_ids, gt_dist = brute_force_knn(base, vec_data[i:i + 1], 1000, "L2", mask=(pks > 0) & (pks < 10000))
+    del base, pks
+    res1 = collection.search([vec_data[i]], "float_vector1", {"metric_type": "L2"}, limit=1000, expr=" 0<count< 10000")
+    recall = recall_at_k([hits.ids for hits in res1], gt_ids,
+                         result_distances=[hits.distances for hits in res1], gt_distances=gt_dist)
+    print(f"req1 recall@1000: {recall:.4f}")
+
     while i < 1:
         search_param1 = {
             "data": [vec_data[i]],
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""ARRAY-field columns held as a flat values buffer plus row offsets.
+
+Row ``i`` of a ``RaggedColumn`` is ``values[offsets[i]:offsets[i + 1]]``. Lengths,
+element values and planted rows (e.g. the ``all_int64s`` rows that
+``array_contains_all`` must find in ``test-array.py``) are all produced with a
+few numpy calls over the whole column, and the column only turns into one
+Python list per row at the insert boundary (``to_rows()``), so 10M-row ARRAY
+benchmarks are limited by the insert, not by data generation.
+
+    lengths = ragged_lengths(rng, n, "uniform", 1, 128)
+    col = RaggedColumn.from_lengths(lengths, rng.integers(0, 30, lengths.sum()))
+    col = col.plant(np.flatnonzero(pks % 50000 == 0), all_int64s)
+    collection.insert([pks.tolist(), vectors, col.to_rows()])
+"""
+import argparse
+import time
+from typing import Any, List, Sequence
+
+import numpy as np
+
+LENGTH_DISTS = ("uniform", "fixed", "geometric", "zipf")
+
+
+class RaggedColumn:
+    """A list-per-row column: row i is values[offsets[i] - offsets[0]:offsets[i + 1] - offsets[0]]."""
+
+    def __init__(self, values: np.ndarray, offsets: np.ndarray):
+        if len(offsets) == 0 or offsets[-1] - offsets[0] != len(values):
+            raise ValueError(f"offsets do not match {len(values)} values")
+        self.values = values
+        self.offsets = offsets
+
+    @classmethod
+    def from_lengths(cls, lengths: np.ndarray, values: np.ndarray) -> "RaggedColumn":
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(values, offsets)
+
+    @classmethod
+    def concat(cls, parts: Sequence["RaggedColumn"]) -> "RaggedColumn":
+        lengths = np.concatenate([p.lengths for p in parts])
+        return cls.from_lengths(lengths, np.concatenate([p.values for p in parts]))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("RaggedColumn only supports contiguous slices")
+            offsets = self.offsets[start:stop + 1]
+            return RaggedColumn(self.values[offsets[0] - self.offsets[0]:offsets[-1] - self.offsets[0]], offsets)
+        lo, hi = self.offsets[index] - self.offsets[0], self.offsets[index + 1] - self.offsets[0]
+        return self.values[lo:hi].tolist()
+
+    def plant(self, rows: np.ndarray, row_values: Sequence[Any]) -> "RaggedColumn":
+        """A copy where every row in rows is replaced by row_values."""
+        rows = np.asarray(rows, dtype=np.int64)
+        if not len(rows):
+            return self
+        planted = np.zeros(len(self), dtype=bool)
+        planted[rows] = True
+        old_lengths = self.lengths
+        new_lengths = np.where(planted, len(row_values), old_lengths)
+        out = np.empty(int(new_lengths.sum()), dtype=np.result_type(self.values, np.asarray(row_values)))
+        # rows keep their order, so the untouched elements map over in one masked copy
+        keep_new = np.repeat(~planted, new_lengths)
+        out[keep_new] = self.values[np.repeat(~planted, old_lengths)]
+        out[~keep_new] = np.tile(np.asarray(row_values, dtype=out.dtype), int(planted.sum()))
+        return RaggedColumn.from_lengths(new_lengths, out)
+
+    def to_rows(self) -> List[list]:
+        """One Python list per row, the form pymilvus takes for an ARRAY field."""
+        flat = self.values.tolist()
+        bounds = (self.offsets - self.offsets[0]).tolist()
+        return [flat[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+    def to_column(self) -> List[list]:
+        return self.to_rows()
+
+
+def ragged_lengths(
+    rng: np.random.Generator,
+    n: int,
+    dist: str = "uniform",
+    min_len: int = 0,
+    max_len: int = 10,
+    mean: float = None,
+    a: float = 1.5,
+) -> np.ndarray:
+    """n row lengths in [min_len, max_len].
+
+    uniform: every length equally likely; fixed: always max_len; geometric: mean
+    length ``mean`` (default halfway); zipf: P(len - min_len + 1) ~ (len - min_len + 1) ** -a.
+    """
+    if dist == "uniform":
+        lengths = rng.integers(min_len, max_len, n, endpoint=True)
+    elif dist == "fixed":
+        lengths = np.full(n, max_len)
+    elif dist == "geometric":
+        extra = (mean if mean is not None else (min_len + max_len) / 2) - min_len
+        lengths = min_len + rng.geometric(1.0 / (extra + 1), n) - 1
+    elif dist == "zipf":
+        span = max_len - min_len + 1
+        p = 1.0 / np.arange(1, span + 1, dtype=np.float64) ** a
+        lengths = min_len + rng.choice(span, n, p=p / p.sum())
+    else:
+        raise ValueError(f"Unsupported length dist: {dist!r}, expected one of {LENGTH_DISTS}")
+    return np.clip(lengths, min_len, max_len).astype(np.int64)
+
+
+def random_ragged(
+    rng: np.random.Generator,
+    lengths: np.ndarray,
+    low: int,
+    high: int,
+    dtype: Any = np.int64,
+) -> RaggedColumn:
+    """Elements uniform in [low, high), as dtype (int, float, bool or str)."""
+    values = rng.integers(low, high, int(lengths.sum()))
+    if dtype is str:
+        values = values.astype(str)
+    else:
+        values = values.astype(dtype)
+    return RaggedColumn.from_lengths(lengths, values)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time ragged ARRAY column generation")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--max-len", type=int, default=128)
+    parser.add_argument("--dist", choices=LENGTH_DISTS, default="uniform")
+    parser.add_argument("--rows-format", action="store_true", help="Also convert to per-row lists")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    lengths = ragged_lengths(rng, args.rows, args.dist, 1, args.max_len)
+    col = random_ragged(rng, lengths, 0, 30)
+    col = col.plant(np.arange(0, args.rows, 50000), [1, 2, 3, 4, 5])
+    if args.rows_format:
+        col.to_rows()
+    elapsed = time.perf_counter() - start
+    print(f"{args.rows} rows, {len(col.values)} elements in {elapsed:.2f}s ({args.rows / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Token-bucket pacing of insert / upsert / delete loops at exact rows/s and bytes/s.
+
+Background writers in the mixed read/write tests either sleep a random time
+between batches or write flat out, so the write load behind a query latency
+measurement differs from run to run. ``Pacer`` holds a writer to a fixed rate:
+before each operation the loop calls ``pacer.wait(rows, nbytes)``, which blocks
+until both the rows/s and the bytes/s budgets allow that batch.
+
+Each budget is a token bucket (implemented as GCRA: a theoretical arrival time
+per bucket instead of a token count) that refills continuously at its rate and
+holds at most ``burst_s`` seconds of credit, so short stalls are caught up but
+an idle writer does not build a burst. Several threads may share one pacer; the
+combined rate is then the target. ``summary()`` reports the achieved rate next
+to the target, and with ``log_every`` the achieved rate of the last interval is
+logged as the loop runs:
+
+    pacer = Pacer(rows_per_s=5000, log_every=10, log=logger.info)
+    while running:
+        batch = make_batch(1000)
+        pacer.wait(len(batch), nbytes)
+        client.upsert(collection_name=name, data=batch)
+    pacer.log_summary()
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class Pacer:
+    def __init__(
+        self,
+        rows_per_s: Optional[float] = None,
+        bytes_per_s: Optional[float] = None,
+        burst_s: float = 1.0,
+        log_every: float = 0,
+        log: Callable[[str], Any] = print,
+        name: str = "pacer",
+    ):
+        for label, rate in (("rows_per_s", rows_per_s), ("bytes_per_s", bytes_per_s)):
+            if rate is not None and rate <= 0:
+                raise ValueError(f"{label} must be > 0, got {rate}")
+        self.rows_per_s = rows_per_s
+        self.bytes_per_s = bytes_per_s
+        self.burst_s = burst_s
+        self.log_every = log_every
+        self.log = log
+        self.name = name
+        self._lock = threading.Lock()
+        self._started: Optional[float] = None
+        # theoretical arrival time of each bucket
+        self._tat_rows = 0.0
+        self._tat_bytes = 0.0
+        self.ops = 0
+        self.rows = 0
+        self.nbytes = 0
+        self.slept = 0.0
+        self._last_report = (0.0, 0, 0)
+
+    def wait(self, rows: int, nbytes: int = 0) -> float:
+        """Block until rows (and nbytes) may be sent at the target rates; returns the seconds slept."""
+        now = time.monotonic()
+        with self._lock:
+            if self._started is None:
+                # start with an empty bucket: the first batch goes at once, the rest at the rate
+                self._started = now
+                self._tat_rows = self._tat_bytes = now + self.burst_s
+                self._last_report = (now, 0, 0)
+            release = now
+            if self.rows_per_s:
+                release = max(release, self._tat_rows - self.burst_s)
+            if self.bytes_per_s:
+                release = max(release, self._tat_bytes - self.burst_s)
+            if self.rows_per_s:
+                self._tat_rows = max(self._tat_rows, release) + rows / self.rows_per_s
+            if self.bytes_per_s:
+                self._tat_bytes = max(self._tat_bytes, release) + nbytes / self.bytes_per_s
+            self.ops += 1
+            self.rows += rows
+            self.nbytes += nbytes
+        delay = release - now
+        if delay > 0:
+            time.sleep(delay)
+            with self._lock:
+                self.slept += delay
+        if self.log_every:
+            self._maybe_report()
+        return max(delay, 0.0)
+
+    def _maybe_report(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            last_time, last_rows, last_bytes = self._last_report
+            if now - last_time < self.log_every:
+                return
+            self._last_report = (now, self.rows, self.nbytes)
+            rows, nbytes = self.rows - last_rows, self.nbytes - last_bytes
+        elapsed = now - last_time
+        self.log(f"[{self.name}] {rows / elapsed:,.0f} rows/s ({self._target('rows_per_s')}), "
+                 f"{nbytes / elapsed / 1e6:.2f} MB/s ({self._target('bytes_per_s', 1e6)})")
+
+    def _target(self, attr: str, scale: float = 1.0) -> str:
+        rate = getattr(self, attr)
+        return f"target {rate / scale:,.2f}" if rate else "no target"
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = time.monotonic() - self._started if self._started is not None else 0.0
+            return {
+                "target_rows_per_s": self.rows_per_s,
+                "target_bytes_per_s": self.bytes_per_s,
+                "elapsed_s": round(elapsed, 3),
+                "ops": self.ops,
+                "rows": self.rows,
+                "bytes": self.nbytes,
+                "achieved_rows_per_s": round(self.rows / elapsed, 1) if elapsed > 0 else 0.0,
+                "achieved_bytes_per_s": round(self.nbytes / elapsed, 1) if elapsed > 0 else 0.0,
+                # seconds spent waiting on the pacer per second, summed over the threads sharing it;
+                # near 0 means the writers could not reach the target
+                "wait_s_per_s": round(self.slept / elapsed, 3) if elapsed > 0 else 0.0,
+            }
+
+    def log_summary(self) -> Dict[str, Any]:
+        s = self.summary()
+        self.log(f"[{self.name}] {s['ops']} ops, {s['rows']} rows in {s['elapsed_s']}s: "
+                 f"{s['achieved_rows_per_s']:,.1f} rows/s ({self._target('rows_per_s')}), "
+                 f"{s['achieved_bytes_per_s'] / 1e6:.2f} MB/s ({self._target('bytes_per_s', 1e6)}), "
+                 f"waited {s['wait_s_per_s']:.2f}s per second")
+        return s
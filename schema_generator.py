@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""Schema-driven entity generator.
+
+Instead of hand-writing parallel list comprehensions for every ``FieldSchema``
+of a test collection, hand the schema (an ORM ``CollectionSchema`` or the
+result of ``MilvusClient.create_schema``) to ``SchemaGenerator`` together with
+optional per-field distribution specs, and stream ``ColumnBatch`` objects for
+any number of rows:
+
+    gen = SchemaGenerator(schema, {"int8": {"dist": "zipf", "a": 1.2},
+                                   "partition": {"cardinality": 100, "null_ratio": 0.1}})
+    for batch in gen.iter_batches(10_000_000, 10000):
+        client.insert(collection_name=name, data=batch.to_rows())
+
+Every column of a batch is produced by one vectorized numpy call. Batches are
+seeded from ``SeedSequence(seed, spawn_key=(field_index, start))``, so any
+batch can be regenerated on its own (e.g. in a worker process) and adding a
+field does not change the values of the others. The data is reproducible for
+a given seed and batch size.
+
+Spec keys (all optional):
+
+* ``null_ratio``   share of None values (nullable fields or fields with a default)
+* ``dist``         ``uniform`` (default), ``normal``, ``zipf``, ``heavy_hitter``, ``long_tail``,
+                   ``sequence`` or ``choice`` (see ``skewed_values``)
+* ``low``/``high`` value range of uniform numbers (inclusive for integers)
+* ``mean``/``std`` normal numbers
+* ``n_hot``/``hot_mass``  hot values and their share of rows for ``heavy_hitter`` / ``long_tail``
+* ``a``/``cardinality``  Zipf exponent and number of distinct values (strings
+  come from a per-field pool of ``cardinality`` values, ``None`` draws fresh ones)
+* ``values``       explicit value list for ``choice`` (weights in ``p``)
+* ``p``            probability of True for BOOL
+* ``length``       ``(min, max)`` string length or ARRAY length
+* ``element``      spec of the ARRAY elements
+* ``vector_dist``  FLOAT_VECTOR distribution, see ``vector_factory.DISTRIBUTIONS``
+* ``nnz``/``dim``  mean term draws per row and vocabulary size of SPARSE_FLOAT_VECTOR
+  (also ``nnz_dist``, ``term_skew`` and ``weight``, see ``sparse_vectors``)
+* ``data_type``/``encode``  JSON template of ``EnhancedJSONGenerator`` and whether to pre-encode it
+* ``fn``           ``fn(rng, start, count)`` returning the whole column, for anything else
+"""
+import argparse
+import string
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+from pymilvus import DataType
+
+from column_batches import ColumnBatch, iter_column_batches
+from skewed_values import ValueDistribution
+from sparse_vectors import SparseVectorGenerator
+from vector_factory import make_vectors
+
+INT_RANGES = {
+    DataType.INT8: (-(1 << 7), (1 << 7) - 1),
+    DataType.INT16: (-(1 << 15), (1 << 15) - 1),
+    DataType.INT32: (-(1 << 31), (1 << 31) - 1),
+    DataType.INT64: (-(1 << 63), (1 << 63) - 1),
+}
+INT_DTYPES = {
+    DataType.INT8: np.int8,
+    DataType.INT16: np.int16,
+    DataType.INT32: np.int32,
+    DataType.INT64: np.int64,
+}
+FLOAT_DTYPES = {DataType.FLOAT: np.float32, DataType.DOUBLE: np.float64}
+STRING_TYPES = (DataType.VARCHAR, DataType.STRING, DataType.TEXT)
+VECTOR_TYPES = (
+    DataType.FLOAT_VECTOR,
+    DataType.FLOAT16_VECTOR,
+    DataType.BFLOAT16_VECTOR,
+    DataType.BINARY_VECTOR,
+    DataType.INT8_VECTOR,
+    DataType.SPARSE_FLOAT_VECTOR,
+)
+
+# default ranges that look like the values the test scripts insert by hand
+DEFAULT_INT_RANGE = (0, 10000)
+DEFAULT_FLOAT_RANGE = (0.0, 1000.0)
+DEFAULT_STRING_LENGTH = (5, 20)
+DEFAULT_STRING_CARDINALITY = 10000
+DEFAULT_ARRAY_LENGTH = (0, 10)
+DEFAULT_SPARSE_NNZ = 32
+DEFAULT_SPARSE_DIM = 30000
+
+SKEWED_DISTS = ("heavy_hitter", "long_tail")
+
+Column = Any
+
+# spawn key of the per-field string pools, batches use their start row
+_POOL_KEY = 1 << 63
+
+
+def _field_params(field) -> Dict[str, Any]:
+    params = getattr(field, "params", None) or {}
+    return {k: (int(v) if isinstance(v, str) and v.isdigit() else v) for k, v in params.items()}
+
+
+def zipf_ranks(rng: np.random.Generator, n: int, cardinality: int, a: float) -> np.ndarray:
+    """n ranks in [0, cardinality) with P(rank) proportional to (rank + 1) ** -a."""
+    weights = 1.0 / np.arange(1, cardinality + 1, dtype=np.float64) ** a
+    cdf = np.cumsum(weights / weights.sum())
+    cdf[-1] = 1.0
+    return np.searchsorted(cdf, rng.random(n), side="right")
+
+
+def skewed_ranks(rng: np.random.Generator, spec: Dict[str, Any], n: int, cardinality: int) -> np.ndarray:
+    """n value ranks from the heavy_hitter / long_tail distribution described by spec."""
+    dist = ValueDistribution(spec["dist"], cardinality, spec.get("a", 1.1), spec.get("n_hot", 10),
+                             spec.get("hot_mass", 0.9))
+    return dist.sample(rng, n)
+
+
+def random_strings(rng: np.random.Generator, n: int, min_len: int, max_len: int,
+                   charset: str = string.ascii_letters) -> List[str]:
+    """n random strings with lengths uniform in [min_len, max_len]."""
+    max_len = max(max_len, 1)
+    table = np.frombuffer(charset.encode("ascii"), dtype=np.uint8)
+    codes = table[rng.integers(0, len(table), (n, max_len))]
+    raw = codes.view(f"S{max_len}").ravel().tolist()
+    if min_len >= max_len:
+        return [s.decode("ascii") for s in raw]
+    lengths = rng.integers(min_len, max_len + 1, n).tolist()
+    return [s[:l].decode("ascii") for s, l in zip(raw, lengths)]
+
+
+class SchemaGenerator:
+    def __init__(self, schema, specs: Optional[Dict[str, Dict[str, Any]]] = None, seed: int = 0):
+        self.schema = schema
+        self.specs = specs or {}
+        self.seed = seed
+        self.pk_field = None
+        self.fields = []
+        for field in schema.fields:
+            if field.is_primary:
+                self.pk_field = field
+                if field.auto_id:
+                    continue
+            if getattr(field, "is_function_output", False):
+                continue
+            self.fields.append(field)
+        unknown = set(self.specs) - {f.name for f in schema.fields}
+        if unknown:
+            raise ValueError(f"specs for unknown fields: {sorted(unknown)}")
+        if self.pk_field is None:
+            raise ValueError("schema has no primary key field")
+        self._pools: Dict[str, List[str]] = {}
+        self._sparse: Dict[str, SparseVectorGenerator] = {}
+
+    def _rng(self, index: int, start: int) -> np.random.Generator:
+        return np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(index, start)))
+
+    # -- scalar columns --------------------------------------------------
+
+    def _ints(self, rng, dtype, spec, n, start) -> np.ndarray:
+        lo_limit, hi_limit = INT_RANGES[dtype]
+        dist = spec.get("dist", "uniform")
+        if dist == "sequence":
+            values = start + np.arange(n, dtype=np.int64) + spec.get("low", 0)
+        elif dist == "choice":
+            values = rng.choice(np.asarray(spec["values"], dtype=np.int64), n, p=spec.get("p"))
+        elif dist == "zipf":
+            values = zipf_ranks(rng, n, spec.get("cardinality", 1000), spec.get("a", 1.1)) + spec.get("low", 0)
+        elif dist in SKEWED_DISTS:
+            values = skewed_ranks(rng, spec, n, spec.get("cardinality", 1000)) + spec.get("low", 0)
+        elif dist == "normal":
+            values = np.rint(rng.normal(spec.get("mean", 0.0), spec.get("std", 1.0), n))
+        elif dist == "uniform":
+            low, high = spec.get("low", DEFAULT_INT_RANGE[0]), spec.get("high", DEFAULT_INT_RANGE[1])
+            values = rng.integers(max(low, lo_limit), min(high, hi_limit), n, endpoint=True)
+        else:
+            raise ValueError(f"Unsupported int dist: {dist!r}")
+        return np.clip(values, lo_limit, hi_limit).astype(INT_DTYPES[dtype])
+
+    def _floats(self, rng, dtype, spec, n) -> np.ndarray:
+        dist = spec.get("dist", "uniform")
+        if dist == "uniform":
+            values = rng.uniform(spec.get("low", DEFAULT_FLOAT_RANGE[0]), spec.get("high", DEFAULT_FLOAT_RANGE[1]), n)
+        elif dist == "normal":
+            values = rng.normal(spec.get("mean", 0.0), spec.get("std", 1.0), n)
+        elif dist == "choice":
+            values = rng.choice(np.asarray(spec["values"], dtype=np.float64), n, p=spec.get("p"))
+        elif dist == "zipf":
+            values = zipf_ranks(rng, n, spec.get("cardinality", 1000), spec.get("a", 1.1)).astype(np.float64)
+        else:
+            raise ValueError(f"Unsupported float dist: {dist!r}")
+        if "decimals" in spec:
+            values = np.round(values, spec["decimals"])
+        return values.astype(FLOAT_DTYPES[dtype])
+
+    def _string_pool(self, field, spec, max_length: int) -> List[str]:
+        if field.name not in self._pools:
+            min_len, max_len = spec.get("length", DEFAULT_STRING_LENGTH)
+            max_len = min(max_len, max_length)
+            cardinality = spec.get("cardinality", DEFAULT_STRING_CARDINALITY)
+            index = [f.name for f in self.schema.fields].index(field.name)
+            rng = self._rng(index, _POOL_KEY)
+            self._pools[field.name] = random_strings(rng, cardinality, min(min_len, max_len), max_len)
+        return self._pools[field.name]
+
+    def _strings(self, rng, field, spec, n, start) -> List[str]:
+        max_length = _field_params(field).get("max_length", 65535)
+        dist = spec.get("dist", "uniform")
+        if dist == "sequence":
+            prefix = spec.get("prefix", "")
+            return [f"{prefix}{i}" for i in range(start, start + n)]
+        if dist == "choice":
+            values = np.asarray(spec["values"], dtype=object)
+            return values[rng.choice(len(values), n, p=spec.get("p"))].tolist()
+        if dist == "uniform" and spec.get("cardinality", DEFAULT_STRING_CARDINALITY) is None:
+            # cardinality None: every value is drawn fresh instead of from a pool
+            min_len, max_len = spec.get("length", DEFAULT_STRING_LENGTH)
+            return random_strings(rng, n, min_len, min(max_len, max_length))
+        pool = np.asarray(self._string_pool(field, spec, max_length), dtype=object)
+        if dist == "zipf":
+            return pool[zipf_ranks(rng, n, len(pool), spec.get("a", 1.1))].tolist()
+        if dist in SKEWED_DISTS:
+            return pool[skewed_ranks(rng, spec, n, len(pool))].tolist()
+        if dist == "uniform":
+            return pool[rng.integers(0, len(pool), n)].tolist()
+        raise ValueError(f"Unsupported string dist: {dist!r}")
+
+    def _scalar(self, rng, field, dtype, spec, n, start) -> Column:
+        if dtype == DataType.BOOL:
+            return rng.random(n) < spec.get("p", 0.5)
+        if dtype in INT_DTYPES:
+            return self._ints(rng, dtype, spec, n, start)
+        if dtype in FLOAT_DTYPES:
+            return self._floats(rng, dtype, spec, n)
+        if dtype in STRING_TYPES:
+            return self._strings(rng, field, spec, n, start)
+        raise ValueError(f"Unsupported scalar type for {field.name!r}: {dtype!r}")
+
+    def _array(self, rng, field, spec, n, start) -> List[list]:
+        params = _field_params(field)
+        capacity = params.get("max_capacity", DEFAULT_ARRAY_LENGTH[1])
+        min_len, max_len = spec.get("length", (DEFAULT_ARRAY_LENGTH[0], min(DEFAULT_ARRAY_LENGTH[1], capacity)))
+        lengths = rng.integers(min_len, min(max_len, capacity), n, endpoint=True)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        flat = self._scalar(rng, field, field.element_type, spec.get("element", {}), int(offsets[-1]), 0)
+        if isinstance(flat, np.ndarray):
+            flat = flat.tolist()
+        bounds = offsets.tolist()
+        return [flat[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+    def _json(self, rng, spec, n, start) -> List[Any]:
+        from enhanced_json_generator import EnhancedJSONGenerator
+
+        if not hasattr(self, "_json_generator"):
+            self._json_generator = EnhancedJSONGenerator()
+        return self._json_generator.generate_batch_columnar(
+            n, spec.get("data_type", "mixed"), start_id=start, seed=rng, encode=spec.get("encode", False)
+        )
+
+    # -- vector columns --------------------------------------------------
+
+    def _vectors(self, rng, field, dtype, spec, n) -> Column:
+        params = _field_params(field)
+        if dtype == DataType.SPARSE_FLOAT_VECTOR:
+            if field.name not in self._sparse:
+                self._sparse[field.name] = SparseVectorGenerator(
+                    spec.get("dim", DEFAULT_SPARSE_DIM), spec.get("nnz", DEFAULT_SPARSE_NNZ),
+                    spec.get("nnz_dist", "lognormal"), term_skew=spec.get("term_skew", 1.0),
+                    weight=spec.get("weight", "bm25"), seed=self.seed,
+                )
+            return self._sparse[field.name].sample(rng, n)
+        dim = params["dim"]
+        if dtype == DataType.BINARY_VECTOR:
+            block = rng.integers(0, 256, (n, dim // 8), dtype=np.uint8)
+            return [row.tobytes() for row in block]
+        if dtype == DataType.INT8_VECTOR:
+            return rng.integers(-128, 128, (n, dim), dtype=np.int8)
+        kw = {k: v for k, v in spec.items() if k not in ("vector_dist", "null_ratio")}
+        block = make_vectors(n, dim, spec.get("vector_dist", "uniform"), rng, **kw)
+        if dtype == DataType.FLOAT16_VECTOR:
+            return block.astype(np.float16)
+        if dtype == DataType.BFLOAT16_VECTOR:
+            # bfloat16 is the upper half of a float32
+            halves = (block.view(np.uint32) >> 16).astype(np.uint16)
+            return [row.tobytes() for row in halves]
+        return block
+
+    # -- batches ---------------------------------------------------------
+
+    def column(self, field, index: int, start: int, count: int) -> Column:
+        """The values of one field for rows [start, start + count)."""
+        default = {"dist": "sequence"} if field is self.pk_field else {}
+        spec = self.specs.get(field.name, default)
+        rng = self._rng(index, start)
+        dtype = field.dtype
+        if "fn" in spec:
+            col = spec["fn"](rng, start, count)
+        elif dtype in VECTOR_TYPES:
+            col = self._vectors(rng, field, dtype, spec, count)
+        elif dtype == DataType.JSON:
+            col = self._json(rng, spec, count, start)
+        elif dtype == DataType.ARRAY:
+            col = self._array(rng, field, spec, count, start)
+        else:
+            col = self._scalar(rng, field, dtype, spec, count, start)
+
+        null_ratio = spec.get("null_ratio", 0.0)
+        if null_ratio:
+            if not (field.nullable or getattr(field, "default_value", None) is not None):
+                raise ValueError(f"null_ratio given for {field.name!r}, which is neither nullable nor has a default")
+            col = col.tolist() if isinstance(col, np.ndarray) and col.ndim == 1 else list(col)
+            for i in np.flatnonzero(rng.random(count) < null_ratio).tolist():
+                col[i] = None
+        return col
+
+    def batch(self, start: int, count: int) -> ColumnBatch:
+        """Rows [start, start + count) of the collection as one ColumnBatch."""
+        pk = self.pk_field
+        out = ColumnBatch(
+            pks=np.arange(start, start + count, dtype=np.int64),
+            pk_field=None if pk.auto_id else pk.name,
+        )
+        generated = {f.name for f in self.fields}
+        for index, field in enumerate(self.schema.fields):
+            if field.name not in generated:
+                continue
+            if field is pk:
+                if pk.dtype in STRING_TYPES or field.name in self.specs:
+                    out.pks = self.column(field, index, start, count)
+                continue
+            col = self.column(field, index, start, count)
+            if field.dtype in VECTOR_TYPES:
+                out.vectors[field.name] = col
+            elif field.dtype == DataType.JSON:
+                out.json[field.name] = col
+            else:
+                out.scalars[field.name] = col
+        return out
+
+    def iter_batches(self, total: int, batch_size: int, start: int = 0) -> Iterator[ColumnBatch]:
+        return iter_column_batches(total, batch_size, self.batch, start=start)
+
+
+def main() -> None:
+    from pymilvus import CollectionSchema, FieldSchema
+
+    parser = argparse.ArgumentParser(description="Time SchemaGenerator on a schema covering every supported type")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--dim", type=int, default=128)
+    args = parser.parse_args()
+
+    fields = [
+        FieldSchema(name="pk", dtype=DataType.INT64, is_primary=True),
+        FieldSchema(name="int8", dtype=DataType.INT8),
+        FieldSchema(name="int16", dtype=DataType.INT16),
+        FieldSchema(name="int32", dtype=DataType.INT32),
+        FieldSchema(name="int64", dtype=DataType.INT64, nullable=True),
+        FieldSchema(name="float", dtype=DataType.FLOAT),
+        FieldSchema(name="double", dtype=DataType.DOUBLE),
+        FieldSchema(name="bool", dtype=DataType.BOOL),
+        FieldSchema(name="varchar", dtype=DataType.VARCHAR, max_length=200),
+        FieldSchema(name="json", dtype=DataType.JSON),
+        FieldSchema(name="array", dtype=DataType.ARRAY, element_type=DataType.INT64, max_capacity=50),
+        FieldSchema(name="embeddings", dtype=DataType.FLOAT_VECTOR, dim=args.dim),
+        FieldSchema(name="fp16", dtype=DataType.FLOAT16_VECTOR, dim=args.dim),
+        FieldSchema(name="binary", dtype=DataType.BINARY_VECTOR, dim=args.dim),
+        FieldSchema(name="sparse", dtype=DataType.SPARSE_FLOAT_VECTOR),
+    ]
+    schema = CollectionSchema(fields)
+    gen = SchemaGenerator(schema, {"int64": {"null_ratio": 0.1}, "varchar": {"dist": "zipf", "a": 1.2}})
+    start = time.perf_counter()
+    for batch in gen.iter_batches(args.rows, args.batch):
+        batch.to_rows()
+    elapsed = time.perf_counter() - start
+    print(f"{args.rows} rows x {len(fields)} fields in {elapsed:.2f}s ({args.rows / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Deterministic multi-process sharded data generation.
+
+N rows are cut into fixed-size shards and shard ``i`` is generated from child
+``i`` of ``SeedSequence(seed).spawn(n_shards)``. The shard layout only depends
+on ``(n_rows, shard_rows)``, so the concatenated output is bit-identical for
+any worker count (including ``workers=1``, which runs in-process).
+
+A shard function has the signature ``fn(rng, start, count)`` and returns the
+rows ``[start, start + count)`` as a list, a numpy array, or a dict of columns.
+Before each shard the global ``random`` and legacy ``numpy.random`` states are
+also reseeded from the shard seed, so the existing generators that rely on the
+global state (``random_json.random_json``, ``random_json.get_json``, ...) can be
+sharded unchanged.
+
+    python sharded_generator.py --kind random_json --rows 1000000 --workers 8 --out data.jsonl
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+import random_json
+from ragged_arrays import RaggedColumn, ragged_lengths
+
+DEFAULT_SHARD_ROWS = 100000
+
+ShardFn = Callable[[np.random.Generator, int, int], Any]
+
+
+def shard_plan(n_rows: int, shard_rows: int = DEFAULT_SHARD_ROWS, row_offset: int = 0) -> List[Tuple[int, int, int]]:
+    """Split n_rows into (shard_index, start, count) triples of shard_rows each."""
+    if shard_rows <= 0:
+        raise ValueError("shard_rows must be positive")
+    return [
+        (i, row_offset + start, min(shard_rows, n_rows - start))
+        for i, start in enumerate(range(0, n_rows, shard_rows))
+    ]
+
+
+def _seed_globals(seed_seq: np.random.SeedSequence) -> np.random.Generator:
+    state = seed_seq.generate_state(4, dtype=np.uint32)
+    random.seed(int.from_bytes(state.tobytes(), "little"))
+    np.random.seed(int(state[0]))
+    return np.random.default_rng(seed_seq)
+
+
+def _run_shard(fn: ShardFn, start: int, count: int, seed_seq: np.random.SeedSequence) -> Any:
+    return fn(_seed_globals(seed_seq), start, count)
+
+
+def _pool_context(mp_context: Optional[str]):
+    # Most scripts here run their benchmark at import time without a
+    # `__main__` guard, so prefer fork where it exists: spawn/forkserver would
+    # re-import the caller in every worker.
+    if mp_context is None and "fork" in multiprocessing.get_all_start_methods():
+        mp_context = "fork"
+    return multiprocessing.get_context(mp_context)
+
+
+def iter_sharded(
+    fn: ShardFn,
+    n_rows: int,
+    seed: Any = 0,
+    workers: Optional[int] = None,
+    shard_rows: int = DEFAULT_SHARD_ROWS,
+    mp_context: Optional[str] = None,
+    row_offset: int = 0,
+) -> Iterator[Any]:
+    """Yield shard outputs in shard order. fn must be picklable (module level or partial).
+
+    seed is anything SeedSequence accepts, e.g. an int or a tuple like (19530, batch_idx).
+    row_offset shifts the `start` handed to fn (e.g. a pk offset) without changing the seeds.
+    """
+    plan = shard_plan(n_rows, shard_rows, row_offset)
+    seeds = np.random.SeedSequence(seed).spawn(len(plan))
+    starts = [start for _, start, _ in plan]
+    counts = [count for _, _, count in plan]
+    workers = min(workers or os.cpu_count() or 1, max(len(plan), 1))
+
+    if workers <= 1:
+        saved_random, saved_np = random.getstate(), np.random.get_state()
+        try:
+            for start, count, seed_seq in zip(starts, counts, seeds):
+                yield _run_shard(fn, start, count, seed_seq)
+        finally:
+            random.setstate(saved_random)
+            np.random.set_state(saved_np)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context(mp_context)) as pool:
+        # map() keeps submission order, so the output order is the shard order.
+        yield from pool.map(partial(_run_shard, fn), starts, counts, seeds)
+
+
+def concat_shards(parts: List[Any]) -> Any:
+    """Concatenate shard outputs: lists are chained, arrays and ragged columns stacked, dicts merged per column."""
+    if not parts:
+        return []
+    first = parts[0]
+    if isinstance(first, np.ndarray):
+        return np.concatenate(parts)
+    if isinstance(first, dict):
+        return {key: concat_shards([p[key] for p in parts]) for key in first}
+    if isinstance(first, RaggedColumn):
+        return RaggedColumn.concat(parts)
+    out = []
+    for part in parts:
+        out.extend(part)
+    return out
+
+
+def generate_sharded(
+    fn: ShardFn,
+    n_rows: int,
+    seed: Any = 0,
+    workers: Optional[int] = None,
+    shard_rows: int = DEFAULT_SHARD_ROWS,
+    mp_context: Optional[str] = None,
+    row_offset: int = 0,
+) -> Any:
+    """Generate n_rows with fn across a process pool and return the concatenated output."""
+    return concat_shards(list(iter_sharded(fn, n_rows, seed, workers, shard_rows, mp_context, row_offset)))
+
+
+# ---------------- built-in shard functions ----------------
+
+def random_json_shard(rng: np.random.Generator, start: int, count: int, depth: int = 0, max_keys: int = 5) -> List[dict]:
+    """random_json.random_json rows (also what json/random_json.py generates)."""
+    return [random_json.random_json(depth, max_keys) for _ in range(count)]
+
+
+def key_json_shard(rng: np.random.Generator, start: int, count: int, keys_num: int = 100) -> List[dict]:
+    """random_json.get_json rows, the key_{i}x documents of test-reorder.py / test-in-multi-and.py."""
+    return [random_json.get_json(keys_num) for _ in range(count)]
+
+
+def fixed_schema_json_shard(rng: np.random.Generator, start: int, count: int, num_keys: int = 10) -> List[dict]:
+    return [random_json.generate_random_json(num_keys) for _ in range(count)]
+
+
+def array_entities_shard(
+    rng: np.random.Generator,
+    start: int,
+    count: int,
+    sample: int,
+    total: int,
+    all_int64s: List[int],
+    all_varchars: List[str],
+    dim: int = 8,
+    length_dist: str = "uniform",
+    max_len: int = 128,
+) -> dict:
+    """Columns of test-array.py generate_entities for pks [start, start + count).
+
+    The ARRAY columns are RaggedColumns built from flat buffers: every row has
+    1..max_len elements (per length_dist) drawn from [0, total) % sample, pks
+    that are multiples of 50000 (but not 100000) get int64_array == all_int64s
+    and bool_array == [True], multiples of 100000 get bool_array == [False, True].
+    """
+    pks = np.arange(start, start + count, dtype=np.int64)
+    lengths = ragged_lengths(rng, count, length_dist, 1, max_len)
+    n_values = int(lengths.sum())
+    int64s = RaggedColumn.from_lengths(lengths, rng.integers(0, total, n_values) % sample)
+    floats = RaggedColumn.from_lengths(lengths, (rng.integers(0, total, n_values) % sample).astype(np.float32))
+    varchars = RaggedColumn.from_lengths(lengths, (rng.integers(0, total, n_values) % sample).astype(str))
+    bools = RaggedColumn.from_lengths(np.ones(count, dtype=np.int64), np.zeros(count, dtype=bool))
+
+    every_100k = np.flatnonzero(pks % 100000 == 0)
+    every_50k = np.flatnonzero((pks % 50000 == 0) & (pks % 100000 != 0))
+    int64s = int64s.plant(every_50k, all_int64s)
+    bools = bools.plant(every_100k, [False, True]).plant(every_50k, [True])
+    return {
+        "pk": pks,
+        "embeddings": rng.random((count, dim)),
+        "int64_array": int64s,
+        "bool_array": bools,
+        "float_array": floats,
+        "varchar_array": varchars,
+    }
+
+
+SHARD_KINDS = {
+    "random_json": random_json_shard,
+    "key_json": key_json_shard,
+    "fixed_schema_json": fixed_schema_json_shard,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Deterministic sharded JSONL generation")
+    parser.add_argument("--kind", choices=sorted(SHARD_KINDS), default="random_json")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="Process count (default: all cores)")
+    parser.add_argument("--shard-rows", type=int, default=DEFAULT_SHARD_ROWS)
+    parser.add_argument("--out", default=None, help="Output JSONL path (default: only print the digest)")
+    args = parser.parse_args()
+
+    digest = hashlib.sha256()
+    start_time = time.perf_counter()
+    out = open(args.out, "w", encoding="utf-8") if args.out else None
+    try:
+        for part in iter_sharded(SHARD_KINDS[args.kind], args.rows, args.seed, args.workers, args.shard_rows):
+            chunk = "".join(json.dumps(doc) + "\n" for doc in part)
+            digest.update(chunk.encode("utf-8"))
+            if out:
+                out.write(chunk)
+    finally:
+        if out:
+            out.close()
+    elapsed = time.perf_counter() - start_time
+    print(f"Generated {args.rows} rows in {elapsed:.2f}s ({args.rows / elapsed:,.0f} rows/s)")
+    print(f"sha256: {digest.hexdigest()}")
+
+
+if __name__ == "__main__":
+    main()
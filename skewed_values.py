@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Skewed scalar value distributions and predicate selectivity.
+
+The BITMAP / INVERTED comparisons insert uniform values (``"xxx" + str(i % 100)``),
+but real attributes are skewed and the selectivity of a predicate decides which
+scalar index wins. ``ValueDistribution`` draws value *ranks* (0 is the most
+frequent value) from one of:
+
+* ``uniform``       every one of ``cardinality`` values equally likely
+* ``zipf``          P(rank) proportional to (rank + 1) ** -a
+* ``heavy_hitter``  ``n_hot`` values share ``hot_mass`` of the rows, the rest is uniform
+* ``long_tail``     a Zipf(a) head of ``n_hot`` values holding ``hot_mass``, and a flat
+                    tail over the remaining ``cardinality - n_hot`` values
+
+``heavy_hitter`` and ``long_tail`` reject parameters whose hot values would be
+rarer than a tail value (``hot_mass < n_hot / cardinality``, or for
+``long_tail`` a last head value below the tail), so rank 0 is always the hottest.
+
+and maps them to INT64 / VARCHAR / BOOL columns. Because the distribution is
+known, ``expected_selectivity`` gives the exact share of rows matching an ``==``
+or ``in`` predicate, and ``realised_selectivity`` measures it on the inserted
+columns:
+
+    dist = ValueDistribution("zipf", cardinality=1000, a=1.2)
+    int2 = dist.as_int(dist.sample(rng, 3000))
+    print_selectivity_report({"int2": int2}, {"int2 in [0, 1]": lambda c: numpy.isin(c["int2"], [0, 1])})
+
+``python skewed_values.py`` prints the selectivity of the hottest, median and
+coldest value over a grid of cardinality and skew (Zipf exponent and / or hot
+mass, depending on the kind), to pick the configurations
+worth running against both indexes.
+"""
+import argparse
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+KINDS = ("uniform", "zipf", "heavy_hitter", "long_tail")
+
+Predicate = Callable[[Dict[str, np.ndarray]], np.ndarray]
+
+
+class ValueDistribution:
+    def __init__(
+        self,
+        kind: str = "zipf",
+        cardinality: int = 1000,
+        a: float = 1.1,
+        n_hot: int = 10,
+        hot_mass: float = 0.9,
+        shuffle_seed: Optional[int] = None,
+    ):
+        if kind not in KINDS:
+            raise ValueError(f"Unsupported kind: {kind!r}, expected one of {KINDS}")
+        if kind in ("heavy_hitter", "long_tail") and not 0 < n_hot < cardinality:
+            raise ValueError(f"n_hot must be in (0, {cardinality}), got {n_hot}")
+        if not 0.0 <= hot_mass <= 1.0:
+            raise ValueError(f"hot_mass must be in [0, 1], got {hot_mass}")
+        self.kind = kind
+        self.cardinality = cardinality
+        self.a = a
+        self.n_hot = n_hot
+        self.hot_mass = hot_mass
+        self.p = self._probabilities()
+        if kind in ("heavy_hitter", "long_tail"):
+            # the hot values must really be the most frequent ones: rank 0 is the hottest value,
+            # which expected_selectivity callers and as_bool rely on
+            if hot_mass < n_hot / cardinality:
+                raise ValueError(f"hot_mass must be >= n_hot / cardinality = {n_hot / cardinality:.6g}, "
+                                 f"got {hot_mass}: the {n_hot} hot values would be colder than the tail")
+            tail = (1.0 - hot_mass) / (cardinality - n_hot)
+            if kind == "long_tail" and self.p[n_hot - 1] < tail * (1 - 1e-9):
+                raise ValueError(f"long_tail head is colder than the tail: the last of the {n_hot} head values "
+                                 f"gets {self.p[n_hot - 1]:.6g}, a tail value {tail:.6g}; raise hot_mass or lower a")
+        self.cdf = np.cumsum(self.p)
+        self.cdf[-1] = 1.0
+        # optional rank -> value permutation, so the hot values are not 0, 1, 2, ...
+        self.rank_to_value = (
+            np.random.default_rng(shuffle_seed).permutation(cardinality) if shuffle_seed is not None else None
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"ValueDistribution(kind={self.kind!r}, cardinality={self.cardinality}, a={self.a}, "
+            f"n_hot={self.n_hot}, hot_mass={self.hot_mass})"
+        )
+
+    def _probabilities(self) -> np.ndarray:
+        n = self.cardinality
+        if self.kind == "uniform":
+            return np.full(n, 1.0 / n)
+        if self.kind == "zipf":
+            w = 1.0 / np.arange(1, n + 1, dtype=np.float64) ** self.a
+            return w / w.sum()
+        p = np.empty(n)
+        if self.kind == "heavy_hitter":
+            p[:self.n_hot] = self.hot_mass / self.n_hot
+        else:
+            head = 1.0 / np.arange(1, self.n_hot + 1, dtype=np.float64) ** self.a
+            p[:self.n_hot] = self.hot_mass * head / head.sum()
+        p[self.n_hot:] = (1.0 - self.hot_mass) / (n - self.n_hot)
+        return p
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """n value ids (int64) by inverse-CDF sampling."""
+        ranks = np.searchsorted(self.cdf, rng.random(n), side="right")
+        return self.rank_to_value[ranks] if self.rank_to_value is not None else ranks
+
+    def value_of_rank(self, rank: int) -> int:
+        """Value id of the rank-th most frequent value."""
+        return int(self.rank_to_value[rank]) if self.rank_to_value is not None else rank
+
+    def expected_selectivity(self, values: Iterable[int]) -> float:
+        """Share of rows whose value id is one of values (== for one value, in for several)."""
+        values = np.unique(np.asarray(list(values), dtype=np.int64))
+        # ids outside [0, cardinality) never occur
+        values = values[(values >= 0) & (values < self.cardinality)]
+        ranks = np.argsort(self.rank_to_value)[values] if self.rank_to_value is not None else values
+        return float(self.p[ranks].sum())
+
+    @staticmethod
+    def as_int(values: np.ndarray, offset: int = 0) -> np.ndarray:
+        return values.astype(np.int64) + offset
+
+    @staticmethod
+    def as_varchar(values: np.ndarray, prefix: str = "xxx") -> List[str]:
+        return [f"{prefix}{v}" for v in values.tolist()]
+
+    @staticmethod
+    def as_bool(values: np.ndarray) -> np.ndarray:
+        """Value id 0 (the hottest) is True, so P(True) is the mass of rank 0."""
+        return values == 0
+
+
+def skewed_bool(rng: np.random.Generator, n: int, p_true: float) -> np.ndarray:
+    """BOOL column with P(True) = p_true."""
+    return rng.random(n) < p_true
+
+
+def realised_selectivity(columns: Dict[str, Sequence], predicates: Dict[str, Predicate]) -> Dict[str, float]:
+    """Share of rows matching each predicate, evaluated over numpy views of columns."""
+    arrays = {name: np.asarray(col) for name, col in columns.items()}
+    n = len(next(iter(arrays.values()))) if arrays else 0
+    return {expr: float(np.count_nonzero(pred(arrays))) / n if n else 0.0 for expr, pred in predicates.items()}
+
+
+def print_selectivity_report(
+    columns: Dict[str, Sequence],
+    predicates: Dict[str, Predicate],
+    expected: Optional[Dict[str, float]] = None,
+) -> Dict[str, float]:
+    """Print and return the realised selectivity of every benchmark predicate."""
+    realised = realised_selectivity(columns, predicates)
+    width = max((len(expr) for expr in realised), default=0)
+    print("=== predicate selectivity ===")
+    for expr, sel in realised.items():
+        line = f"{expr:<{width}}  {sel:8.4%}"
+        if expected and expr in expected:
+            line += f"  (expected {expected[expr]:.4%})"
+        print(line)
+    return realised
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Selectivity of == predicates over cardinality x skew")
+    parser.add_argument("--kind", choices=KINDS, default="zipf")
+    parser.add_argument("--cardinality", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument("--skew", type=float, nargs="+", default=[0.0, 0.5, 1.0, 1.5, 2.0],
+                        help="Zipf exponent a (zipf, long_tail)")
+    parser.add_argument("--n-hot", type=int, default=10)
+    parser.add_argument("--hot-mass", type=float, nargs="+", default=[0.5, 0.8, 0.9, 0.99],
+                        help="share of rows held by the n_hot values, in [0, 1] (heavy_hitter, long_tail)")
+    args = parser.parse_args()
+
+    skews = [None] if args.kind == "heavy_hitter" else args.skew
+    hot_masses = args.hot_mass if args.kind in ("heavy_hitter", "long_tail") else [None]
+    print(f"{'cardinality':>11} {'skew':>5} {'hot_mass':>8} {'hottest':>10} {'median':>10} {'coldest':>10}")
+    for cardinality in args.cardinality:
+        for skew in skews:
+            for hot_mass in hot_masses:
+                label = (f"{cardinality:>11} {skew if skew is not None else '-':>5} "
+                         f"{hot_mass if hot_mass is not None else '-':>8}")
+                try:
+                    dist = ValueDistribution(args.kind, cardinality, a=skew if skew is not None else 1.1,
+                                             n_hot=min(args.n_hot, cardinality - 1),
+                                             hot_mass=hot_mass if hot_mass is not None else 0.9)
+                except ValueError as e:
+                    print(f"{label} skipped: {e}")
+                    continue
+                median = np.sort(dist.p)[cardinality // 2]
+                print(f"{label} {dist.p.max():>10.4%} {median:>10.4%} {dist.p.min():>10.4%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Vectorized SPARSE_FLOAT_VECTOR data in CSR form.
+
+``SparseVectorGenerator`` produces batches as three flat arrays (``indptr``,
+``indices``, ``values``) straight from numpy, instead of a Python dict literal
+per row. Rows look like learned or lexical sparse embeddings:
+
+* the number of term draws per row follows ``nnz_dist`` (``lognormal``,
+  ``poisson``, ``uniform`` or ``fixed``) around ``nnz_mean``; with a skewed
+  term distribution repeated draws merge, so the realised nnz is lower,
+* terms are drawn from a Zipf(``term_skew``) distribution over ``vocab_size``
+  terms, so a few terms occur in many rows as in real corpora, and a term drawn
+  several times for the same row counts as its term frequency,
+* ``weight`` is ``bm25`` (tf saturation times idf of the term), ``splade``
+  (``log1p`` of a log-normal activation) or ``uniform``.
+
+A batch only becomes per-row dicts at the insert boundary (``to_rows()``), or
+a ``scipy.sparse.csr_matrix`` (``to_column()``) when scipy is installed, which
+pymilvus accepts as a whole column.
+
+    gen = SparseVectorGenerator(vocab_size=30000, nnz_mean=120, term_skew=1.1, weight="bm25")
+    for batch in gen.iter_batches(10_000_000, 10000):
+        client.insert(collection_name=name, data=[{"id": i, "sparse": v} for i, v in ...])
+"""
+import argparse
+import math
+import time
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+try:
+    import scipy.sparse as sp
+except ImportError:
+    sp = None
+
+NNZ_DISTS = ("lognormal", "poisson", "uniform", "fixed")
+WEIGHTS = ("bm25", "splade", "uniform")
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+# smallest idf: terms in (almost) every document would get idf 0 and be stored as explicit zeros
+BM25_IDF_FLOOR = 1e-3
+
+# spawn keys of the model and of the query stream, batches use (start,)
+_MODEL_KEY = 1 << 63
+_QUERY_KEY = (1 << 63) + 1
+
+
+class SparseBatch:
+    """Rows of sparse vectors as CSR arrays: row i is indices/values[indptr[i]:indptr[i + 1]]."""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, values: np.ndarray, dim: int):
+        self.indptr = indptr
+        self.indices = indices
+        self.values = values
+        self.dim = dim
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def nnz(self) -> int:
+        return int(self.indptr[-1])
+
+    def row(self, i: int) -> Dict[int, float]:
+        lo, hi = int(self.indptr[i]), int(self.indptr[i + 1])
+        return dict(zip(self.indices[lo:hi].tolist(), self.values[lo:hi].tolist()))
+
+    def to_rows(self) -> List[Dict[int, float]]:
+        """One {index: value} dict per row, the form MilvusClient.insert takes."""
+        indices = self.indices.tolist()
+        values = self.values.tolist()
+        bounds = self.indptr.tolist()
+        return [dict(zip(indices[lo:hi], values[lo:hi])) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+    def to_scipy(self):
+        if sp is None:
+            raise ImportError("scipy is required for SparseBatch.to_scipy()")
+        return sp.csr_matrix((self.values, self.indices, self.indptr), shape=(len(self), self.dim))
+
+    def to_column(self):
+        """A whole column for Collection.insert: a csr_matrix with scipy, row dicts without."""
+        return self.to_scipy() if sp is not None else self.to_rows()
+
+
+class SparseVectorGenerator:
+    def __init__(
+        self,
+        vocab_size: int = 30000,
+        nnz_mean: float = 100.0,
+        nnz_dist: str = "lognormal",
+        nnz_sigma: float = 0.5,
+        nnz_max: Optional[int] = None,
+        term_skew: float = 1.0,
+        weight: str = "bm25",
+        seed: int = 0,
+    ):
+        if nnz_dist not in NNZ_DISTS:
+            raise ValueError(f"Unsupported nnz_dist: {nnz_dist!r}, expected one of {NNZ_DISTS}")
+        if weight not in WEIGHTS:
+            raise ValueError(f"Unsupported weight: {weight!r}, expected one of {WEIGHTS}")
+        self.vocab_size = vocab_size
+        self.nnz_mean = nnz_mean
+        self.nnz_dist = nnz_dist
+        self.nnz_sigma = nnz_sigma
+        self.nnz_max = min(nnz_max or vocab_size, vocab_size)
+        self.term_skew = term_skew
+        self.weight = weight
+        self.seed = seed
+
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(_MODEL_KEY,)))
+        p = 1.0 / np.arange(1, vocab_size + 1, dtype=np.float64) ** term_skew
+        p /= p.sum()
+        self.term_cdf = np.cumsum(p)
+        self.term_cdf[-1] = 1.0
+        # guide table: _guide[b] is the first rank whose cdf exceeds b / len(_guide), so
+        # sampling is one table lookup plus a short fix-up instead of a binary search
+        self._guide = np.searchsorted(self.term_cdf, np.arange(4 * vocab_size) / (4 * vocab_size), side="right")
+        # rank -> term id, so the frequent terms are spread over the index space
+        self.rank_to_term = rng.permutation(vocab_size).astype(np.int32)
+        # BM25 idf of each term, from its expected document frequency df = 1 - (1 - p) ** nnz_mean
+        df = -np.expm1(nnz_mean * np.log1p(-np.minimum(p, 1 - 1e-12)))
+        self.idf = np.empty(vocab_size, dtype=np.float32)
+        self.idf[self.rank_to_term] = np.maximum(np.log1p((1.0 - df) / np.maximum(df, 1e-12)), BM25_IDF_FLOOR)
+
+    def __repr__(self) -> str:
+        return (
+            f"SparseVectorGenerator(vocab_size={self.vocab_size}, nnz_mean={self.nnz_mean}, "
+            f"nnz_dist={self.nnz_dist!r}, term_skew={self.term_skew}, weight={self.weight!r}, seed={self.seed})"
+        )
+
+    def _row_draws(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """Number of term draws per row (duplicates later become term frequencies)."""
+        if self.nnz_dist == "fixed":
+            draws = np.full(n, int(round(self.nnz_mean)))
+        elif self.nnz_dist == "poisson":
+            draws = rng.poisson(self.nnz_mean, n)
+        elif self.nnz_dist == "uniform":
+            draws = rng.integers(1, 2 * int(round(self.nnz_mean)), n, endpoint=True)
+        else:
+            mu = math.log(self.nnz_mean) - self.nnz_sigma ** 2 / 2
+            draws = np.rint(rng.lognormal(mu, self.nnz_sigma, n))
+        return np.clip(draws, 1, self.nnz_max).astype(np.int64)
+
+    def _ranks(self, u: np.ndarray) -> np.ndarray:
+        """Inverse CDF of the term distribution at u, via the guide table."""
+        ranks = self._guide[(u * len(self._guide)).astype(np.int64)]
+        pending = np.flatnonzero(self.term_cdf[ranks] <= u)
+        while len(pending):
+            ranks[pending] += 1
+            pending = pending[self.term_cdf[ranks[pending]] <= u[pending]]
+        return ranks
+
+    def _sample(self, rng: np.random.Generator, n: int, draws: np.ndarray) -> SparseBatch:
+        total = int(draws.sum())
+        rows = np.repeat(np.arange(n, dtype=np.int64), draws)
+        terms = self.rank_to_term[self._ranks(rng.random(total))]
+        # unique (row, term) pairs, sorted by row and then by term as milvus wants them,
+        # with the repeat count as term frequency
+        keys, tf = np.unique(rows * self.vocab_size + terms, return_counts=True)
+        rows, terms = np.divmod(keys, self.vocab_size)
+        counts = np.bincount(rows, minlength=n)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+
+        if self.weight == "bm25":
+            # document length is the number of draws of the row
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * draws[rows] / self.nnz_mean)
+            values = self.idf[terms] * (tf * (BM25_K1 + 1) / (tf + norm))
+        elif self.weight == "splade":
+            values = np.log1p(rng.lognormal(0.0, 1.0, len(keys))) * np.sqrt(tf)
+        else:
+            # (0, 1]: a stored entry is never an explicit zero
+            values = 1.0 - rng.random(len(keys))
+        return SparseBatch(indptr, terms.astype(np.int32), values.astype(np.float32), self.vocab_size)
+
+    def sample(self, rng: np.random.Generator, n: int) -> SparseBatch:
+        """n rows drawn with the caller's rng."""
+        return self._sample(rng, n, self._row_draws(rng, n))
+
+    def batch(self, start: int, count: int) -> SparseBatch:
+        """Rows [start, start + count), reproducible for a given seed and batch size."""
+        return self.sample(np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(start,))), count)
+
+    def iter_batches(self, total: int, batch_size: int, start: int = 0) -> Iterator[SparseBatch]:
+        for offset in range(start, start + total, batch_size):
+            yield self.batch(offset, min(batch_size, start + total - offset))
+
+    def queries(self, nq: int, nnz: Optional[int] = None, seed_offset: int = 0) -> SparseBatch:
+        """nq query vectors from the same term distribution, with nnz draws each (default: nnz_mean)."""
+        rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(_QUERY_KEY, seed_offset)))
+        draws = np.full(nq, nnz or int(round(self.nnz_mean)), dtype=np.int64)
+        return self._sample(rng, nq, draws)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time SparseVectorGenerator")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--vocab", type=int, default=30000)
+    parser.add_argument("--nnz", type=float, default=100.0)
+    parser.add_argument("--nnz-dist", choices=NNZ_DISTS, default="lognormal")
+    parser.add_argument("--term-skew", type=float, default=1.0)
+    parser.add_argument("--weight", choices=WEIGHTS, default="bm25")
+    parser.add_argument("--rows-format", action="store_true", help="Also convert every batch to row dicts")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    gen = SparseVectorGenerator(args.vocab, args.nnz, args.nnz_dist, term_skew=args.term_skew,
+                                weight=args.weight, seed=args.seed)
+    start = time.perf_counter()
+    nnz = 0
+    for batch in gen.iter_batches(args.rows, args.batch):
+        nnz += batch.nnz
+        if args.rows_format:
+            batch.to_rows()
+    elapsed = time.perf_counter() - start
+    print(f"{gen}: {args.rows} rows, avg nnz {nnz / args.rows:.1f}, {elapsed:.2f}s ({args.rows / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
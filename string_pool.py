@@ -0,0 +1,100 @@
+"""Compact fixed-width string pool with vectorized sampling.
+
+The pool is a numpy ``S{n}`` array (fixed-width bytes) saved as ``.npy`` and
+reopened with ``mmap_mode="r"``, so loading it costs nothing regardless of its
+size. ``StringSampler`` draws millions of strings from it in one call, either
+uniformly or Zipf-weighted, and only decodes to ``str`` at the insert boundary.
+
+    pool = load_or_generate_string_pool()
+    sampler = StringSampler(pool, zipf=1.1, seed=19530)
+    column = sampler.sample(10000)  # list of str for a VARCHAR column
+"""
+import json
+import os
+import string
+from typing import List, Optional
+
+import numpy as np
+
+STRING_POOL_FILE = "string_pool.npy"
+# the JSON list used before the pool moved to .npy, converted on first load
+LEGACY_STRING_POOL_FILE = "string_pool.json"
+
+
+def generate_string_pool(
+    size: int = 10000,
+    length: int = 10,
+    seed=None,
+    charset: str = string.ascii_letters,
+) -> np.ndarray:
+    """size random strings of exactly length characters, as an S{length} array."""
+    rng = np.random.default_rng(seed)
+    table = np.frombuffer(charset.encode("ascii"), dtype=np.uint8)
+    codes = table[rng.integers(0, len(table), (size, length))]
+    return codes.view(f"S{length}").ravel()
+
+
+def to_fixed_width(strings: List[str]) -> np.ndarray:
+    """Encode a list of str as the narrowest S{n} array that holds all of them."""
+    encoded = [s.encode("utf-8") for s in strings]
+    width = max((len(b) for b in encoded), default=1) or 1
+    return np.array(encoded, dtype=f"S{width}")
+
+
+def decode_pool(pool: np.ndarray) -> List[str]:
+    """S{n} array -> list of str (trailing NUL padding is dropped by numpy)."""
+    return np.char.decode(pool, "utf-8").tolist()
+
+
+def load_or_generate_string_pool(
+    path: str = STRING_POOL_FILE,
+    size: int = 10000,
+    length: int = 10,
+    seed=None,
+    legacy_path: Optional[str] = LEGACY_STRING_POOL_FILE,
+) -> np.ndarray:
+    """Memory-map the pool at path, converting the legacy JSON pool or generating a new one if needed."""
+    if os.path.exists(path):
+        print(f"Loaded string pool from {path}")
+        return np.load(path, mmap_mode="r")
+
+    if legacy_path and os.path.exists(legacy_path):
+        with open(legacy_path, "r") as f:
+            pool = to_fixed_width(json.load(f))
+        print(f"Converted string pool {legacy_path} -> {path}")
+    else:
+        pool = generate_string_pool(size, length, seed)
+        print(f"Generated string pool of {size} strings")
+    np.save(path, pool)
+    return np.load(path, mmap_mode="r")
+
+
+class StringSampler:
+    """Vectorized draws from a string pool, uniform or Zipf(zipf) over pool ranks."""
+
+    def __init__(self, pool: np.ndarray, zipf: Optional[float] = None, seed=None, shuffle_ranks: bool = True):
+        self.pool = pool
+        self.rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+        self.cdf = None
+        self.rank_to_index = None
+        if zipf:
+            weights = 1.0 / np.arange(1, len(pool) + 1, dtype=np.float64) ** zipf
+            self.cdf = np.cumsum(weights / weights.sum())
+            self.cdf[-1] = 1.0
+            # without shuffling, the hottest strings would be the first ones in the file
+            if shuffle_ranks:
+                self.rank_to_index = self.rng.permutation(len(pool))
+
+    def sample_indices(self, n: int) -> np.ndarray:
+        if self.cdf is None:
+            return self.rng.integers(0, len(self.pool), n)
+        ranks = np.searchsorted(self.cdf, self.rng.random(n), side="right")
+        return self.rank_to_index[ranks] if self.rank_to_index is not None else ranks
+
+    def sample_bytes(self, n: int) -> np.ndarray:
+        """n strings as an S{n} array, without any per-element Python work."""
+        return np.asarray(self.pool)[self.sample_indices(n)]
+
+    def sample(self, n: int) -> List[str]:
+        """n strings as a list of str, ready for a VARCHAR column."""
+        return decode_pool(self.sample_bytes(n))
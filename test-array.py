@@ -2,6 +2,7 @@
 import sys
 import time
 import functools
+from functools import partial
 
 from datetime import datetime
 import random
@@ -16,10 +17,19 @@ from pymilvus import (
 
 import logging
 
+from sharded_generator import generate_sharded, array_entities_shard
+from dataset_cache import load_or_build
+
 sample = 30
 
+# ARRAY lengths: uniform / geometric / zipf / fixed over [1, max_len]
+length_dist = "uniform"
+max_len = 128
+
 if len(sys.argv) >= 2:
     sample = int(sys.argv[1])
+if len(sys.argv) >= 3:
+    length_dist = sys.argv[2]
 
 LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
 DATE_FORMAT = "%m/%d/%Y %H:%M:%S %p"
@@ -68,13 +78,13 @@ fields = [
                 is_primary=True, auto_id=False, max_length=100),
     FieldSchema(name="embeddings", dtype=DataType.FLOAT_VECTOR, dim=dim),
 
-    FieldSchema(name="int64_array", dtype=DataType.ARRAY, max_capacity=128,
+    FieldSchema(name="int64_array", dtype=DataType.ARRAY, max_capacity=max_len,
                 element_type=DataType.INT64),
-    FieldSchema(name="bool_array", dtype=DataType.ARRAY, max_capacity=128,
+    FieldSchema(name="bool_array", dtype=DataType.ARRAY, max_capacity=max_len,
                 element_type=DataType.BOOL),
-    FieldSchema(name="float_array", dtype=DataType.ARRAY, max_capacity=128,
+    FieldSchema(name="float_array", dtype=DataType.ARRAY, max_capacity=max_len,
                 element_type=DataType.FLOAT),
-    FieldSchema(name="varchar_array", dtype=DataType.ARRAY, max_capacity=128,
+    FieldSchema(name="varchar_array", dtype=DataType.ARRAY, max_capacity=max_len,
                 element_type=DataType.VARCHAR, max_length=1000),
 ]
 
@@ -95,8 +105,10 @@ def generate_random(total, sample):
     return x
 
 
-all_int64s = [generate_random(1000000, sample) for _ in range(5)]
-all_varchars = [str(generate_random(1000000, sample)) for _ in range(5)]
+# seeded so the generated batches (and their cache keys) are stable across runs
+seeded = random.Random(19530)
+all_int64s = [seeded.randint(0, 1000000 - 1) % sample for _ in range(5)]
+all_varchars = [str(seeded.randint(0, 1000000 - 1) % sample) for _ in range(5)]
 logger.info(f"all_int64s: {all_int64s}")
 logger.info(f"all_varchars: {all_varchars}")
 
@@ -104,35 +116,42 @@ logger.info(f"all_varchars: {all_varchars}")
 @time_recorder
 def generate_entities(offset_begin, num_entities, sample, total):
     logger.info(f"generate {num_entities} entities")
-    int64_array_s = []
-    bool_array_s = []
-    float_array_s = []
-    varchar_array_s = []
-
-    for idx in range(num_entities):
-        n = random.randint(1, 128)
-        int64s = [generate_random(total, sample) for _ in range(n)]
-        bools = [False]
-        floats = [float(generate_random(total, sample)) for _ in range(n)]
-        if (offset_begin + idx) % 100000 == 0:
-            bools = [False, True]
-        elif (offset_begin + idx) % 50000 == 0:
-            int64s = all_int64s
-            bools = [True]
-            varchars = all_varchars
-        varchars = [str(generate_random(total, sample)) for _ in range(n)]
-        int64_array_s.append(int64s)
-        bool_array_s.append(bools)
-        float_array_s.append(floats)
-        varchar_array_s.append(varchars)
 
+    def build(writer):
+        # sharded across processes, one child seed per shard: same data for any worker count
+        columns = generate_sharded(
+            partial(array_entities_shard, sample=sample, total=total,
+                    all_int64s=all_int64s, all_varchars=all_varchars, dim=dim,
+                    length_dist=length_dist, max_len=max_len),
+            num_entities,
+            seed=(19530, offset_begin),
+            shard_rows=2000,
+            row_offset=offset_begin,
+        )
+        writer.add_array("pk", columns["pk"])
+        writer.add_array("embeddings", columns["embeddings"])
+        # offsets + values buffers straight from numpy, no per-row lists
+        writer.add_ragged("int64_array", columns["int64_array"])
+        writer.add_ragged("bool_array", columns["bool_array"])
+        writer.add_ragged("float_array", columns["float_array"])
+        writer.add_ragged("varchar_array", columns["varchar_array"])
+
+    # cached on disk by parameters + seed, later runs only mmap the files
+    dataset = load_or_build(
+        {"script": "test-array", "offset_begin": offset_begin, "num_entities": num_entities,
+         "sample": sample, "total": total, "all_int64s": all_int64s, "all_varchars": all_varchars,
+         "dim": dim, "length_dist": length_dist, "max_len": max_len, "generator": "ragged", "seed": 19530},
+        build,
+    )
+
+    # per-row lists only here, at the insert boundary
     entities = [
-        [i + offset_begin for i in range(num_entities)],
-        rng.random((num_entities, dim)),
-        int64_array_s,
-        bool_array_s,
-        float_array_s,
-        varchar_array_s,
+        dataset.array("pk").tolist(),
+        dataset.vectors("embeddings"),
+        dataset.ragged_column("int64_array").to_column(),
+        dataset.ragged_column("bool_array").to_column(),
+        dataset.ragged_column("float_array").to_column(),
+        dataset.ragged_column("varchar_array").to_column(),
     ]
     return entities
 
@@ -11,6 +11,11 @@ from pymilvus import MilvusClient, DataType
 import time
 import numpy
 
+from skewed_values import ValueDistribution, print_selectivity_report
+
+# array2 elements are value ids of this distribution, "1" is the second most frequent one
+value_dist = ValueDistribution("zipf", cardinality=100, a=1.1)
+
 
 fields = [
     FieldSchema(name="pk", dtype=DataType.INT64, is_primary=True, auto_id=False),
@@ -44,6 +49,8 @@ hello_milvus = Collection("hello_small", schema)
 print("create table done")
 
 import random
+rng = numpy.random.default_rng(19530)
+array2_values = value_dist.sample(rng, 3000 * 5).reshape(3000, 5)
 entities = [
     [i for i in range(3000)],  # field pk
     # [int(random.randrange(100, 300)) for _ in range(3000)],  # field int1
@@ -57,12 +64,20 @@ entities = [
     #[ "xxx" + str(random.randint(0, 10000) % 30) for i in range(3000)],  # field string1
     # [ "xxx" + str(random.randint(0, 10000) % 30) for i in range(3000)],  # field string2
     # [[int(random.uniform(0, 10000)) for _ in range(5) ] for _ in range(3000)], #array 1
-     [[str(random.randint(0, 10000) % 100) for _ in range(5) ] for _ in range(3000)], #array 2
+     [[str(v) for v in row] for row in array2_values.tolist()], #array 2
     # [[float(random.randrange(-20, 100)) for _ in range(5) ] for _ in range(3000)], #array 3
     # [[True if random.randint(0, 10000) % 2 == 0  else False for _ in range(5) ] for _ in range(3000)], #array 4
     [[random.random() for _ in range(128)] for _ in range(3000)],  # field embeddings
 ]
 
+# every batch below inserts the same entities, so this is the selectivity of the whole collection
+print(value_dist)
+print_selectivity_report(
+    {"array2": array2_values},
+    {'json_contains(array2, "1")': lambda c: (c["array2"] == 1).any(axis=1)},
+    {'json_contains(array2, "1")': 1 - (1 - value_dist.expected_selectivity([1])) ** 5},
+)
+
 index_param = { "index_type" : "AUTOINDEX", "bitmap_cardinality_limit":40}
 #index_param = { "index_type" : "INVERTED"}
 # hello_milvus.create_index("int1", index_param)
@@ -12,6 +12,8 @@ from pymilvus import MilvusClient, DataType
 import time
 import numpy
 
+from clustered_dataset import ClusteredDataset
+
 
 fields = [
     FieldSchema(name="pk", dtype=DataType.INT64, is_primary=True, auto_id=False),
@@ -61,7 +63,7 @@ entities = [
     # [[str(random.uniform(0, 10000)) for _ in range(5) ] for _ in range(3000)], #array 2
     # [[float(random.randrange(-20, 100)) for _ in range(5) ] for _ in range(3000)], #array 3
     # [[True if random.randint(0, 10000) % 2 == 0  else False for _ in range(5) ] for _ in range(3000)], #array 4
-    [[random.random() for _ in range(128)] for _ in range(3000)],  # field embeddings
+    ClusteredDataset(3000, 128, n_clusters=64, intrinsic_dim=32, seed=19530).block(0, 3000),  # field embeddings
 ]
 
 index_param = { "index_type" : "BITMAP"}
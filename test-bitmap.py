@@ -12,6 +12,13 @@ from pymilvus import MilvusClient, DataType
 import time
 import numpy
 
+from skewed_values import ValueDistribution, print_selectivity_report
+
+# value distribution of the indexed int2 / string1 columns; BITMAP vs INVERTED
+# depends on cardinality and skew, e.g. ValueDistribution("heavy_hitter", 10000, n_hot=5)
+value_dist = ValueDistribution("zipf", cardinality=1000, a=1.1)
+query_values = [1, 10000, 300000, 500000]
+
 
 fields = [
     FieldSchema(name="pk", dtype=DataType.INT64, is_primary=True, auto_id=False),
@@ -41,20 +48,40 @@ def init_collection():
   print("create table done")
 
   import random
+  rng = numpy.random.default_rng(19530)
+  int2_values = value_dist.sample(rng, 3000)
+  string1_values = value_dist.sample(rng, 3000)
   entities = [
       [i for i in range(3000)],  # field pk
       [int(random.randrange(100, 300)) for _ in range(3000)],  # field int1
-      [int(random.randrange(-10, 900)) for _ in range(3000)],  # field int2
+      value_dist.as_int(int2_values).tolist(),  # field int2
       [numpy.int8(random.randrange(-120, 110)) for _ in range(3000)],  # field int8_1
       [numpy.int8(random.randrange(-80, 100)) for _ in range(3000)],  # field int8_2
       [float(random.randrange(-20, 100)) for _ in range(3000)],  # field double1
       [float(random.randrange(-20, 80)) for _ in range(3000)],  # field double2
             [ True if i %2 ==0 else False for i in range(3000)],  # field bool1 
             [ True if i %2 ==0 else False for i in range(3000)],  # field bool2
-      [ "xxx" + str(i) for i in range(3000)],  # field random
+      value_dist.as_varchar(string1_values),  # field string1
       [ "xxx" + str(i) for i in range(3000)],  # field random
       [[random.random() for _ in range(128)] for _ in range(3000)],  # field embeddings
   ]
+  # every batch below inserts the same entities, so these are the selectivities of the whole collection
+  print(value_dist)
+  print_selectivity_report(
+      {"int2": int2_values, "string1": entities[9]},
+      {
+          f"int2 in {query_values}": lambda c: numpy.isin(c["int2"], query_values),
+          "int2 == 0": lambda c: c["int2"] == 0,
+          'string1 == "xxx0"': lambda c: c["string1"] == "xxx0",
+          f'string1 == "xxx{value_dist.cardinality - 1}"': lambda c: c["string1"] == f"xxx{value_dist.cardinality - 1}",
+      },
+      {
+          f"int2 in {query_values}": value_dist.expected_selectivity(query_values),
+          "int2 == 0": value_dist.expected_selectivity([0]),
+          'string1 == "xxx0"': value_dist.expected_selectivity([0]),
+          f'string1 == "xxx{value_dist.cardinality - 1}"': value_dist.expected_selectivity([value_dist.cardinality - 1]),
+      },
+  )
   
   #index_param = { "index_type" : "AUTOINDEX", "bitmap_cardinality_limit" : 1000}
   index_param = { "index_type" : ""}
@@ -167,8 +194,9 @@ def search():
   index = 0
   while index < 1:
     #result = hello_milvus.search(vectors_to_search, "embeddings", search_params, limit=100, expr='double1>0') 
-    result = hello_milvus.query(expr="int2 in[1, 10000, 300000, 500000]", output_fields=["pk", "int2"])
+    result = hello_milvus.query(expr=f"int2 in {query_values}", output_fields=["pk", "int2"])
     print(result)
+    print(f"expected selectivity {value_dist.expected_selectivity(query_values):.4%}")
     index +=1
 #  while (True):
 #    start = time.time()
@@ -17,6 +17,8 @@ import os
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from string_pool import load_or_generate_string_pool, decode_pool, StringSampler
+
 def query_task(i, coll, latency_list):
     values = [(i + j * 13) % 10000 for j in range(1000)]  # 用乘法散开一点
     expr = f"int2 in {values}"
@@ -55,35 +57,13 @@ def generate_random_string():
     random_string = ''.join(random.choice(characters) for _ in range(100))
     return random_string
 
-# Generate a pool of 1000 random strings with length 10
-STRING_POOL_FILE = "string_pool.json"
-
-def load_or_generate_string_pool():
-    """Load string pool from file if it exists, otherwise generate and save it"""
-    if os.path.exists(STRING_POOL_FILE):
-        try:
-            with open(STRING_POOL_FILE, 'r') as f:
-                string_pool = json.load(f)
-            print(f"Loaded string pool from {STRING_POOL_FILE}")
-            return string_pool
-        except Exception as e:
-            print(f"Failed to load string pool from file: {e}")
-    
-    # Generate new string pool
-    string_pool = [''.join(random.choices(string.ascii_letters, k=10)) for _ in range(10000)]
-    
-    # Save to file
-    try:
-        with open(STRING_POOL_FILE, 'w') as f:
-            json.dump(string_pool, f)
-        print(f"Generated and saved string pool to {STRING_POOL_FILE}")
-    except Exception as e:
-        print(f"Failed to save string pool to file: {e}")
-    
-    return string_pool
-
-
-string_pool = load_or_generate_string_pool()
+# 10000 个长度为 10 的随机字符串, 以定长 bytes 数组存成 .npy, 之后 mmap 读取
+string_pool_bytes = load_or_generate_string_pool()
+string_pool = decode_pool(string_pool_bytes)
+string_sampler = StringSampler(string_pool_bytes, seed=19530)
+# False: string1 全部是常量 "xxx", "string1 in string_pool" 命中 0%, 和以前的结果可比;
+# True: string1 从字符串池采样, 同一个查询命中 100%, 耗时不能和 0% 的结果混在一起比较
+STRING1_FROM_POOL = False
 #string_pool = [''.join(random.choices(string.ascii_letters, k=10)) for _ in range(10)]
 
 fields = [
@@ -149,7 +129,7 @@ def init_collection():
         [i for i in range(10000 *index, 10000 * (index + 1))],  # field pk
         # [int(random.randrange(0, 1023)) for _ in range(100)],  # field int1
         [i for i in range(10000 *index, 10000 * (index + 1))],  # field int2
-        [ "xxx" for i in range(10000)],  # field random
+        string_sampler.sample(10000) if STRING1_FROM_POOL else ["xxx" for i in range(10000)],  # field string1
         # [ get_json(100) for i in range(100)],
         [[random.random() for _ in range(128)] for _ in range(10000)],  # field embeddings
     ]
@@ -220,7 +200,8 @@ def query():
   expr = f"string1 in {string_pool}"
   print (expr)
   result = hello_milvus.query(expr=expr, output_fields=["count(*)"])
-  print(f"Query with string pool: {len(result)} results")
+  print(f"Query with string pool (expected selectivity {'100%' if STRING1_FROM_POOL else '0%'}): "
+        f"{len(result)} results")
   print(result)
 
 
@@ -14,6 +14,8 @@ import string
 import threading
 from concurrent.futures import ThreadPoolExecutor
 
+from schema_generator import SchemaGenerator
+
 def generate_random_string():
     length = random.randint(1, 1000)
     characters = string.ascii_letters
@@ -70,29 +72,26 @@ def init_collection():
   #hello_milvus.create_index("int8_1", index_params={"index_type": "INVERTED"})
   hello_milvus.create_index("int8_1")
 
-  import random
-  index = 0
-  while(index < 1):
-    entities = [
-        [i for i in range(3000 *index, 3000 * (index + 1))],  # field pk
-        [int(random.randrange(0, 4)) for _ in range(3000)],  # field int1
-        [int(random.randrange(-30000, 30000)) for _ in range(3000)],  # field int2
-        [random.randint(0, 50) for _ in range(3000)],  # field int8_1
-        [numpy.int8(random.randrange(-80, 100)) for _ in range(3000)],  # field int8_2
-        [float(random.randrange(-20, 100)) for _ in range(3000)],  # field double1
-        [float(random.randrange(-20, 80)) for _ in range(3000)],  # field double2
-        [float(random.randrange(-20, 100)) for _ in range(3000)],  # field double1
-        [float(random.randrange(-20, 80)) for _ in range(3000)],  # field double2
-              [ True if i %2 ==0 else False for i in range(3000)],  # field bool1 
-              [ True if i %2 ==0 else False for i in range(3000)],  # field bool2
-        [ str(index* 3000 + i) for i in range(3000)],  # field random
-        [ "xxx" + str(i%20) for i in range(3000)],  # field random
-        [[random.random() for _ in range(128)] for _ in range(3000)],  # field embeddings
-    ]
+  gen = SchemaGenerator(schema, {
+      "int1": {"low": 0, "high": 3},
+      "int2": {"low": -30000, "high": 29999},
+      "int8_1": {"low": 0, "high": 50},
+      "int8_2": {"low": -80, "high": 99},
+      "float1": {"low": -20, "high": 99, "decimals": 0},
+      "float2": {"low": -20, "high": 79, "decimals": 0},
+      "double1": {"low": -20, "high": 99, "decimals": 0},
+      "double2": {"low": -20, "high": 79, "decimals": 0},
+      "bool1": {"fn": lambda rng, start, n: numpy.arange(start, start + n) % 2 == 0},
+      "bool2": {"fn": lambda rng, start, n: numpy.arange(start, start + n) % 2 == 0},
+      "string1": {"dist": "sequence"},
+      "string2": {"fn": lambda rng, start, n: ["xxx" + str(i % 20) for i in range(start, start + n)]},
+  }, seed=19530)
+  field_names = [f.name for f in fields]
+  for index, batch in enumerate(gen.iter_batches(3000, 3000)):
+    entities = batch.to_columns(field_names)
     if index == 0:
       print(entities[0])
     insert_result = hello_milvus.insert(entities)
-    index += 1
   # After final entity is inserted, it is best to call flush to have no growing segments left in memory
   hello_milvus.flush()
   hello_milvus.create_index("int8_1", index_params={"index_type": "INVERTED"})
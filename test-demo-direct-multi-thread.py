@@ -13,6 +13,18 @@ import random
 import threading
 from concurrent.futures import ThreadPoolExecutor
 
+from vector_factory import uniform_vectors
+from rate_pacer import Pacer
+from write_batcher import WriteBatcher
+
+# background upsert rate in rows/s while searching, None = as fast as possible
+UPSERT_ROWS_PER_S = None
+# upsert threads; with COALESCE_ROWS their 3-row upserts are merged (last write per pk wins)
+# into one upsert of up to COALESCE_ROWS rows, sent at the latest COALESCE_DELAY_S after the first
+UPSERT_THREADS = 1
+COALESCE_ROWS = None
+COALESCE_DELAY_S = 0.05
+
 fields = [
     FieldSchema(name="pk", dtype=DataType.INT64, is_primary=True, auto_id=False),
     FieldSchema(name="int1", dtype=DataType.INT64),
@@ -76,7 +88,7 @@ def init_collection():
               [ True if i %2 ==0 else False for i in range(3000)],  # field bool2
         [ "xxx" + str(i) for i in range(3000)],  # field random
         [ "xxx" + str(i) for i in range(3000)],  # field random
-        [[random.random() for _ in range(128)] for _ in range(3000)],  # field embeddings
+        uniform_vectors(3000, 128),  # field embeddings
     ]
     if index == 0:
       print(entities[0])
@@ -105,7 +117,7 @@ def insert_data(target_index):
             [ True if i %2 ==0 else False for i in range(3000)],  # field bool2
       [ "xxx" + str(i) for i in range(3000)],  # field random
       [ "xxx" + str(i) for i in range(3000)],  # field random
-      [[random.random() for _ in range(128)] for _ in range(3000)],  # field embeddings
+      uniform_vectors(3000, 128),  # field embeddings
   ]
   schema = CollectionSchema(fields, "hello_milvus is the simplest demo to introduce the APIs")
   hello_milvus = Collection("hello_milvus", schema)
@@ -144,7 +156,7 @@ def perform_queries(hello_milvus, num_queries):
             result = hello_milvus.query(expr="pk in [0, 1, 3,5, 6, 7, 8, 10, 11]")
             print(len(result))
 
-def upsert(hello_milvus):
+def upsert(hello_milvus, pacer=None, batcher=None):
       index = 0
       while True:
           while index < 100:
@@ -162,9 +174,15 @@ def upsert(hello_milvus):
                         [ True if i %2 ==0 else False for i in range(3)],  # field bool2
                   [ "xxx" + str(i) for i in range(3)],  # field random
                   [ "xxx" + str(i) for i in range(3)],  # field random
-                  [[random.random() for _ in range(128)] for _ in range(3)],  # field embeddings
+                  uniform_vectors(3, 128),  # field embeddings
               ]
-              hello_milvus.upsert(data) 
+              if pacer is not None:
+                  pacer.wait(3)
+              if batcher is not None:
+                  names = [f.name for f in fields]
+                  batcher.submit([dict(zip(names, row)) for row in zip(*data)]).result()
+              else:
+                  hello_milvus.upsert(data) 
               index = index + 1 #result = hello_milvus.query(expr="pk in [0, 1, 3,5, 6, 7, 8, 10, 11]",  output_fields=["int1"])
           index=0
 
@@ -186,14 +204,22 @@ def search(qps_test_duration=40, queries_per_batch=50, num_threads=100):
   #  result = hello_milvus.query(expr="-1 < float1 < 100 ", limit=100, output_fields=["int1"])
   #  print(len(result))
   #print(result)
+  pacer = Pacer(UPSERT_ROWS_PER_S, log_every=10, name="upsert") if UPSERT_ROWS_PER_S else None
+  batcher = None
+  if COALESCE_ROWS:
+      batcher = WriteBatcher(hello_milvus.upsert, "pk", max_rows=COALESCE_ROWS, max_delay_s=COALESCE_DELAY_S,
+                             log_every=10, name="upsert").start()
   while True:
-      thread1 = threading.Thread(target=upsert, args=(hello_milvus,))
-      thread1.start()
+      upsert_threads = [threading.Thread(target=upsert, args=(hello_milvus, pacer, batcher))
+                        for _ in range(UPSERT_THREADS)]
+      for thread1 in upsert_threads:
+          thread1.start()
       thread2 = threading.Thread(target=perform_queries, args=(hello_milvus, 10))
       thread2.start()
       thread3 = threading.Thread(target=perform_search, args=(hello_milvus, 10))
       thread3.start()
-      thread1.join()
+      for thread1 in upsert_threads:
+          thread1.join()
       thread2.join()
       thread3.join()
   #start_time = time.time()
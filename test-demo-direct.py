@@ -17,6 +17,9 @@ import os
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from dataset_cache import load_or_build
+from vector_factory import iter_vector_blocks
+
 def query_task(i, coll, latency_list):
     values = [(i + j * 13) % 10000 for j in range(1000)]  # 用乘法散开一点
     expr = f"int2 in {values}"
@@ -84,7 +87,10 @@ def load_or_generate_string_pool():
 
 
 #string_pool = load_or_generate_string_pool()
-string_pool = [''.join(random.choices(string.ascii_letters, k=10)) for _ in range(10000)]
+# 固定 seed: partition 数据会缓存到磁盘, 字符串池必须和缓存的数据一致
+STRING_POOL_SEED = 19530
+_pool_rng = random.Random(STRING_POOL_SEED)
+string_pool = [''.join(_pool_rng.choices(string.ascii_letters, k=10)) for _ in range(10000)]
 
 fields = [
     FieldSchema(name="pk", dtype=DataType.INT64, is_primary=True,  auto_id=False),
@@ -143,15 +149,24 @@ def init_collection():
   hello_milvus.create_index("embeddings", index_hnsw)
 
   import random
+  # 数据按参数+seed 缓存到磁盘, 重复运行时直接 mmap 读取
+  def build(writer):
+    rng = numpy.random.default_rng(19530)
+    writer.add_array("partition", numpy.asarray(string_pool)[rng.integers(0, len(string_pool), 10 * 10000)])
+    writer.add_vector_blocks("embeddings", iter_vector_blocks(10 * 10000, 128, 10000, seed=rng), 10 * 10000, 128)
+  dataset = load_or_build({"script": "test-demo-direct", "rows": 10 * 10000, "dim": 128,
+                           "pool": len(string_pool), "pool_seed": STRING_POOL_SEED, "seed": 19530}, build)
+  partitions = dataset.scalar("partition")
+  embeddings = dataset.vectors("embeddings")
   index = 0
   while(index < 10):
     entities = [
         [i for i in range(10000 *index, 10000 * (index + 1))],  # field pk
         # [int(random.randrange(0, 1023)) for _ in range(100)],  # field int1
         # [i for i in range(100 *index, 100 * (index + 1))],  # field int2
-        [ random.choice(string_pool) for i in range(10000)],  # field random
+        partitions[10000 * index:10000 * (index + 1)].tolist(),  # field random
         # [ get_json(100) for i in range(100)],
-        [[random.random() for _ in range(128)] for _ in range(10000)],  # field embeddings
+        embeddings[10000 * index:10000 * (index + 1)],  # field embeddings
     ]
     #if index == 0:
     #  print(entities)
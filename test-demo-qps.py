@@ -11,6 +11,8 @@ import time
 import numpy
 from concurrent.futures import ThreadPoolExecutor
 
+from clustered_dataset import ClusteredDataset
+
 fields = [
     FieldSchema(name="pk", dtype=DataType.INT64, is_primary=True, auto_id=False),
     FieldSchema(name="string1", dtype=DataType.VARCHAR, max_length=20000,  enable_analyzer=True, enable_match=True),
@@ -20,6 +22,9 @@ fields = [
 
 schema = CollectionSchema(fields, "hello_milvus is the simplest demo to introduce the APIs", enable_dynamic_field=True)
 
+# 高斯混合向量, 比均匀随机向量更接近真实 embedding 的近邻结构
+dataset = ClusteredDataset(100 * 3000, 128, n_clusters=256, intrinsic_dim=32, skew=1.0, seed=19530)
+
 def init_collection():
   connections.connect("default", host="localhost", port="19530")
   print("connect done")
@@ -33,6 +38,7 @@ def init_collection():
 
   import random
  
+  blocks = dataset.iter_blocks(3000)
   index = 0
   while(index < 100):
     start_pk = index * 3000  # 确保每次插入的 pk 都是唯一的
@@ -44,7 +50,7 @@ def init_collection():
       # [ "aaa" + str(i) if index < 50 else "qqq" + str(i) for i in range(3000)],  # field random
       [ "abcdefg" if start_pk + i == 10000 or start_pk + i == 100000 else "xxx" + str(i) for i in range(3000)],  # field random
       [ "aaa" + str(i) if index < 50 else "qqq" + str(i) for i in range(3000)],  # field random
-      [[random.random() for _ in range(128)] for _ in range(3000)],  # field embeddings
+      next(blocks),  # field embeddings
     ]
     insert_result = hello_milvus.insert(entities)
     index += 1
@@ -105,15 +111,10 @@ def perform_search(hello_milvus, num_queries):
   # hello_milvus = Collection("hello_milvus", schema)
   import random
   for _ in range(num_queries):
-    entities = [
-      [i for i in range(3000)],  # field pk
-      [float(random.randrange(-20, -10)) for _ in range(3000)],  # field random
-      [[random.random() for _ in range(128)] for _ in range(3000)],  # field embeddings
-    ]
     search_params = {
       "metric_type": "L2"
     }
-    vectors_to_search = entities[-1][-2:]
+    vectors_to_search = dataset.queries(2, seed_offset=random.randrange(1 << 30))
     result = hello_milvus.search(vectors_to_search, "embeddings", search_params, limit=10, expr="double2 > 0")
     print(result)
 
@@ -122,13 +123,7 @@ def search(qps_test_duration=40, queries_per_batch=50, num_threads=100):
   print("connect done")
   schema = CollectionSchema(fields, "hello_milvus is the simplest demo to introduce the APIs")
   hello_milvus = Collection("hello_milvus", schema)
-  import random
-  entities = [
-      [i for i in range(3000)],  # field pk
-      [float(random.randrange(-20, -10)) for _ in range(3000)],  # field random
-      [[random.random() for _ in range(128)] for _ in range(3000)],  # field embeddings
-  ]
-  vectors_to_search = entities[-1][-2:]
+  vectors_to_search = dataset.queries(2)
   search_params = {
       "metric_type": "L2",
       "params": {"nprobe": 10},
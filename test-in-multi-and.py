@@ -15,6 +15,11 @@ import threading
 import json
 from concurrent.futures import ThreadPoolExecutor
 
+from skewed_values import ValueDistribution
+
+# int1 value distribution; selectivity of "int1 in [...]" depends on which values are hot
+value_dist = ValueDistribution("zipf", cardinality=1000, a=1.1)
+
 def generate_random_string():
     length = random.randint(1, 1000)
     characters = string.ascii_letters
@@ -23,24 +28,6 @@ def generate_random_string():
 
 str_prefix = generate_random_string()
 
-def random_value():
-    """随机生成不同类型的值"""
-    value_types = [
-        lambda: random.randint(1, 1000),  # 随机整数
-        lambda: round(random.uniform(1.0, 1000.0), 2),  # 随机浮点数
-        lambda: ''.join(random.choices(string.ascii_letters, k=10)),  # 随机字符串
-        lambda: [random.randint(1, 100) for _ in range(random.randint(2, 5))],  # 整数数组
-        #lambda: [round(random.uniform(1.0, 100.0), 2) for _ in range(random.randint(2, 5))],  # 浮点数组
-        #lambda: {f"subkey_{i}": random.randint(1, 100) for i in range(random.randint(1, 3))},  # 随机子对象
-    ]
-    return random.choice(value_types)()
-
-def get_json(keys_num):
-  dict1 = {f"key_{i}x": random_value() for i in range(1, keys_num)}
-  dict1["key_0x"] = random.randint(1, 1000)
-  dict1["keyxx"] = random.randint(1, 1000)
-  return dict1
-  #return json.dumps(dict1)
 
 #   json['key_1'] == 1 && int1 == 0
 def Test1(has_index):
@@ -70,10 +57,11 @@ def Test1(has_index):
       hello_milvus.create_index("str1", index_params={'index_type' : "BITMAP"})
     index = 0
     import random
+    rng = numpy.random.default_rng(19530)
     while(index < 10000):
       entities = [
           [i for i in range(100 *index, 100 * (index + 1))],  # field pk
-          [int(random.randrange(0, 1000)) for _ in range(100)],  # field int1
+          value_dist.as_int(value_dist.sample(rng, 100)).tolist(),  # field int1
           #[random.randint(0, 1000) for _ in range(100)],  # field int1
           #[ str(random.randint(0, 99)) for _ in range(100)],  # field random
           [[random.random() for _ in range(128)] for _ in range(100)],  # field embeddings
@@ -111,7 +99,7 @@ def Test1(has_index):
     values = [random.randint(0, 99) for _ in range(10)]
     #expr = " or ".join(f"int1 == {v}" for v in values)
     expr =  "int1 in [{}]".format(', '.join(map(str, values)))
-    print(expr)
+    print(expr, f"expected selectivity {value_dist.expected_selectivity(values):.4%}")
     result = hello_milvus.query(expr=expr, output_fields=["count(*)"])
     print(result)
     cursor += 1
@@ -15,6 +15,9 @@ import threading
 import json
 from concurrent.futures import ThreadPoolExecutor
 
+from random_json import get_json
+from sharded_generator import generate_sharded, key_json_shard
+
 def generate_random_string():
     length = random.randint(1, 1000)
     characters = string.ascii_letters
@@ -23,24 +26,6 @@ def generate_random_string():
 
 str_prefix = generate_random_string()
 
-def random_value():
-    """随机生成不同类型的值"""
-    value_types = [
-        lambda: random.randint(1, 1000),  # 随机整数
-        lambda: round(random.uniform(1.0, 1000.0), 2),  # 随机浮点数
-        lambda: ''.join(random.choices(string.ascii_letters, k=10)),  # 随机字符串
-        lambda: [random.randint(1, 100) for _ in range(random.randint(2, 5))],  # 整数数组
-        #lambda: [round(random.uniform(1.0, 100.0), 2) for _ in range(random.randint(2, 5))],  # 浮点数组
-        #lambda: {f"subkey_{i}": random.randint(1, 100) for i in range(random.randint(1, 3))},  # 随机子对象
-    ]
-    return random.choice(value_types)()
-
-def get_json(keys_num):
-  dict1 = {f"key_{i}x": random_value() for i in range(1, keys_num)}
-  dict1["key_0x"] = random.randint(1, 1000)
-  dict1["keyxx"] = random.randint(1, 1000)
-  return dict1
-  #return json.dumps(dict1)
 
 #   json['key_1'] == 1 && int1 == 0
 def Test1():
@@ -68,6 +53,8 @@ def Test1():
     }
     hello_milvus.create_index("embeddings", index_hnsw)
     import random
+    # 多进程按 seed 分片生成, 结果与进程数无关
+    jsons = generate_sharded(key_json_shard, 300 * 100, seed=19530)
     index = 0
     while(index < 300):
       entities = [
@@ -75,7 +62,7 @@ def Test1():
           #[int(random.randrange(0, 4)) for _ in range(100)],  # field int1
           [i for i in range(100 *index, 100 * (index + 1))],  # field int1
           [ "xxx" + str(i%20) for i in range(100)],  # field random
-          [ get_json(100) for i in range(100)],
+          jsons[100 * index:100 * (index + 1)],
           [[random.random() for _ in range(128)] for _ in range(100)],  # field embeddings
       ]
       #if index == 0:
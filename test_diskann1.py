@@ -1,8 +1,11 @@
-import random
 import pandas as pd
 from sklearn import preprocessing
 import threading
 
+from clustered_dataset import ClusteredDataset
+from dataset_cache import load_or_build
+from ground_truth import brute_force_knn, recall_at_k
+
 from pymilvus import (
     connections, list_collections,
     FieldSchema, CollectionSchema, DataType,
@@ -14,6 +17,9 @@ index_type = 'DISKANN'
 nb = 10000
 dim = 256
 
+# 3M x 256 gaussian mixture, streamed nb rows at a time
+dataset = ClusteredDataset(300 * nb, dim, n_clusters=4096, intrinsic_dim=64, skew=1.0, seed=19530)
+
 def connect():
     connections.connect(
       host='127.0.0.1', 
@@ -45,8 +51,7 @@ def create_collection():
 
 # insert data
     j = 0
-    while j < 300 * nb:
-        vec_data = [[random.random() for _ in range(dim)] for _ in range(nb)]
+    for vec_data in dataset.iter_blocks(nb):
         data = [
             [j + i for i in range(nb)],
             [j + i for i in range(nb)],
@@ -91,15 +96,24 @@ def worker(collection, expr_str):
 def search(collection):
     nq = 10
     search_params = {"metric_type": metric_type, "params": {"search_list": 150}}
-    vec_data = [[random.random() for _ in range(dim)] for _ in range(nb)]
+    vec_data = dataset.queries(nq)
     results = collection.search(
-        vec_data[:nq],
+        vec_data,
         anns_field="float_vector",
         param=search_params,
         limit=150,
       #  consistency_level="Strong",
         output_fields=["float_vector"]
     )
+    # pk == 行号, 用磁盘上的 memmap 做分块暴力搜索得到 ground truth;
+    # base 按 dataset 的全部参数缓存, 参数变了会重新生成
+    base = load_or_build(
+        {"script": "test_diskann1", "dataset": repr(dataset)},
+        lambda w: w.add_vector_blocks("base", dataset.iter_blocks(nb), dataset.n_rows, dataset.dim),
+    ).vectors("base")
+    gt_ids, gt_dist = brute_force_knn(base, vec_data, 150, metric_type, memory_budget_mb=2048)
+    recall = recall_at_k([hits.ids for hits in results], gt_ids)
+    print(f"recall@150: {recall:.4f}")
     #pks = ",".join( str(i) for i in range(50))
     #print(pks)
     #expr_str = "count in [" + pks + "]"
@@ -0,0 +1,100 @@
+"""Shared float32 vector factory.
+
+Every generator here returns a C-contiguous ``float32`` block of shape
+``(n, dim)`` drawn from a numpy ``Generator`` in one call, instead of the
+``[random.random() for _ in range(dim)]`` list comprehensions the scripts used
+to build row by row. Blocks can be handed to pymilvus directly: a 2-D block as
+a FLOAT_VECTOR column, or ``block[i]`` as the vector of a row dict.
+"""
+from typing import Iterator, Optional, Union
+
+import numpy as np
+
+DISTRIBUTIONS = ("uniform", "normal", "unit", "clustered")
+
+SeedLike = Union[None, int, np.random.Generator]
+
+
+def _rng(seed: SeedLike) -> np.random.Generator:
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def uniform_vectors(n: int, dim: int, seed: SeedLike = None, low: float = 0.0, high: float = 1.0) -> np.ndarray:
+    """U[low, high), the float32 equivalent of random.random() per element."""
+    block = _rng(seed).random((n, dim), dtype=np.float32)
+    if low != 0.0 or high != 1.0:
+        block *= np.float32(high - low)
+        block += np.float32(low)
+    return block
+
+
+def normal_vectors(n: int, dim: int, seed: SeedLike = None, mean: float = 0.0, std: float = 1.0) -> np.ndarray:
+    block = _rng(seed).standard_normal((n, dim), dtype=np.float32)
+    if std != 1.0:
+        block *= np.float32(std)
+    if mean != 0.0:
+        block += np.float32(mean)
+    return block
+
+
+def normalize(block: np.ndarray) -> np.ndarray:
+    """L2-normalize rows in place (zero rows stay zero) and return the block."""
+    norms = np.linalg.norm(block, axis=1, keepdims=True)
+    np.divide(block, norms, out=block, where=norms > 0)
+    return block
+
+
+def unit_vectors(n: int, dim: int, seed: SeedLike = None) -> np.ndarray:
+    """Uniform on the unit sphere, for COSINE / IP collections."""
+    return normalize(normal_vectors(n, dim, seed))
+
+
+def clustered_vectors(
+    n: int,
+    dim: int,
+    seed: SeedLike = None,
+    n_clusters: int = 16,
+    cluster_std: float = 0.1,
+    centers: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Isotropic Gaussian blobs around n_clusters uniform centers in [0, 1)^dim."""
+    rng = _rng(seed)
+    if centers is None:
+        centers = rng.random((n_clusters, dim), dtype=np.float32)
+    labels = rng.integers(0, len(centers), n)
+    block = rng.standard_normal((n, dim), dtype=np.float32)
+    block *= np.float32(cluster_std)
+    block += centers[labels]
+    return block
+
+
+def make_vectors(n: int, dim: int, dist: str = "uniform", seed: SeedLike = None, **kwargs) -> np.ndarray:
+    """Dispatch on dist in DISTRIBUTIONS; extra kwargs go to the distribution."""
+    if dist == "uniform":
+        return uniform_vectors(n, dim, seed, **kwargs)
+    if dist == "normal":
+        return normal_vectors(n, dim, seed, **kwargs)
+    if dist == "unit":
+        return unit_vectors(n, dim, seed)
+    if dist == "clustered":
+        return clustered_vectors(n, dim, seed, **kwargs)
+    raise ValueError(f"Unsupported vector distribution: {dist!r}, expected one of {DISTRIBUTIONS}")
+
+
+def iter_vector_blocks(
+    n: int,
+    dim: int,
+    block_rows: int,
+    dist: str = "uniform",
+    seed: SeedLike = None,
+    **kwargs,
+) -> Iterator[np.ndarray]:
+    """Yield n vectors in blocks of at most block_rows from one Generator."""
+    rng = _rng(seed)
+    if dist == "clustered" and kwargs.get("centers") is None:
+        # all blocks must share the same centers
+        kwargs["centers"] = rng.random((kwargs.pop("n_clusters", 16), dim), dtype=np.float32)
+    for start in range(0, n, block_rows):
+        yield make_vectors(min(block_rows, n - start), dim, dist, rng, **kwargs)
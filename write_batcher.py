@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Shared write buffer that coalesces small upserts from many threads.
+
+The mixed read/write tests upsert a few rows per RPC (3 in
+test-demo-direct-multi-thread.py) and often the same primary keys again, so
+the RPC count, not the data volume, limits the write rate. ``WriteBatcher``
+collects the rows that any number of threads ``submit`` and sends them with
+one ``flush(rows)`` call once ``max_rows`` distinct keys are buffered or the
+oldest buffered row has waited ``max_delay_s``:
+
+* rows are keyed by ``pk_field``; a key written again before the flush keeps
+  only its last row (last write wins), within one submit and across submits,
+* one background thread sends the batches in order, so a later write of a key
+  is never overtaken by an earlier one,
+* ``submit`` returns a ``Future`` that completes when the batch holding its rows
+  is acknowledged (or carries the flush error); a thread that waits on it
+  writes synchronously but shares the RPC with the other threads. ``submit``
+  blocks while ``max_pending_rows`` rows are buffered.
+
+A batch above ``max_rows`` rows is sent in ``max_rows`` slices, one ``flush``
+each. When a slice fails the rest of the batch is not sent, but the slices
+before it are written: every waiter of the batch gets the error, and it means
+"possibly partially applied". The counters only count the rows of
+acknowledged slices as sent.
+
+``summary()`` reports the batching factor (submits per RPC), how many rows
+were coalesced away, and the latency the buffer adds to a write (submit to
+start of its flush) next to the flush RPC latency:
+
+    batcher = WriteBatcher(lambda rows: client.upsert(collection_name=name, data=rows), "id").start()
+    ...  # in any thread
+    batcher.submit(rows).result()
+    ...
+    batcher.close()
+    batcher.log_summary()
+"""
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from ingest_metrics import latency_percentiles
+
+
+class WriteBatcher:
+    def __init__(
+        self,
+        flush: Callable[[List[Dict[str, Any]]], Any],
+        pk_field: str,
+        max_rows: int = 1000,
+        max_delay_s: float = 0.05,
+        max_pending_rows: Optional[int] = None,
+        log_every: float = 0,
+        log: Callable[[str], Any] = print,
+        name: str = "writes",
+    ):
+        if max_rows < 1:
+            raise ValueError(f"max_rows must be >= 1, got {max_rows}")
+        self.flush = flush
+        self.pk_field = pk_field
+        self.max_rows = max_rows
+        self.max_delay_s = max_delay_s
+        self.max_pending_rows = max_pending_rows or 8 * max_rows
+        self.log_every = log_every
+        self.log = log
+        self.name = name
+        self._cond = threading.Condition()
+        self._pending: Dict[Any, Dict[str, Any]] = {}
+        # (submit time, future) of every submit in _pending
+        self._waiters: List[Any] = []
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._started = time.perf_counter()
+        self._stopped: Optional[float] = None
+        self.submits = 0
+        self.rows_in = 0
+        self.rows_out = 0
+        # rows replaced by a later write of the same key before their flush
+        self.coalesced = 0
+        self.flushes = 0
+        self.failed = 0
+        self.added: List[float] = []
+        self.flush_latencies: List[float] = []
+        self._last_report = (self._started, 0, 0, 0)
+
+    def start(self) -> "WriteBatcher":
+        self._started = time.perf_counter()
+        self._last_report = (self._started, 0, 0, 0)
+        self._thread = threading.Thread(target=self._flush_loop, name=f"{self.name}-flush", daemon=True)
+        self._thread.start()
+        return self
+
+    def __enter__(self) -> "WriteBatcher":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def submit(self, rows: List[Dict[str, Any]]) -> "Future[int]":
+        """Buffer rows for the next flush; the future gives the rows sent by that flush."""
+        future: "Future[int]" = Future()
+        with self._cond:
+            while len(self._pending) >= self.max_pending_rows and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                raise RuntimeError(f"{self.name}: submit after close")
+            before = len(self._pending)
+            for row in rows:
+                self._pending[row[self.pk_field]] = row
+            self.coalesced += before + len(rows) - len(self._pending)
+            self._waiters.append((time.perf_counter(), future))
+            self.submits += 1
+            self.rows_in += len(rows)
+            if len(self._pending) >= self.max_rows:
+                self._cond.notify_all()
+            elif len(self._waiters) == 1:
+                # first submit of a batch: the flusher starts its max_delay_s clock
+                self._cond.notify_all()
+        return future
+
+    def close(self) -> None:
+        """Flush what is buffered and stop the flush thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        self._stopped = time.perf_counter()
+
+    def _take(self) -> Optional[tuple]:
+        """Wait for a full batch, the max delay or close; None once closed and drained."""
+        with self._cond:
+            while not self._waiters:
+                if self._closed:
+                    return None
+                self._cond.wait()
+            deadline = self._waiters[0][0] + self.max_delay_s
+            while len(self._pending) < self.max_rows and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            rows, waiters = list(self._pending.values()), self._waiters
+            self._pending, self._waiters = {}, []
+            self._cond.notify_all()
+            return rows, waiters
+
+    def _flush_loop(self) -> None:
+        while True:
+            taken = self._take()
+            if taken is None:
+                return
+            rows, waiters = taken
+            start = time.perf_counter()
+            error = None
+            calls = sent = 0
+            latencies = []
+            try:
+                for lo in range(0, len(rows), self.max_rows):
+                    piece = rows[lo:lo + self.max_rows]
+                    calls += 1
+                    t0 = time.perf_counter()
+                    self.flush(piece)
+                    latencies.append(time.perf_counter() - t0)
+                    sent += len(piece)
+            except Exception as e:
+                error = e
+                self.log(f"[{self.name}] flush failed after {sent} of {len(rows)} rows were written: {e}")
+            with self._cond:
+                self.flushes += calls
+                self.added.extend(start - submitted for submitted, _ in waiters)
+                self.rows_out += sent
+                self.flush_latencies.extend(latencies)
+                if error is not None:
+                    self.failed += 1
+            for _, future in waiters:
+                if error is None:
+                    future.set_result(len(rows))
+                else:
+                    future.set_exception(error)
+            if self.log_every:
+                self._maybe_report()
+
+    def _maybe_report(self) -> None:
+        now = time.perf_counter()
+        with self._cond:
+            last_time, last_submits, last_flushes, last_rows = self._last_report
+            if now - last_time < self.log_every:
+                return
+            self._last_report = (now, self.submits, self.flushes, self.rows_out)
+            submits, flushes, rows = self.submits - last_submits, self.flushes - last_flushes, self.rows_out - last_rows
+        elapsed = now - last_time
+        self.log(f"[{self.name}] {submits / elapsed:,.0f} submits/s -> {flushes / elapsed:,.1f} flushes/s, "
+                 f"{rows / elapsed:,.0f} rows/s, {submits / max(flushes, 1):.1f} submits per flush")
+
+    def summary(self) -> Dict[str, Any]:
+        end = self._stopped if self._stopped is not None else time.perf_counter()
+        wall = end - self._started
+        with self._cond:
+            submits, flushes, failed = self.submits, self.flushes, self.failed
+            rows_in, rows_out, coalesced = self.rows_in, self.rows_out, self.coalesced
+            added, flush_latencies = list(self.added), list(self.flush_latencies)
+        return {
+            "wall_s": round(wall, 3),
+            "submits": submits,
+            # flush calls (one per max_rows slice), including the failed ones
+            "flushes": flushes,
+            "failed_flushes": failed,
+            "rows_submitted": rows_in,
+            "rows_sent": rows_out,
+            "rows_coalesced": coalesced,
+            "batching_factor": round(submits / flushes, 2) if flushes else 0.0,
+            "rows_per_flush": round(rows_out / (flushes - failed), 1) if flushes > failed else 0.0,
+            "rows_per_s": round(rows_out / wall, 1) if wall > 0 else 0.0,
+            # submit to start of the flush carrying it
+            "added_latency": latency_percentiles(added),
+            "flush_latency": latency_percentiles(flush_latencies),
+        }
+
+    def log_summary(self) -> Dict[str, Any]:
+        s = self.summary()
+        self.log(f"[{self.name}] {s['submits']} submits, {s['rows_submitted']} rows -> {s['flushes']} flushes, "
+                 f"{s['rows_sent']} rows sent in {s['wall_s']}s: batching factor {s['batching_factor']}, "
+                 f"{s['rows_per_flush']} rows per flush, {s['rows_coalesced']} coalesced, "
+                 f"{s['failed_flushes']} failed")
+        for key, label in (("added_latency", "added latency"), ("flush_latency", "flush latency")):
+            lat = s[key]
+            if lat["count"]:
+                self.log(f"[{self.name}] {label} p50={lat['p50_ms']}ms p90={lat['p90_ms']}ms "
+                         f"p99={lat['p99_ms']}ms max={lat['max_ms']}ms")
+        return s